@@ -0,0 +1,12 @@
+"""Arrow-native path from the reader to the Parquet writer.
+
+Deals are read into ``pyarrow.Table``s, validated with Arrow compute kernels and transformed column by column into
+the output table, which the Parquet writer takes as is. Text columns stay as read, without object arrays or
+``Decimal`` instances on the way. Invalid input falls back to the pandas validation, so the failure cases reported
+are the same as on the pandas path.
+"""
+from dealpipe.arrow.reader import read_table
+from dealpipe.arrow.transform import transform_table
+from dealpipe.arrow.validation import validate_table
+
+__all__ = ("read_table", "transform_table", "validate_table")
@@ -0,0 +1,44 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv
+
+from dealpipe import reader
+from dealpipe.reader.compression import input_encoding, open_input
+from dealpipe.reader.mime import sniff
+from dealpipe.schema import InputSchema
+
+# the input columns are validated from their text, as the pandas path coerces them to strings
+TEXT_COLUMNS = {column: pa.string() for column in InputSchema.__fields__.keys()}
+
+
+def read_csv_table(file: str) -> pa.Table:
+    convert_options = csv.ConvertOptions(column_types=TEXT_COLUMNS, strings_can_be_null=True)
+
+    with open_input(file) as source:
+        read_options = csv.ReadOptions(encoding=input_encoding(file, source) or "utf8")
+        return csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+
+
+def column_array(series: pd.Series) -> pa.Array:
+    """The column as an array, columns of mixed values as their text, the way pandas coerces them"""
+    try:
+        return pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if pd.isna(value) else str(value) for value in series], pa.string())
+
+
+def frame_to_table(df: pd.DataFrame) -> pa.Table:
+    return pa.table([column_array(df[column]) for column in df.columns], names=[str(column) for column in df.columns])
+
+
+def read_table(file: str) -> pa.Table:
+    """The deals in the file as a table, formats without an Arrow reader are read with pandas and converted"""
+    format = sniff(file).format
+
+    if format == "csv":
+        return read_csv_table(file)
+    if format == "parquet":
+        return pq.read_table(file)
+
+    return frame_to_table(reader.read(file))
@@ -0,0 +1,55 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dealpipe.arrow.validation import COMPANY_ID_TYPE, DECIMAL_COLUMNS, INPUT_COLUMNS, to_decimal
+from dealpipe.lookups import LookupDict
+from dealpipe.schema import OutputSchema
+from dealpipe.schema.hashing import DEFAULT_ALGORITHM, NULL, SEPARATOR, hash_encoded
+
+OUTPUT_COLUMNS = list(OutputSchema.__fields__.keys())
+
+
+def encode_table_rows(table: pa.Table) -> pd.Series:
+    """The canonical RowHash encoding of the input columns, see dealpipe.schema.hashing"""
+    columns = [pc.fill_null(pc.cast(table.column(column), pa.string()), NULL) for column in INPUT_COLUMNS]
+
+    # the element-wise join kernel is not available in every supported pyarrow release
+    if hasattr(pc, "binary_join_element_wise"):
+        return pc.binary_join_element_wise(*columns, SEPARATOR).to_pandas()
+
+    return pd.Series(
+        [SEPARATOR.join(values) for values in zip(*(column.to_pylist() for column in columns))], dtype=object
+    )
+
+
+def company_names(company_ids: pa.ChunkedArray, lookups: LookupDict) -> pa.ChunkedArray:
+    ids, names = zip(*sorted(lookups["companies"].items())) if lookups["companies"] else ((), ())
+    indices = pc.index_in(company_ids, value_set=pa.array(ids, COMPANY_ID_TYPE))
+
+    return pc.take(pa.array(names, pa.string()), indices)
+
+
+def transform_table(
+    table: pa.Table,
+    run_id: str,
+    as_of_date: datetime.datetime,
+    lookups: LookupDict,
+    hash_algorithm: str = DEFAULT_ALGORITHM,
+    row_offset: int = 0,
+) -> pa.Table:
+    """The output table of a validated input table, with the same columns and types as `schema.transform`'s"""
+    rows = table.num_rows
+    columns = {column: table.column(column) for column in INPUT_COLUMNS}
+    columns.update({column: to_decimal(table.column(column)) for column in DECIMAL_COLUMNS})
+    columns[OutputSchema.is_active] = pc.equal(table.column(OutputSchema.is_active), pa.scalar("Yes"))
+    columns[OutputSchema.company_name] = company_names(table.column(OutputSchema.company_id), lookups)
+    columns[OutputSchema.row_no] = pa.array(np.arange(row_offset, row_offset + rows, dtype=np.int32))
+    columns[OutputSchema.as_of_date] = pa.array(np.full(rows, np.datetime64(as_of_date, "ns")))
+    columns[OutputSchema.process_identifier] = pa.array(np.full(rows, run_id, dtype=object), pa.string())
+    columns[OutputSchema.row_hash] = pa.array(hash_encoded(encode_table_rows(table), hash_algorithm), pa.string())
+
+    return pa.table([columns[column] for column in OUTPUT_COLUMNS], names=OUTPUT_COLUMNS)
@@ -0,0 +1,89 @@
+from typing import List, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dealpipe.lookups import LookupDict
+from dealpipe.schema import InputSchema, validate_input
+
+INPUT_COLUMNS = list(InputSchema.__fields__.keys())
+DECIMAL_COLUMNS = [InputSchema.d1, InputSchema.d2, InputSchema.d3, InputSchema.d4, InputSchema.d5]
+NULLABLE_COLUMNS = {InputSchema.d2, InputSchema.d3, InputSchema.d4, InputSchema.d5}
+DECIMAL_TYPE = pa.decimal128(28, 8)
+COMPANY_ID_TYPE = pa.int32()
+
+
+def to_text(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """The column as strings, non-text values formatted the way pandas coerces them to text"""
+    if pa.types.is_string(column.type):
+        return column
+
+    return pa.chunked_array([pa.array([None if value is None else str(value) for value in column.to_pylist()])])
+
+
+def to_decimal(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """The decimal values of a text column, surrounding whitespace is ignored like the schema's checks do"""
+    return pc.cast(pc.utf8_trim_whitespace(column), DECIMAL_TYPE)
+
+
+def all_true(mask: pa.ChunkedArray) -> bool:
+    return mask.null_count == 0 and pc.all(mask).as_py() is not False
+
+
+def passes_checks(table: pa.Table, lookups: LookupDict) -> bool:
+    """Whether the table passes every InputSchema check, evaluated with Arrow kernels only"""
+    if table.column_names != INPUT_COLUMNS:
+        return False
+
+    for column in INPUT_COLUMNS:
+        if column not in NULLABLE_COLUMNS and table.column(column).null_count:
+            return False
+
+    try:
+        for column in DECIMAL_COLUMNS:
+            to_decimal(table.column(column))
+        company_ids = pc.cast(table.column(InputSchema.company_id), COMPANY_ID_TYPE)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+
+    country_codes = table.column(InputSchema.country_code)
+    currency_codes = table.column(InputSchema.currency_code)
+    masks: List[pa.ChunkedArray] = [
+        pc.greater_equal(pc.utf8_length(table.column(InputSchema.deal_name)), 1),
+        pc.is_in(table.column(InputSchema.is_active), value_set=pa.array(["Yes", "No"])),
+        pc.equal(pc.utf8_length(country_codes), 3),
+        pc.equal(pc.utf8_length(currency_codes), 3),
+        pc.is_in(country_codes, value_set=pa.array(sorted(lookups["countries"]), pa.string())),
+        pc.is_in(currency_codes, value_set=pa.array(sorted(lookups["currencies"]), pa.string())),
+        pc.is_in(company_ids, value_set=pa.array(sorted(lookups["companies"]), COMPANY_ID_TYPE)),
+    ]
+
+    return all(all_true(mask) for mask in masks)
+
+
+def validate_table(table: pa.Table, lookups: LookupDict) -> Tuple[bool, Union[pa.Table, pd.DataFrame]]:
+    """The table with the input column types when it is valid, otherwise the failure cases
+
+    Only input the kernels reject is converted to pandas and validated with the schema, which reports the failure
+    cases, or accepts values the kernels are stricter about.
+    """
+    if table.column_names == INPUT_COLUMNS:
+        columns = [
+            table.column(column) if column == InputSchema.company_id else to_text(table.column(column))
+            for column in INPUT_COLUMNS
+        ]
+        table = pa.table(columns, names=INPUT_COLUMNS)
+
+    if passes_checks(table, lookups):
+        return True, table.set_column(
+            len(INPUT_COLUMNS) - 1,
+            InputSchema.company_id,
+            pc.cast(table.column(InputSchema.company_id), COMPANY_ID_TYPE),
+        )
+
+    valid, validated = validate_input(table.to_pandas(), lookups)
+    if valid:
+        return True, pa.Table.from_pandas(validated, preserve_index=False)
+
+    return False, validated
@@ -0,0 +1,112 @@
+"""Batches of small deals files processed in one run.
+
+The files are concatenated into one frame with a SourceFile column, and each row keeps its position in its own file
+as index, so RowNo is still the row number in the file it came from. SourceFile is not part of the input and output
+schemas: it is set aside during validation and transform and put back as the last column. Outputs are split per
+source file again when their path contains the ``{source}`` placeholder.
+"""
+import glob
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from dealpipe.lookups import LookupDict
+from dealpipe.reader.mime import COMPRESSIONS
+from dealpipe.schema import validate_input
+
+SOURCE_FILE = "SourceFile"
+SOURCE_PLACEHOLDER = "{source}"
+
+
+class NoDealsFiles(Exception):
+    """Raised when a batch's paths and patterns match no files"""
+
+
+class DuplicateOutputPath(Exception):
+    """Raised when two source files of a batch would be written to the same output file"""
+
+
+def expand_files(patterns: Iterable[str]) -> List[str]:
+    """The files matching each path or glob pattern, in pattern order and sorted within a pattern"""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        files.extend(file for file in matches if file not in files)
+
+    if not files:
+        raise NoDealsFiles(f"No deals files match {list(patterns)}")
+
+    return files
+
+
+def concat_sources(frames: Iterable[Tuple[str, pd.DataFrame]]) -> pd.DataFrame:
+    return pd.concat([df.assign(**{SOURCE_FILE: source}) for source, df in frames])
+
+
+def is_batch(df: pd.DataFrame) -> bool:
+    return SOURCE_FILE in df.columns
+
+
+def split_sources(df: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+    for source, group in df.groupby(SOURCE_FILE, sort=False):
+        yield source, group.drop(columns=SOURCE_FILE)
+
+
+def source_name(source: str) -> str:
+    """The file name without its format and compression suffixes, feed.2024-01-01.csv.gz is feed.2024-01-01"""
+    path = Path(source)
+    if any(path.suffix.lower() in extensions for _, _, extensions in COMPRESSIONS):
+        path = path.with_suffix("")
+
+    return path.stem
+
+
+def source_path(template: str, source: str) -> str:
+    return template.replace(SOURCE_PLACEHOLDER, source_name(source))
+
+
+def split_outputs(df: pd.DataFrame, template: str) -> Iterator[Tuple[str, Optional[str], pd.DataFrame]]:
+    """Path, source name and rows of each output file, one per source file when the template has a placeholder"""
+    if SOURCE_PLACEHOLDER not in template or not is_batch(df):
+        yield template, None, df
+        return
+
+    paths = {}
+    for source, frame in split_sources(df):
+        path = source_path(template, source)
+        if path in paths:
+            raise DuplicateOutputPath(f"{paths[path]} and {source} would both be written to {path}")
+        paths[path] = source
+        yield path, source_name(source), frame
+
+
+def apply_without_source(df: pd.DataFrame, fn: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+    """Apply a row-preserving `fn` to the frame without its SourceFile column, then put the column back"""
+    result = fn(df.drop(columns=SOURCE_FILE))
+    result[SOURCE_FILE] = df[SOURCE_FILE].to_numpy()
+    return result
+
+
+def validate_batch(
+    df: pd.DataFrame, lookups: LookupDict, workers: int = 1, partition_size: Optional[int] = None
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """The valid rows and the failure cases of a batch, each with a SourceFile column, None when there are none
+
+    The batch is validated as a whole. Only when it fails are its files validated one by one, so the failure
+    cases are the ones each file reports on its own and the rows of the valid files are still processed.
+    """
+    valid, validated = validate_input(df.drop(columns=SOURCE_FILE), lookups, workers, partition_size)
+    if valid:
+        validated[SOURCE_FILE] = df[SOURCE_FILE].to_numpy()
+        return validated, None
+
+    valid_frames, failure_frames = [], []
+    for source, frame in split_sources(df):
+        valid, validated = validate_input(frame, lookups)
+        (valid_frames if valid else failure_frames).append(validated.assign(**{SOURCE_FILE: source}))
+
+    return (
+        pd.concat(valid_frames) if valid_frames else None,
+        pd.concat(failure_frames, ignore_index=True) if failure_frames else None,
+    )
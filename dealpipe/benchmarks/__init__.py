@@ -0,0 +1,4 @@
+"""Synthetic deal files and per-stage timings of the pipeline.
+
+Run with `python -m dealpipe.benchmarks --rows 10000 1000000 --output benchmarks.jsonl`.
+"""
@@ -0,0 +1,34 @@
+import argparse
+import itertools
+import tempfile
+
+from dealpipe.benchmarks.generator import FORMATS
+from dealpipe.benchmarks.runner import run_benchmarks, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m dealpipe.benchmarks", description="Time every pipeline stage")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000], help="row counts of the generated files")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--invalid-ratio", type=float, default=0.01, help="share of invalid rows in the invalid file")
+    parser.add_argument("--output", default="benchmarks.jsonl", help="JSON lines file the results are appended to")
+    parser.add_argument("--directory", help="where to generate the files, a temporary directory when not set")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace allocations, for cleaner timings")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        for rows, file_format in itertools.product(args.rows, args.formats):
+            records = run_benchmarks(
+                rows,
+                file_format,
+                args.directory or temporary_directory,
+                invalid_ratio=args.invalid_ratio,
+                memory=not args.no_memory,
+                seed=args.seed,
+            )
+            write_results(records, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from dealpipe import writer
+from dealpipe.lookups import LookupDict
+
+FORMATS = ("csv", "xlsx", "yaml", "parquet")
+# rows of a deals sheet below its header row
+XLSX_MAX_ROWS = writer.EXCEL_MAX_ROWS - 1
+COUNTRIES = ["USA", "GBR", "BGR", "IRL", "DEU", "FRA", "JPN", "CAN"]
+CURRENCIES = ["USD", "GBP", "BGN", "EUR", "JPY", "CAD"]
+
+
+def generate_lookups(companies: int = 100) -> LookupDict:
+    return LookupDict(
+        companies={company_id: f"Company {company_id}" for company_id in range(1, companies + 1)},
+        currencies=set(CURRENCIES),
+        countries=set(COUNTRIES),
+    )
+
+
+def decimal_strings(rng: np.random.Generator, rows: int) -> pd.Series:
+    integer = pd.Series(rng.integers(-(10**9), 10**9, rows)).astype(str)
+    fraction = pd.Series(rng.integers(0, 10**8, rows)).astype(str).str.zfill(8)
+
+    return integer + "." + fraction
+
+
+def generate_deals(rows: int, lookups: LookupDict, null_ratio: float = 0.1, seed: int = 0) -> pd.DataFrame:
+    """Valid deals drawn from the lookups, D2-D5 are null with `null_ratio` probability"""
+    rng = np.random.default_rng(seed)
+    decimals = {}
+    for column in ["D1", "D2", "D3", "D4", "D5"]:
+        values = decimal_strings(rng, rows)
+        decimals[column] = values if column == "D1" else values.where(rng.random(rows) >= null_ratio, None)
+
+    return pd.DataFrame(
+        {
+            "DealName": "Deal " + pd.Series(np.arange(rows)).astype(str),
+            **decimals,
+            "IsActive": rng.choice(["Yes", "No"], rows),
+            "CountryCode": rng.choice(sorted(lookups["countries"]), rows),
+            "CurrencyCode": rng.choice(sorted(lookups["currencies"]), rows),
+            "CompanyId": rng.choice(sorted(lookups["companies"]), rows),
+        }
+    )
+
+
+def corrupt_deals(df: pd.DataFrame, invalid_ratio: float = 0.01, seed: int = 0) -> pd.DataFrame:
+    """A copy with `invalid_ratio` of the rows, and at least one row, breaking one of the input checks"""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    invalid = np.flatnonzero(rng.random(len(df)) < invalid_ratio)
+    if len(invalid) == 0 and len(df):
+        invalid = rng.choice(len(df), 1)
+    corruptions = [
+        ("D1", "not a number"),
+        ("D2", "0.123456789"),
+        ("IsActive", "yes"),
+        ("CountryCode", "XXX"),
+        ("CurrencyCode", "XXX"),
+        ("CompanyId", max(df["CompanyId"], default=0) + 1),
+    ]
+
+    chosen = rng.choice(len(corruptions), len(invalid))
+    for corruption, (column, value) in enumerate(corruptions):
+        df.iloc[invalid[chosen == corruption], df.columns.get_loc(column)] = value
+
+    return df
+
+
+def write_deals(df: pd.DataFrame, file: str, lookups: LookupDict):
+    """Write the deals in the format of the file extension, xlsx files get the lookups as their second sheet
+
+    Raises ValueError for xlsx files with more deals than a sheet holds, instead of truncating them.
+    """
+    Path(file).parent.mkdir(parents=True, exist_ok=True)
+    file_format = Path(file).suffix.lstrip(".")
+    if file_format == "xlsx" and len(df) > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df)} deals do not fit an xlsx sheet of at most {XLSX_MAX_ROWS} rows")
+
+    if file_format == "csv":
+        df.to_csv(file, index=False)
+    elif file_format == "parquet":
+        writer.write_parquet(df, file)
+    elif file_format == "yaml":
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+        with open(file, "w") as f:
+            yaml.dump(records, f, Dumper=yaml.SafeDumper, explicit_start=True, sort_keys=False)
+    elif file_format == "xlsx":
+        writer.write_excel(df, file, sheet_name="Deals", sheets={"Lookups": lookups_frame(lookups)})
+    else:
+        raise ValueError(f"Unsupported deals format '{file_format}', expected one of {FORMATS}")
+
+
+def lookups_frame(lookups: LookupDict) -> pd.DataFrame:
+    companies = pd.DataFrame(
+        {"CompanyId": list(lookups["companies"]), "CompanyName": list(lookups["companies"].values())}
+    )
+    currencies = pd.Series(sorted(lookups["currencies"]), name="Currencies")
+    countries = pd.Series(sorted(lookups["countries"]), name="Countries")
+
+    return pd.concat([companies, currencies, countries], axis=1)
+
+
+def write_lookups(lookups: LookupDict, file: str):
+    Path(file).parent.mkdir(parents=True, exist_ok=True)
+    lookups_frame(lookups).to_csv(file, index=False)
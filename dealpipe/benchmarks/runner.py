@@ -0,0 +1,149 @@
+import datetime
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import uuid
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from dealpipe import reader, schema, writer
+from dealpipe.benchmarks.generator import (
+    XLSX_MAX_ROWS,
+    corrupt_deals,
+    generate_deals,
+    generate_lookups,
+    write_deals,
+    write_lookups,
+)
+from dealpipe.lookups import build_lookups
+
+
+def measure(fn: Callable[[], Any], memory: bool = True) -> Tuple[Any, float, Optional[int]]:
+    """The result, wall time in seconds and peak traced Python allocation in bytes of the call
+
+    Tracing allocations slows the call down, so with `memory` off the timings are the more accurate ones.
+    """
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        result = fn()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+
+    return result, seconds, peak
+
+
+class InvalidVariantPassed(Exception):
+    """Raised when the invalid deals file of a benchmark passes validation, so its numbers would be mislabelled"""
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    rows: int,
+    file_format: str,
+    directory: str,
+    invalid_ratio: float = 0.01,
+    memory: bool = True,
+    seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Generate deal files of `rows` rows and yield a result record for every pipeline stage
+
+    xlsx files are capped at the rows a sheet holds, the records carry the rows actually generated and the rows asked
+    for.
+    """
+    requested_rows = rows
+    if file_format == "xlsx":
+        rows = min(rows, XLSX_MAX_ROWS)
+    directory_path = Path(directory)
+    lookups = generate_lookups()
+    lookups_file = str(directory_path / "lookups.csv")
+    valid_file = str(directory_path / f"valid_{rows}.{file_format}")
+    invalid_file = str(directory_path / f"invalid_{rows}.{file_format}")
+
+    deals = generate_deals(rows, lookups, seed=seed)
+    write_lookups(lookups, lookups_file)
+    write_deals(deals, valid_file, lookups)
+    write_deals(corrupt_deals(deals, invalid_ratio, seed=seed), invalid_file, lookups)
+    del deals
+
+    context = {"rows": rows, "requested_rows": requested_rows, "format": file_format}
+
+    def stage(name: str, fn: Callable[[], Any], **extra) -> Tuple[Any, Dict[str, Any]]:
+        result, seconds, peak = measure(fn, memory)
+        return result, {**context, **extra, "stage": name, "seconds": round(seconds, 6), "peak_memory_bytes": peak}
+
+    input_df, record = stage(
+        "reader.read", partial(reader.read, valid_file, dtype=schema.INPUT_DTYPES), variant="valid"
+    )
+    yield record
+    invalid_input_df, record = stage(
+        "reader.read", partial(reader.read, invalid_file, dtype=schema.INPUT_DTYPES), variant="invalid"
+    )
+    yield record
+    built_lookups, record = stage("build_lookups", partial(build_lookups, lookups_file))
+    yield record
+
+    (_, valid_df), record = stage(
+        "validate_input", partial(schema.validate_input, input_df, built_lookups), variant="valid"
+    )
+    yield record
+    (invalid_valid, failure_cases), record = stage(
+        "validate_input", partial(schema.validate_input, invalid_input_df, built_lookups), variant="invalid"
+    )
+    if invalid_valid:
+        raise InvalidVariantPassed(f"The invalid {file_format} file of {rows} deals passed validation")
+    yield record
+    del input_df, invalid_input_df
+
+    output_df, record = stage(
+        "schema.transform",
+        partial(schema.transform, valid_df, str(uuid.uuid4()), datetime.datetime.now(), built_lookups),
+    )
+    yield record
+    del valid_df
+
+    _, record = stage(
+        "writer.write_parquet", partial(writer.write_parquet, output_df, str(directory_path / "out.parquet"))
+    )
+    yield record
+    _, record = stage(
+        "writer.write_excel",
+        partial(writer.write_excel, failure_cases, str(directory_path / "errors.xlsx"), sheet_name="Errors"),
+        failure_cases=len(failure_cases),
+    )
+    yield record
+
+
+def write_results(records: Iterable[Dict[str, Any]], file: str):
+    """Append the records as JSON lines, tagged with the commit and environment they were measured on"""
+    environment = {
+        "commit": current_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+    }
+
+    Path(file).parent.mkdir(parents=True, exist_ok=True)
+    with open(file, "a") as f:
+        for record in records:
+            f.write(json.dumps({**environment, **record}) + "\n")
+            f.flush()
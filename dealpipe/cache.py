@@ -0,0 +1,93 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from dealpipe.fingerprint import content_hash, file_stat
+from dealpipe.lookups import LookupDict
+
+CACHE_VERSION = 1
+ENTRY_SUFFIX = ".lookups"
+
+
+class LookupCache:
+    """On-disk LRU cache of built lookups, keyed by file path and content fingerprint.
+
+    An entry is fresh when the file's size and mtime match. When only the mtime changed the content hash decides,
+    so touching or re-copying an unchanged file is still a hit. Entries are pickled, the least recently used ones
+    are evicted once there are more than `max_entries`.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 32):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+
+    def get(self, file: str) -> Optional[LookupDict]:
+        entry_path = self._entry_path(file)
+
+        try:
+            entry = pickle.loads(entry_path.read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        if entry.get("version") != CACHE_VERSION:
+            return None
+
+        stat = file_stat(file)
+        if stat.size != entry["size"]:
+            return None
+
+        if stat.mtime_ns != entry["mtime_ns"]:
+            if content_hash(file) != entry["content_hash"]:
+                return None
+            self._write(entry_path, {**entry, "mtime_ns": stat.mtime_ns})
+        else:
+            os.utime(entry_path)
+
+        return entry["lookups"]
+
+    def put(self, file: str, lookups: LookupDict):
+        stat = file_stat(file)
+        entry = {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(file),
+            "size": stat.size,
+            "mtime_ns": stat.mtime_ns,
+            "content_hash": content_hash(file),
+            "lookups": lookups,
+        }
+
+        self._write(self._entry_path(file), entry)
+        self._evict()
+
+    def get_or_build(self, file: str, build: Callable[[str], LookupDict]) -> Tuple[LookupDict, bool]:
+        """The cached lookups and True on a hit, otherwise the freshly built and stored lookups and False"""
+        lookups = self.get(file)
+
+        if lookups is not None:
+            return lookups, True
+
+        lookups = build(file)
+        self.put(file, lookups)
+        return lookups, False
+
+    def _entry_path(self, file: str) -> Path:
+        key = hashlib.blake2b(os.path.abspath(file).encode("utf-8"), digest_size=16).hexdigest()
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _write(self, entry_path: Path, entry: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so concurrent runs never read a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+
+    def _evict(self):
+        entries = sorted(self.directory.glob(f"*{ENTRY_SUFFIX}"), key=lambda path: path.stat().st_mtime_ns)
+
+        for entry_path in entries[: max(len(entries) - self.max_entries, 0)]:
+            entry_path.unlink(missing_ok=True)
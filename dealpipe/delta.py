@@ -0,0 +1,110 @@
+"""Incremental processing keyed on RowHash.
+
+The RowHash of every row already emitted is kept in a Parquet file with a single RowHash column. Rows whose hash is
+in that set are unchanged and skipped. A deal has no key other than its content, so a changed deal is emitted as a
+new row and the hash of its previous version is listed as deleted, next to the hashes of deals no longer in the
+input. The state only moves forward
+with the hashes of rows that were emitted, so rows that failed validation are processed, and reported, again.
+
+The state file records the RowHash algorithm and row encoding version in its key-value metadata. Reading it with
+another algorithm, or a file without them or of another encoding, such as an output file or the state of an earlier
+release, fails as every row would otherwise look changed.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dealpipe import writer
+from dealpipe.schema import OutputSchema
+from dealpipe.schema.hashing import DEFAULT_ALGORITHM, ENCODING_VERSION
+from dealpipe.schema.transform import hash_input_rows
+
+ROW_HASH = OutputSchema.row_hash
+HASH_ALGORITHM_KEY = b"dealpipe.hash_algorithm"
+ENCODING_VERSION_KEY = b"dealpipe.row_encoding_version"
+
+
+class HashAlgorithmMismatch(Exception):
+    """Raised when row hashes are compared with hashes of another RowHash algorithm"""
+
+
+class RowEncodingMismatch(Exception):
+    """Raised for row hash files without the current row encoding version, delete them to process every row again"""
+
+
+class Delta(NamedTuple):
+    changed: pd.DataFrame
+    deleted: pd.DataFrame
+    unchanged: pd.Index
+
+
+def read_row_hashes(file: str, hash_algorithm: Optional[str] = None) -> pd.Index:
+    """The RowHash column of a Parquet file, empty when the file does not exist yet
+
+    Raises RowEncodingMismatch when the file does not record the current row encoding version and
+    HashAlgorithmMismatch when it records an algorithm other than `hash_algorithm`.
+    """
+    if not os.path.exists(file):
+        return pd.Index([], dtype=object, name=ROW_HASH)
+
+    table = pq.read_table(file, columns=[ROW_HASH])
+    metadata = table.schema.metadata or {}
+    encoding_version = metadata.get(ENCODING_VERSION_KEY, b"").decode()
+    if encoding_version != str(ENCODING_VERSION):
+        raise RowEncodingMismatch(
+            f"{file} holds row hashes of encoding version {encoding_version or 'unknown'}, "
+            f"they cannot be compared with version {ENCODING_VERSION} ones"
+        )
+
+    stored = metadata.get(HASH_ALGORITHM_KEY)
+    if hash_algorithm is not None and stored is not None and stored.decode() != hash_algorithm:
+        raise HashAlgorithmMismatch(
+            f"{file} holds {stored.decode()} row hashes, they cannot be compared with {hash_algorithm} ones"
+        )
+
+    return pd.Index(table.column(ROW_HASH).to_pandas(), name=ROW_HASH).unique()
+
+
+def write_row_hashes(row_hashes: pd.Index, file: str, hash_algorithm: str = DEFAULT_ALGORITHM):
+    """Atomically replace `file`, so an interrupted write leaves the previous hashes in place"""
+    path = Path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+
+    try:
+        table = pa.Table.from_pandas(pd.DataFrame({ROW_HASH: row_hashes}), preserve_index=False)
+        metadata = {
+            **(table.schema.metadata or {}),
+            HASH_ALGORITHM_KEY: hash_algorithm.encode(),
+            ENCODING_VERSION_KEY: str(ENCODING_VERSION).encode(),
+        }
+        writer.write_parquet(table.replace_schema_metadata(metadata), temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def detect_changes(df: pd.DataFrame, previous: pd.Index, hash_algorithm: str = DEFAULT_ALGORITHM) -> Delta:
+    """Rows of `df` not in `previous`, the previous hashes no longer in `df` and the ones still in it
+
+    The changed rows keep their index, so their RowNo is still their position in the input.
+    """
+    hashes = hash_input_rows(df, hash_algorithm)
+    changed = df[~hashes.isin(previous).to_numpy()]
+    current = pd.Index(hashes, name=ROW_HASH).unique()
+    still_present = previous.isin(current)
+    deleted = pd.DataFrame({ROW_HASH: previous[~still_present]})
+
+    return Delta(changed, deleted, previous[still_present].rename(ROW_HASH))
+
+
+def next_row_hashes(unchanged: pd.Index, emitted: pd.Series) -> pd.Index:
+    """The state after a run, the unchanged hashes and those of the rows emitted, never of rows that were rejected"""
+    return unchanged.append(pd.Index(emitted, name=ROW_HASH)).unique()
@@ -0,0 +1,26 @@
+import hashlib
+import os
+from typing import NamedTuple
+
+CHUNK_SIZE = 1 << 20
+
+
+class FileStat(NamedTuple):
+    size: int
+    mtime_ns: int
+
+
+def file_stat(file: str) -> FileStat:
+    stat = os.stat(file)
+    return FileStat(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def content_hash(file: str) -> str:
+    """BLAKE2b digest of the file content, read in bounded chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
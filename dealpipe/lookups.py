@@ -1,4 +1,8 @@
-from typing import Dict, Set, TypedDict
+import hashlib
+import json
+from typing import Dict, NamedTuple, Set, TypedDict
+
+import pandas as pd
 
 from dealpipe import reader
 
@@ -9,6 +13,14 @@ class LookupDict(TypedDict):
     companies: Dict[int, str]
 
 
+class LookupIndex(NamedTuple):
+    """Lookups compiled into sorted pandas indexes for vectorized membership checks"""
+
+    currencies: pd.Index
+    countries: pd.Index
+    companies: pd.Index
+
+
 def build_lookups(file: str) -> LookupDict:
     lookups_df = reader.read(file, sheet=1)
     companies_df = lookups_df[["CompanyId", "CompanyName"]].dropna()
@@ -18,3 +30,22 @@ def build_lookups(file: str) -> LookupDict:
         currencies=set(lookups_df["Currencies"].dropna().unique().tolist()),
         countries=set(lookups_df["Countries"].dropna().unique().tolist()),
     )
+
+
+def build_lookup_index(lookups: LookupDict) -> LookupIndex:
+    return LookupIndex(
+        currencies=pd.Index(sorted(lookups["currencies"])),
+        countries=pd.Index(sorted(lookups["countries"])),
+        companies=pd.Index(sorted(lookups["companies"])),
+    )
+
+
+def lookups_version(lookups: LookupDict) -> str:
+    """BLAKE2b digest of the lookups content, independent of the order they were read in"""
+    content = {
+        "companies": sorted((str(key), str(value)) for key, value in lookups["companies"].items()),
+        "currencies": sorted(map(str, lookups["currencies"])),
+        "countries": sorted(map(str, lookups["countries"])),
+    }
+
+    return hashlib.blake2b(json.dumps(content).encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,157 @@
+"""Bounded Dagster metadata for the frames solids emit.
+
+A profile holds the row count and, per column, the null count, min/max where the values are orderable and the
+distinct count of the code columns. Failure case frames are profiled as their counts per column and check instead.
+"""
+import datetime
+import decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from dagster import EventMetadataEntry, Field
+
+METADATA_MODES = ("profile", "full", "none")
+DEFAULT_SAMPLE_ROWS = 10
+CODE_COLUMNS = ("IsActive", "CountryCode", "CurrencyCode", "CompanyId", "CompanyName")
+
+METADATA_CONFIG = {
+    "metadata": Field(
+        str,
+        default_value="profile",
+        is_required=False,
+        description="profile: column profile and a head sample, full: the whole frame as markdown, none: nothing",
+    ),
+    "metadata_sample_rows": Field(
+        int, default_value=DEFAULT_SAMPLE_ROWS, is_required=False, description="head sample rows of the profile"
+    ),
+}
+
+
+class UnsupportedMetadataMode(Exception):
+    """Raised when the metadata mode is not one of profile, full or none"""
+
+
+def json_value(value) -> Any:
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, decimal.Decimal)):
+        return str(value)
+
+    return repr(value)
+
+
+def min_max(values: pd.Series) -> Tuple[Any, Any]:
+    """Min and max of the non-null values"""
+    try:
+        return values.min(), values.max()
+    except (TypeError, NotImplementedError):
+        if not pd.api.types.is_extension_array_dtype(values.dtype):
+            raise
+
+        # extension arrays without reductions of their own are ordered by their Python values
+        objects = values.astype(object)
+        return objects.min(), objects.max()
+
+
+def categorical_profile(series: pd.Series, distinct: bool) -> Dict[str, Any]:
+    """Profile of a categorical from its codes, only the categories in use are looked at"""
+    codes = series.cat.codes.to_numpy()
+    used = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)) > 0
+    categories = series.cat.categories[used]
+    profile: Dict[str, Any] = {"nulls": int((codes < 0).sum())}
+
+    if len(categories):
+        # unordered categoricals have no min/max, their values do
+        minimum, maximum = (categories[0], categories[-1]) if series.cat.ordered else min_max(categories.to_series())
+        profile.update(min=json_value(minimum), max=json_value(maximum))
+    else:
+        profile.update(min=None, max=None)
+
+    if distinct:
+        profile["distinct"] = len(categories)
+
+    return profile
+
+
+def column_profile(series: pd.Series, distinct: bool) -> Dict[str, Any]:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        try:
+            return categorical_profile(series, distinct)
+        except (TypeError, ValueError) as e:
+            return {"nulls": int(series.isna().sum()), "min_max_error": str(e)}
+
+    missing = series.isna().to_numpy()
+    profile: Dict[str, Any] = {"nulls": int(missing.sum())}
+    values = series
+    if profile["nulls"] and series.dtype == object:
+        # the object reductions compare nulls with the values, only these columns are masked, with the same mask
+        values = series[~missing]
+
+    try:
+        minimum, maximum = min_max(values)
+    except (TypeError, ValueError) as e:
+        # values of mixed types have no order, the profile tells why it has no min/max
+        profile["min_max_error"] = str(e)
+    else:
+        profile.update(min=json_value(minimum), max=json_value(maximum))
+
+    if distinct:
+        profile["distinct"] = int(values.nunique())
+
+    return profile
+
+
+def profile(df: pd.DataFrame, distinct_columns: Iterable[str] = CODE_COLUMNS) -> Dict[str, Any]:
+    distinct_columns = set(distinct_columns)
+
+    return {
+        "rows": len(df),
+        "columns": {
+            str(column): column_profile(df[column], column in distinct_columns) for column in df.columns.unique()
+        },
+    }
+
+
+def errors_profile(failure_cases: pd.DataFrame) -> Dict[str, Any]:
+    counts = failure_cases.groupby(["column", "check"], dropna=False, sort=False).size()
+
+    return {
+        "failure_cases": len(failure_cases),
+        "checks": [
+            {"column": json_value(column), "check": json_value(check), "count": int(count)}
+            for (column, check), count in counts.items()
+        ],
+    }
+
+
+def metadata_entries(
+    df: pd.DataFrame,
+    label: str,
+    mode: str = "profile",
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    failure_cases: bool = False,
+) -> List[EventMetadataEntry]:
+    """Metadata entries describing the frame, bounded in size unless the mode is full"""
+    if mode not in METADATA_MODES:
+        raise UnsupportedMetadataMode(f"Unsupported metadata mode '{mode}', expected one of {METADATA_MODES}")
+
+    if mode == "none":
+        return []
+    if mode == "full":
+        return [EventMetadataEntry.md(md_str=df.to_markdown(), label=label)]
+
+    entries = [
+        EventMetadataEntry.json(
+            data=errors_profile(df) if failure_cases else profile(df),
+            label=f"{label} profile",
+        )
+    ]
+    if sample_rows > 0:
+        entries.append(EventMetadataEntry.md(md_str=df.head(sample_rows).to_markdown(), label=f"{label} sample"))
+
+    return entries
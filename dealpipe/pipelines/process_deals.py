@@ -3,14 +3,41 @@ from pathlib import Path
 from dagster import ModeDefinition, PresetDefinition, pipeline
 
 import dealpipe
+from dealpipe.resources.instrumentation import instrumentation
+from dealpipe.resources.registry import fingerprint_registry
+from dealpipe.resources.row_hashes import row_hash_state
+from dealpipe.solids.delta import detect_changes, save_delta
 from dealpipe.solids.loader import load_deals
 from dealpipe.solids.lookups import load_deals_lookup
+from dealpipe.solids.registry import record_fingerprint
 from dealpipe.solids.transform import transform
 from dealpipe.solids.validator import validate
 from dealpipe.solids.writer import save_errors, save_output
 
-MODE_DEV = ModeDefinition(name="dev", resource_defs={})
-MODE_TEST = ModeDefinition(name="test", resource_defs={})
+RESOURCE_DEFS = {
+    "instrumentation": instrumentation,
+    "row_hash_state": row_hash_state,
+    "fingerprint_registry": fingerprint_registry,
+}
+# every run of the dev and test modes processes its input, the ephemeral instances of a process share their directory
+MODE_DEV = ModeDefinition(
+    name="dev",
+    resource_defs={**RESOURCE_DEFS, "fingerprint_registry": fingerprint_registry.configured({"enabled": False})},
+)
+MODE_TEST = ModeDefinition(
+    name="test",
+    resource_defs={**RESOURCE_DEFS, "fingerprint_registry": fingerprint_registry.configured({"enabled": False})},
+)
+MODE_PROD = ModeDefinition(
+    name="prod",
+    resource_defs={
+        "instrumentation": instrumentation.configured(
+            {"sink": "prometheus", "path": {"env": "DEALPIPE_METRICS_TEXTFILE"}}
+        ),
+        "row_hash_state": row_hash_state,
+        "fingerprint_registry": fingerprint_registry,
+    },
+)
 PRESET_PATH = Path(dealpipe.__file__).parent.parent / "presets"
 
 INVALID_XLSX_PRESET = PresetDefinition.from_files(
@@ -46,7 +73,7 @@ VALID_YAML_PRESET = PresetDefinition.from_files(
 
 
 @pipeline(
-    mode_defs=[MODE_DEV, MODE_TEST],
+    mode_defs=[MODE_DEV, MODE_TEST, MODE_PROD],
     preset_defs=[
         INVALID_XLSX_PRESET,
         VALID_XLSX_PRESET,
@@ -58,8 +85,11 @@ VALID_YAML_PRESET = PresetDefinition.from_files(
 )
 def process_deals():
     deals_lookup = load_deals_lookup()
-    deals_df = load_deals()
-    valid_df, errors_df = validate(deals_df, deals_lookup)
-    save_errors(errors_df)
+    deals_df, fingerprint = load_deals(deals_lookup)
+    changed_df, deleted_df, row_hashes = detect_changes(deals_df)
+    valid_df, errors_df = validate(changed_df, deals_lookup)
+    errors_saved = save_errors(errors_df)
     output_df = transform(valid_df, deals_lookup)
-    save_output(output_df)
+    output_saved = save_output(output_df)
+    delta_saved = save_delta(deleted=deleted_df, row_hashes=row_hashes, emitted=output_df, output_saved=output_saved)
+    record_fingerprint(fingerprint, outputs_saved=[errors_saved, output_saved, delta_saved])
@@ -0,0 +1,39 @@
+from dagster import ModeDefinition, pipeline
+
+from dealpipe.pipelines.process_deals import (
+    INVALID_CSV_PRESET,
+    INVALID_XLSX_PRESET,
+    INVALID_YAML_PRESET,
+    MODE_PROD,
+    VALID_CSV_PRESET,
+    VALID_XLSX_PRESET,
+    VALID_YAML_PRESET,
+)
+from dealpipe.resources.instrumentation import instrumentation
+from dealpipe.solids.arrow import load_deals_table, save_output_table, transform_table, validate_table
+from dealpipe.solids.lookups import load_deals_lookup
+from dealpipe.solids.writer import save_errors
+
+MODE_DEV = ModeDefinition(name="dev", resource_defs={"instrumentation": instrumentation})
+MODE_TEST = ModeDefinition(name="test", resource_defs={"instrumentation": instrumentation})
+
+
+@pipeline(
+    mode_defs=[MODE_DEV, MODE_TEST, MODE_PROD],
+    preset_defs=[
+        INVALID_XLSX_PRESET,
+        VALID_XLSX_PRESET,
+        INVALID_CSV_PRESET,
+        VALID_CSV_PRESET,
+        INVALID_YAML_PRESET,
+        VALID_YAML_PRESET,
+    ],
+)
+def process_deals_arrow():
+    """process_deals on Arrow tables from the reader to the Parquet writer"""
+    deals_lookup = load_deals_lookup()
+    table = load_deals_table()
+    valid_table, errors_df = validate_table(table, deals_lookup)
+    save_errors(errors_df)
+    output_table = transform_table(valid_table, deals_lookup)
+    save_output_table(output_table)
@@ -1,23 +1,52 @@
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 from pandas.core.frame import DataFrame
 
 from dealpipe.reader.factory import factory
 from dealpipe.reader.mime import detect_format
+from dealpipe.reader.reader import DEFAULT_CHUNKSIZE, Dtypes, Filters, InvalidFilterError, InvalidSheetError, Sheet
 
+__all__ = ["Dtypes", "Filters", "InvalidFilterError", "InvalidSheetError", "Sheet", "iter_chunks", "read"]
 
-class InvalidSheetError(Exception):
-    """Raised when someone tries to get an invalid sheet index"""
 
+def read(
+    file: str,
+    converters: Optional[Dict[str, Callable]] = None,
+    sheet: Sheet = 0,
+    dtype: Optional[Dtypes] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    memory_map: bool = False,
+) -> DataFrame:
+    """Reads a single sheet, given by index or name, only that sheet is parsed for workbook formats
 
-def read(file: str, converters: Optional[Dict[str, Callable]] = None, sheet: int = 0) -> DataFrame:
+    Text formats are parsed straight into the `dtype` column types when given. Only `columns` of the rows matching
+    `filters` are returned when given, parquet files push both down so that only the row groups and columns needed
+    are decoded.
+    """
     format = detect_format(file)
     reader = factory.get_reader(format)
-    sheets = reader.read(file, converters)
+    if columns is not None or filters or memory_map:
+        sheets = reader.read_selected(file, converters, sheet, dtype, columns, filters, memory_map)
+    else:
+        sheets = reader.read(file, converters, sheet, dtype)
 
     if len(sheets) == 1:
         return sheets[0]
-    elif sheet < len(sheets):
+    elif isinstance(sheet, int) and sheet < len(sheets):
         return sheets[sheet]
     else:
         raise InvalidSheetError("Invalid sheet index")
+
+
+def iter_chunks(
+    file: str,
+    converters: Optional[Dict[str, Callable]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    sheet: Sheet = 0,
+    dtype: Optional[Dtypes] = None,
+) -> Iterator[DataFrame]:
+    format = detect_format(file)
+    reader = factory.get_reader(format)
+
+    return reader.iter_chunks(file, converters, chunksize, sheet, dtype)
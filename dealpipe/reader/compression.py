@@ -0,0 +1,132 @@
+"""Compressed inputs, decompressed while they are read.
+
+Decompression runs on a background thread that fills a bounded queue of blocks, so it overlaps with the parsing done
+by the reading thread and the decompressed content is never written to disk.
+"""
+import bz2
+import gzip
+import io
+import queue
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+from dealpipe.reader.mime import BOMS, bom_encoding, sniff
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BLOCK_SIZE = 1 << 20
+MAX_QUEUED_BLOCKS = 8
+
+
+class UnsupportedCompression(Exception):
+    """Raised for compressions without a decompressor, zstd needs the optional zstandard package"""
+
+
+def open_decompressor(file: str, compression: str) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.open(file, "rb")
+    if compression == "bz2":
+        return bz2.open(file, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise UnsupportedCompression("Reading zstd compressed files needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(open(file, "rb"), closefd=True)
+
+    raise UnsupportedCompression(f"Unsupported compression '{compression}'")
+
+
+class ThreadedReader(io.RawIOBase):
+    """Raw stream over blocks read from `source` on a background thread"""
+
+    def __init__(self, source: BinaryIO, block_size: int = BLOCK_SIZE, max_blocks: int = MAX_QUEUED_BLOCKS):
+        super().__init__()
+        self._source = source
+        self._block_size = block_size
+        self._blocks: queue.Queue = queue.Queue(maxsize=max_blocks)
+        self._stopped = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._produce, name="dealpipe-decompress", daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        try:
+            while not self._stopped.is_set():
+                block = self._source.read(self._block_size)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:  # re-raised in the reading thread
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stopped.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            # the producer has exited after its error, every later read raises it again instead of waiting
+            if self._error is not None:
+                raise self._error
+            if self._eof:
+                return 0
+
+            block = self._blocks.get()
+            if isinstance(block, Exception):
+                self._error = block
+                raise block
+            if not block:
+                self._eof = True
+                return 0
+            self._pending = memoryview(block)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stopped.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def open_decompressed(file: str, compression: str, block_size: int = BLOCK_SIZE) -> io.BufferedReader:
+    return io.BufferedReader(ThreadedReader(open_decompressor(file, compression), block_size), block_size)
+
+
+@contextmanager
+def open_input(file: str, compression: Optional[str] = None) -> Iterator[Union[str, BinaryIO]]:
+    """The file itself when it is not compressed, otherwise a stream of its decompressed content
+
+    The compression is sniffed from the content when not given.
+    """
+    compression = compression or sniff(file).compression
+    if compression is None:
+        yield file
+        return
+
+    with open_decompressed(file, compression) as stream:
+        yield stream
+
+
+def input_encoding(file: str, source: Union[str, BinaryIO]) -> Optional[str]:
+    """Text encoding of an input opened with open_input, from the byte order mark of its (decompressed) content"""
+    if isinstance(source, str):
+        return sniff(file).encoding
+
+    return bom_encoding(source.peek(max(len(bom) for _, bom in BOMS)))
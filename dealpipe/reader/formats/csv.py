@@ -1,10 +1,83 @@
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
+import numpy as np
+import pyarrow as pa
 from pandas import DataFrame, read_csv
+from pyarrow import csv
 
-from dealpipe.reader.reader import Reader
+from dealpipe.reader.compression import input_encoding, open_input
+from dealpipe.reader.reader import DEFAULT_CHUNKSIZE, Dtypes, Reader, Sheet, with_offset
+
+
+def arrow_type(dtype) -> pa.DataType:
+    if dtype in (str, "str", object, "object"):
+        return pa.string()
+
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+def text_dtypes(dtype: Optional[Dtypes]) -> Optional[Dtypes]:
+    """Only the text columns of `dtype`, reading a column as text never fails"""
+    if not dtype:
+        return dtype
+
+    return {column: column_dtype for column, column_dtype in dtype.items() if arrow_type(column_dtype) == pa.string()}
+
+
+def read_csv_arrow(file: str, dtype: Dtypes) -> DataFrame:
+    """Parse with the multi-threaded pyarrow CSV reader straight into the given column types"""
+    convert_options = csv.ConvertOptions(
+        column_types={column: arrow_type(column_dtype) for column, column_dtype in dtype.items()},
+        strings_can_be_null=True,
+    )
+
+    with open_input(file) as source:
+        read_options = csv.ReadOptions(encoding=input_encoding(file, source) or "utf8")
+        return csv.read_csv(source, read_options=read_options, convert_options=convert_options).to_pandas()
 
 
 class CsvReader(Reader):
-    def read(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> List[DataFrame]:
-        return [read_csv(file, converters=converters)]
+    def read(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+    ) -> List[DataFrame]:
+        if dtype and not converters:
+            try:
+                return [read_csv_arrow(file, dtype)]
+            except pa.ArrowInvalid:
+                # values that do not parse as their column type are left for the validation to report
+                dtype = text_dtypes(dtype)
+
+        with open_input(file) as source:
+            encoding = input_encoding(file, source)
+            return [read_csv(source, converters=converters, dtype=dtype, compression=None, encoding=encoding)]
+
+    def iter_chunks(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        sheet: Sheet = 0,
+        dtype: Optional[Dtypes] = None,
+    ) -> Iterator[DataFrame]:
+        with open_input(file) as source:
+            # a value that does not parse would only fail a later chunk, so only text columns are typed
+            chunks = read_csv(
+                source,
+                converters=converters,
+                dtype=text_dtypes(dtype),
+                chunksize=chunksize,
+                compression=None,
+                encoding=input_encoding(file, source),
+            )
+            offset = 0
+
+            try:
+                for chunk in chunks:
+                    yield with_offset(chunk, offset)
+                    offset += len(chunk)
+            finally:
+                chunks.close()
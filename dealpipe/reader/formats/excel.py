@@ -1,12 +1,121 @@
-from typing import Callable, Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from pandas import DataFrame, read_excel
+from openpyxl import load_workbook
+from pandas import DataFrame, ExcelFile
 
-from dealpipe.reader.reader import Reader
+from dealpipe.reader.reader import DEFAULT_CHUNKSIZE, Dtypes, Reader, Sheet, resolve_sheet, with_offset
+
+
+def is_xlsx(file: str) -> bool:
+    # xlsx workbooks are zip archives, legacy xls workbooks are OLE2 compound files
+    with open(file, "rb") as f:
+        return f.read(4) == b"PK\x03\x04"
+
+
+def cell_value(value: Any) -> Any:
+    # read_excel returns integral floats as int, keep the streamed values consistent with it
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+def iter_rows(worksheet) -> Iterator[List[Any]]:
+    """Streams the non-blank rows of a read-only worksheet, header first"""
+    # the dimensions stored in the file are not always reliable, read until the last row instead
+    worksheet.reset_dimensions()
+
+    for row in worksheet.iter_rows(values_only=True):
+        if any(value is not None for value in row):
+            yield [cell_value(value) for value in row]
+
+
+def rows_to_frame(header: List[Any], rows: List[List[Any]], converters: Optional[Dict[str, Callable]]) -> DataFrame:
+    columns = {}
+
+    for position, name in enumerate(header):
+        values = [row[position] if position < len(row) else None for row in rows]
+        converter = converters.get(name) if converters else None
+
+        if converter:
+            values = [converter(value) if value is not None else None for value in values]
+
+        columns[name if name is not None else f"Unnamed: {position}"] = values
+
+    return DataFrame(columns)
+
+
+def iter_worksheet_chunks(
+    worksheet, converters: Optional[Dict[str, Callable]], chunksize: Optional[int]
+) -> Iterator[DataFrame]:
+    rows = iter_rows(worksheet)
+    header = next(rows, [])
+
+    while header and header[-1] is None:
+        header.pop()
+
+    offset = 0
+    while header:
+        block = list(islice(rows, chunksize))
+        if not block:
+            break
+
+        yield with_offset(rows_to_frame(header, block, converters), offset)
+        offset += len(block)
+
+
+def read_worksheet(worksheet, converters: Optional[Dict[str, Callable]]) -> DataFrame:
+    chunks = list(iter_worksheet_chunks(worksheet, converters, chunksize=None))
+
+    return chunks[0] if chunks else DataFrame()
 
 
 class ExcelReader(Reader):
-    def read(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> List[DataFrame]:
-        sheets = read_excel(file, converters=converters, sheet_name=None)
+    def read(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+    ) -> List[DataFrame]:
+        # cells are typed, dtype only applies to text formats
+        if not is_xlsx(file):
+            return self._read_xls(file, converters, sheet)
+
+        # read-only mode streams the sheet XML instead of building the whole workbook DOM
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            names = workbook.sheetnames if sheet is None else [resolve_sheet(workbook.sheetnames, sheet)]
+
+            return [read_worksheet(workbook[name], converters) for name in names]
+        finally:
+            workbook.close()
+
+    def iter_chunks(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        sheet: Sheet = 0,
+        dtype: Optional[Dtypes] = None,
+    ) -> Iterator[DataFrame]:
+        if not is_xlsx(file):
+            # legacy xls workbooks can't be streamed
+            yield from super().iter_chunks(file, converters, chunksize, sheet, dtype)
+            return
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[resolve_sheet(workbook.sheetnames, sheet)]
+            yield from iter_worksheet_chunks(worksheet, converters, chunksize)
+        finally:
+            workbook.close()
+
+    def _read_xls(
+        self, file: str, converters: Optional[Dict[str, Callable]], sheet: Optional[Sheet]
+    ) -> List[DataFrame]:
+        with ExcelFile(file) as workbook:
+            names = workbook.sheet_names if sheet is None else [resolve_sheet(workbook.sheet_names, sheet)]
 
-        return list(sheets.values())
+            return [workbook.parse(name, converters=converters) for name in names]
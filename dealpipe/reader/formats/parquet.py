@@ -1,11 +1,50 @@
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pandas import DataFrame, read_parquet
 
-from dealpipe.reader.reader import Reader
+from dealpipe.reader.reader import DEFAULT_CHUNKSIZE, Dtypes, Filters, Reader, Sheet, with_offset
 
 
 class ParquetReader(Reader):
-    def read(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> List[DataFrame]:
-        # converters is not used with parquet files because they already have a schema specified
+    def read(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+    ) -> List[DataFrame]:
+        # converters and dtype are not used with parquet files because they already have a schema specified
         return [read_parquet(file)]
+
+    def read_selected(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        memory_map: bool = False,
+    ) -> List[DataFrame]:
+        # row groups whose statistics rule out `filters` are skipped and only `columns` are decoded
+        table = pq.read_table(file, columns=columns, filters=filters or None, memory_map=memory_map)
+        return [table.to_pandas()]
+
+    def iter_chunks(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        sheet: Sheet = 0,
+        dtype: Optional[Dtypes] = None,
+    ) -> Iterator[DataFrame]:
+        # batches never span row groups, so only one row group is decoded at a time
+        parquet_file = pq.ParquetFile(file)
+        offset = 0
+
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            chunk = pa.Table.from_batches([batch], schema=parquet_file.schema_arrow).to_pandas()
+            yield with_offset(chunk, offset)
+            offset += len(chunk)
@@ -1,10 +1,12 @@
-from pathlib import Path
-from typing import Callable, Dict, List, Optional
+import io
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+import pandas as pd
 from pandas import DataFrame
-from yaml import load
+from yaml import load_all
 
-from dealpipe.reader.reader import Reader
+from dealpipe.reader.compression import input_encoding, open_input
+from dealpipe.reader.reader import DEFAULT_CHUNKSIZE, Dtypes, Reader, Sheet, with_offset
 
 try:
     from yaml import CLoader as Loader
@@ -12,18 +14,124 @@ except ImportError:
     from yaml import Loader
 
 
+class UnsupportedYamlLayout(Exception):
+    """Raised for YAML documents that are neither a list of records nor a mapping of column to values"""
+
+
+class ColumnBuilder:
+    """Column arrays of YAML documents, built while they are read
+
+    Each column keeps the positions of its non-missing values next to the values, keys a record leaves out and
+    nulls are missing. A converter is applied to a column in one call over its non-missing values, which stay
+    aligned to their positions, so it sees the YAML scalars as they were parsed.
+    """
+
+    def __init__(self):
+        self.columns: Dict[Any, Tuple[List[int], List[Any]]] = {}
+        self.length = 0
+
+    def column(self, name: Any) -> Tuple[List[int], List[Any]]:
+        if name not in self.columns:
+            self.columns[name] = ([], [])
+        return self.columns[name]
+
+    def add(self, document: Any):
+        """Append a list of records, or a mapping of column to a list of its values"""
+        if isinstance(document, list):
+            self.add_records(document)
+        elif isinstance(document, dict) and all(isinstance(values, list) for values in document.values()):
+            self.add_columns(document)
+        else:
+            raise UnsupportedYamlLayout(f"Unsupported YAML document of type {type(document).__name__}")
+
+    def add_records(self, records: List[Any]):
+        for position, record in enumerate(records, self.length):
+            if not isinstance(record, dict):
+                raise UnsupportedYamlLayout(f"Unsupported YAML record of type {type(record).__name__}")
+            for name, value in record.items():
+                if value is not None:
+                    positions, values = self.column(name)
+                    positions.append(position)
+                    values.append(value)
+
+        self.length += len(records)
+
+    def add_columns(self, document: Dict[Any, List[Any]]):
+        for name, column_values in document.items():
+            positions, values = self.column(name)
+            for position, value in enumerate(column_values, self.length):
+                if value is not None:
+                    positions.append(position)
+                    values.append(value)
+
+        self.length += max((len(values) for values in document.values()), default=0)
+
+    def frame(self, converters: Optional[Dict[str, Callable]] = None) -> DataFrame:
+        index = pd.RangeIndex(self.length)
+        data = {}
+        for name, (positions, values) in self.columns.items():
+            converter = converters.get(name) if converters else None
+            if converter or not values:
+                column = pd.Series(values, index=positions, dtype=object)
+                if converter:
+                    column = column.map(converter)
+            else:
+                column = pd.Series(values, index=positions)
+            data[name] = column.reindex(index)
+
+        return DataFrame(data, index=index)
+
+
+def iter_documents(source: Union[str, BinaryIO], encoding: Optional[str] = None) -> Iterator[Any]:
+    """Documents of a YAML stream, parsed one at a time"""
+    if isinstance(source, str):
+        with open(source, "rb") as stream:
+            yield from iter_documents(stream, encoding)
+    elif encoding:
+        yield from load_all(io.TextIOWrapper(source, encoding=encoding), Loader=Loader)
+    else:
+        yield from load_all(source, Loader=Loader)
+
+
 class YamlReader(Reader):
-    def read(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> List[DataFrame]:
-        table_data = load(Path(file).read_text(), Loader=Loader)
+    def iter_frames(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> Iterator[DataFrame]:
+        """A table per document of the stream, empty documents are skipped"""
+        with open_input(file) as source:
+            for document in iter_documents(source, input_encoding(file, source)):
+                if document is not None:
+                    builder = ColumnBuilder()
+                    builder.add(document)
+                    yield builder.frame(converters)
+
+    def read(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+    ) -> List[DataFrame]:
+        # scalars are typed by YAML itself, dtype only applies to text formats
+        builder = ColumnBuilder()
+        with open_input(file) as source:
+            for document in iter_documents(source, input_encoding(file, source)):
+                if document is not None:
+                    builder.add(document)
 
-        if converters:
-            self._convert_values(table_data, converters)
+        return [builder.frame(converters) if builder.columns else DataFrame()]
 
-        return [DataFrame(table_data)]
+    def iter_chunks(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        sheet: Sheet = 0,
+        dtype: Optional[Dtypes] = None,
+    ) -> Iterator[DataFrame]:
+        # only one document of a multi-document stream is held at a time
+        offset = 0
 
-    def _convert_values(self, data: List[Dict], converters: Dict):
-        """Inplace conversion of values"""
-        for row_idx, row in enumerate(data):
-            for column, value in row.items():
-                if column in converters:
-                    data[row_idx][column] = converters[column](value)
+        for df in self.iter_frames(file, converters):
+            with_offset(df, offset)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start : start + chunksize]
+            offset += len(df)
@@ -1,43 +1,163 @@
-def is_excel(file: str) -> bool:
-    excel_sigs = [
-        ("xlsx", b"\x50\x4B\x05\x06", 2, -22, 4),
-        ("xls", b"\x09\x08\x10\x00\x00\x06\x05\x00", 0, 512, 8),  # Saved from Excel
-        (
-            "xls",
-            b"\x09\x08\x10\x00\x00\x06\x05\x00",
-            0,
-            1536,
-            8,
-        ),  # Saved from LibreOffice Calc
-        (
-            "xls",
-            b"\x09\x08\x10\x00\x00\x06\x05\x00",
-            0,
-            2048,
-            8,
-        ),  # Saved from Excel then saved from Calc
-    ]
-
-    for _, sig, whence, offset, size in excel_sigs:
-        with open(file, "rb") as f:
-            f.seek(offset, whence)
-            bytes = f.read(size)
-
-            if bytes == sig:
-                return True
-
-    return False
+"""Input format detection from file content.
 
+A file is opened once and its first HEAD_SIZE and last TAIL_SIZE bytes are matched against a table of binary
+signatures. Anything else is treated as text and told apart by name, or by its first line. Compressed files are
+recognised by their magic and opened a second time to put the first HEAD_SIZE bytes of their content through the
+same checks, under the name without the compression suffix. Results are cached by path, size and modification time.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
 
-def detect_format(file: str) -> str:
-    """A very naive but simple implementation"""
-    if file.endswith(".csv"):
-        return "csv"
-    elif file.endswith(".yaml") or file.endswith(".yml"):
-        return "yaml"
-    elif ".parquet" in file:
-        return "parquet"
-    elif is_excel(file):
-        return "excel"
-    else:
+# the OLE2 workbook stream signatures sit at up to 2048 + 8 bytes into an xls file
+HEAD_SIZE = 4096
+# a zip end of central directory record without an archive comment
+TAIL_SIZE = 22
+
+BIFF_SIGNATURE = b"\x09\x08\x10\x00\x00\x06\x05\x00"
+SIGNATURES: Tuple[Tuple[str, int, bytes], ...] = (
+    ("parquet", 0, b"PAR1"),
+    ("excel", 0, b"PK\x03\x04"),  # xlsx, a zip archive
+    ("excel", -22, b"PK\x05\x06"),
+    ("excel", 0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),  # xls, an OLE2 compound document
+    ("excel", 512, BIFF_SIGNATURE),  # saved from Excel
+    ("excel", 1536, BIFF_SIGNATURE),  # saved from LibreOffice Calc
+    ("excel", 2048, BIFF_SIGNATURE),  # saved from Excel then saved from Calc
+)
+COMPRESSIONS: Tuple[Tuple[str, bytes, Tuple[str, ...]], ...] = (
+    ("gzip", b"\x1f\x8b", (".gz", ".gzip")),
+    ("zstd", b"\x28\xb5\x2f\xfd", (".zst", ".zstd")),
+    ("bz2", b"BZh", (".bz2",)),
+)
+BOMS: Tuple[Tuple[str, bytes], ...] = (
+    ("utf-8-sig", b"\xef\xbb\xbf"),
+    ("utf-16", b"\xff\xfe"),
+    ("utf-16", b"\xfe\xff"),
+)
+TEXT_EXTENSIONS = {".csv": "csv", ".yaml": "yaml", ".yml": "yaml"}
+YAML_START = re.compile(r"^(---|- |[\w\"'][^,]*:(\s|$))")
+
+
+class Sniffed(NamedTuple):
+    format: str
+    compression: Optional[str] = None
+    encoding: Optional[str] = None
+
+
+def read_head_tail(file: str) -> Tuple[bytes, bytes]:
+    with open(file, "rb") as f:
+        head = f.read(HEAD_SIZE)
+        size = f.seek(0, os.SEEK_END)
+
+        if size <= HEAD_SIZE:
+            return head, head[-TAIL_SIZE:]
+
+        f.seek(size - TAIL_SIZE)
+        return head, f.read(TAIL_SIZE)
+
+
+def match_signature(head: bytes, tail: bytes) -> Optional[str]:
+    for format, offset, magic in SIGNATURES:
+        if offset < 0:
+            # the tail is TAIL_SIZE long, so the offset is from its end
+            found = tail[len(tail) + offset : len(tail) + offset + len(magic)]
+        else:
+            found = head[offset : offset + len(magic)]
+
+        if found == magic:
+            return format
+
+    return None
+
+
+def format_from_name(file: str) -> str:
+    for extension, format in TEXT_EXTENSIONS.items():
+        if file.endswith(extension):
+            return format
+
+    return "parquet" if ".parquet" in file else "unknown"
+
+
+def text_format(file: str, head: bytes, encoding: Optional[str]) -> str:
+    format = format_from_name(file)
+    if format != "unknown":
+        return format
+
+    try:
+        text = head.decode(encoding or "utf-8", errors="strict" if encoding else "ignore")
+    except UnicodeDecodeError:
+        return "unknown"
+
+    if "\x00" in text:
         return "unknown"
+
+    first_line = next((line for line in text.splitlines() if line.strip()), "")
+    if YAML_START.match(first_line):
+        return "yaml"
+    if "," in first_line:
+        return "csv"
+
+    return "unknown"
+
+
+def bom_encoding(head: bytes) -> Optional[str]:
+    """The text encoding named by the byte order mark the content starts with"""
+    return next((encoding for encoding, bom in BOMS if head.startswith(bom)), None)
+
+
+def sniff_uncompressed(file: str, head: bytes, tail: bytes) -> Sniffed:
+    format = match_signature(head, tail)
+    if format:
+        return Sniffed(format)
+
+    encoding = bom_encoding(head)
+    return Sniffed(text_format(file, head, encoding), encoding=encoding)
+
+
+def read_decompressed_head(file: str, compression: str) -> bytes:
+    # imported here as the compression module sniffs the files it opens
+    from dealpipe.reader.compression import open_decompressor
+
+    with open_decompressor(file, compression) as stream:
+        return stream.read(HEAD_SIZE)
+
+
+def sniff_content(file: str, head: bytes, tail: bytes) -> Sniffed:
+    for compression, magic, extensions in COMPRESSIONS:
+        if head.startswith(magic):
+            name = file.lower()
+            for extension in extensions:
+                if name.endswith(extension):
+                    name = name[: -len(extension)]
+
+            try:
+                inner = read_decompressed_head(file, compression)
+            except Exception:  # a corrupt or unsupported stream is reported by the reader, the name still tells
+                return Sniffed(format_from_name(name), compression)
+
+            return sniff_uncompressed(name, inner, inner[-TAIL_SIZE:])._replace(compression=compression)
+
+    return sniff_uncompressed(file, head, tail)
+
+
+@lru_cache(maxsize=4096)
+def _sniff(path: str, size: int, mtime_ns: int) -> Sniffed:
+    head, tail = read_head_tail(path)
+
+    return sniff_content(path, head, tail)
+
+
+def sniff(file: str) -> Sniffed:
+    """Format, compression and text encoding of the file, cached until its size or modification time changes"""
+    stat = os.stat(file)
+
+    return _sniff(os.path.abspath(file), stat.st_size, stat.st_mtime_ns)
+
+
+def detect_format(file: str) -> str:
+    """The format of the file's content, or of its name when the file cannot be opened"""
+    try:
+        return sniff(file).format
+    except OSError:
+        return format_from_name(file)
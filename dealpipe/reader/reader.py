@@ -1,10 +1,124 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from pandas import DataFrame
+from pandas import DataFrame, RangeIndex, Series
+
+DEFAULT_CHUNKSIZE = 100_000
+
+Sheet = Union[int, str]
+# column types to parse text formats into, formats that store their own types keep those
+Dtypes = Dict[str, Any]
+# row filters in pyarrow's disjunctive normal form, e.g. [("CountryCode", "==", "BGR")] or a list of such lists OR'ed
+Filter = Tuple[str, str, Any]
+Filters = Union[List[Filter], List[List[Filter]]]
+
+# comparisons with a null are null in pyarrow, so they never match, while `not in` matches nulls
+FILTER_OPERATORS: Dict[str, Callable[[Series, Any], Series]] = {
+    "==": lambda column, value: (column == value) & column.notna(),
+    "=": lambda column, value: (column == value) & column.notna(),
+    "!=": lambda column, value: (column != value) & column.notna(),
+    "<": lambda column, value: (column < value) & column.notna(),
+    "<=": lambda column, value: (column <= value) & column.notna(),
+    ">": lambda column, value: (column > value) & column.notna(),
+    ">=": lambda column, value: (column >= value) & column.notna(),
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: ~column.isin(value),
+}
+
+
+class InvalidSheetError(Exception):
+    """Raised when someone tries to get an invalid sheet index"""
+
+
+class InvalidFilterError(Exception):
+    """Raised for row filters with an unknown operator"""
+
+
+def with_offset(df: DataFrame, offset: int) -> DataFrame:
+    """Index a chunk by its global row position in the file"""
+    df.index = RangeIndex(offset, offset + len(df))
+    return df
+
+
+def resolve_sheet(sheet_names: List[str], sheet: Sheet) -> str:
+    """Name of the requested sheet, a workbook with a single sheet always resolves to it"""
+    if len(sheet_names) == 1:
+        return sheet_names[0]
+    elif isinstance(sheet, int) and 0 <= sheet < len(sheet_names):
+        return sheet_names[sheet]
+    elif isinstance(sheet, str) and sheet in sheet_names:
+        return sheet
+    else:
+        raise InvalidSheetError(f"Invalid sheet {sheet!r}")
+
+
+def filter_rows(df: DataFrame, filters: Filters) -> Series:
+    """Mask of the rows matching `filters`, with the same semantics pyarrow gives them"""
+    conjunctions: Sequence[List[Filter]] = filters if isinstance(filters[0], list) else [filters]  # type: ignore
+    mask = Series(False, index=df.index)
+
+    for conjunction in conjunctions:
+        matches = Series(True, index=df.index)
+        for column, operator, value in conjunction:
+            if operator not in FILTER_OPERATORS:
+                raise InvalidFilterError(f"Invalid filter operator {operator!r}")
+            matches &= FILTER_OPERATORS[operator](df[column], value)
+        mask |= matches
+
+    return mask
+
+
+def select(df: DataFrame, columns: Optional[List[str]] = None, filters: Optional[Filters] = None) -> DataFrame:
+    """Only `columns` of the rows matching `filters`, re-indexed from 0 like a filtered parquet read"""
+    if filters:
+        df = df[filter_rows(df, filters)].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+
+    return df
 
 
 class Reader(ABC):
     @abstractmethod
-    def read(self, file: str, converters: Optional[Dict[str, Callable]] = None) -> List[DataFrame]:
-        pass
+    def read(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+    ) -> List[DataFrame]:
+        """Reads all sheets of the file, or only `sheet` when given and the format has sheets"""
+
+    def read_selected(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        sheet: Optional[Sheet] = None,
+        dtype: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        memory_map: bool = False,
+    ) -> List[DataFrame]:
+        """Reads only `columns` of the rows matching `filters`.
+
+        Formats that cannot push the selection down to the reading apply it to the loaded sheets, `memory_map` only
+        applies to formats that read local files through a memory map.
+        """
+        return [select(df, columns, filters) for df in self.read(file, converters, sheet, dtype)]
+
+    def iter_chunks(
+        self,
+        file: str,
+        converters: Optional[Dict[str, Callable]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        sheet: Sheet = 0,
+        dtype: Optional[Dtypes] = None,
+    ) -> Iterator[DataFrame]:
+        """Yields a sheet in chunks of at most `chunksize` rows indexed by their global row offset.
+
+        Formats without native chunking fall back to slicing the fully loaded sheet.
+        """
+        df = self.read(file, converters, sheet, dtype)[0].reset_index(drop=True)
+
+        for offset in range(0, len(df), chunksize):
+            yield df.iloc[offset : offset + chunksize]
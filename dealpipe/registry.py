@@ -0,0 +1,107 @@
+"""Registry of the input files already processed.
+
+Each processed input is recorded in a SQLite file under its fingerprint, the content hash and size of the file
+together with the version of the lookups and of the code it was processed with, and with the asset
+materializations of the run that processed it. A run over the same fingerprint re-emits those instead of
+recomputing them. The code version defaults to a digest of the package sources, so any change to the code, such as
+a new RowHash encoding, has inputs processed again.
+"""
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence
+
+from dagster import AssetMaterialization
+from dagster.serdes import deserialize_value, serialize_value
+
+import dealpipe
+from dealpipe.fingerprint import content_hash, file_stat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed (
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    lookups_version TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    processed_at REAL NOT NULL,
+    materializations TEXT NOT NULL,
+    PRIMARY KEY (content_hash, size, lookups_version, code_version)
+)
+"""
+
+
+@lru_cache(maxsize=None)
+def source_version(root: Optional[str] = None) -> str:
+    """The package version with a digest of the package's Python sources, tests left out"""
+    root_path = Path(root or Path(dealpipe.__file__).parent)
+    digest = hashlib.sha256()
+    for file in sorted(root_path.rglob("*.py")):
+        relative = file.relative_to(root_path)
+        if "tests" not in relative.parts:
+            digest.update(relative.as_posix().encode())
+            digest.update(file.read_bytes())
+
+    return f"{dealpipe.__version__}+{digest.hexdigest()[:16]}"
+
+
+class Fingerprint(NamedTuple):
+    content_hash: str
+    size: int
+    lookups_version: str
+    code_version: str
+
+
+class Processed(NamedTuple):
+    run_id: str
+    processed_at: float
+    materializations: List[AssetMaterialization]
+
+
+class FingerprintRegistry:
+    """SQLite registry of processed input fingerprints"""
+
+    def __init__(self, path: str, code_version: str):
+        self.path = Path(path)
+        self.code_version = code_version
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # concurrent runs share the file, writers wait for each other instead of failing
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def fingerprint(self, files: Sequence[str], lookups_version: str) -> Fingerprint:
+        """The fingerprint of a file, or of a batch of files whatever their order"""
+        hashes = sorted(content_hash(file) for file in files)
+        digest = hashes[0]
+        if len(hashes) > 1:
+            digest = hashlib.blake2b("\n".join(hashes).encode("utf-8"), digest_size=16).hexdigest()
+
+        return Fingerprint(digest, sum(file_stat(file).size for file in files), lookups_version, self.code_version)
+
+    def find(self, fingerprint: Fingerprint) -> Optional[Processed]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT run_id, processed_at, materializations FROM processed "
+                "WHERE content_hash = ? AND size = ? AND lookups_version = ? AND code_version = ?",
+                fingerprint,
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        run_id, processed_at, materializations = row
+        return Processed(run_id, processed_at, deserialize_value(materializations))
+
+    def record(self, fingerprint: Fingerprint, run_id: str, materializations: List[AssetMaterialization]):
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*fingerprint, run_id, time.time(), serialize_value(materializations)),
+            )
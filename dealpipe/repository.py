@@ -1,6 +1,8 @@
 from dagster import repository
 
 from dealpipe.pipelines.process_deals import process_deals
+from dealpipe.pipelines.process_deals_arrow import process_deals_arrow
+from dealpipe.sensors.landing import landing_directory_sensor
 
 
 @repository
@@ -11,8 +13,8 @@ def dealpipe():
     For hints on building your Dagster repository, see our documentation overview on Repositories:
     https://docs.dagster.io/overview/repositories-workspaces/repositories
     """
-    pipelines = [process_deals]
+    pipelines = [process_deals, process_deals_arrow]
     schedules = []
-    sensors = []
+    sensors = [landing_directory_sensor]
 
     return pipelines + schedules + sensors
@@ -0,0 +1,299 @@
+"""Per-solid performance metrics: wall and CPU time, peak RSS growth, row counts and throughput.
+
+Solids measure their work with `context.resources.instrumentation.measure(...)` and attach the measurement to their
+output as metadata. The resource can also write every measurement to a JSONL file or a Prometheus textfile, the
+latter in the format of the node_exporter textfile collector.
+
+Solids listed in the `profile` config are additionally run under cProfile and/or tracemalloc. Their `.pstats` file
+and top-N text summaries are saved under `<directory>/<run_id>/` and reported as asset materializations. Solids that
+are not listed run exactly as without profiling.
+"""
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from dagster import AssetMaterialization, EventMetadata, EventMetadataEntry, Field, Noneable, StringSource, resource
+
+try:
+    import resource as _resource
+except ImportError:  # not available on Windows
+    _resource = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+SINKS = ("none", "jsonl", "prometheus")
+METRIC_PREFIX = "dealpipe_solid_"
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class UnsupportedMetricsSink(Exception):
+    """Raised when the metrics sink is not one of none, jsonl or prometheus"""
+
+
+def peak_rss() -> Optional[int]:
+    if _resource is None:
+        return None
+
+    return _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+class Measurement:
+    """Metrics of one solid, complete once its `measure` block exits"""
+
+    def __init__(self, solid: str, rows_in: Optional[int] = None):
+        self.solid = solid
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.wall_seconds: Optional[float] = None
+        self.cpu_seconds: Optional[float] = None
+        self.peak_rss_delta_bytes: Optional[int] = None
+        self.failed = False
+        self.materializations: List[AssetMaterialization] = []
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        if rows is None or not self.wall_seconds:
+            return None
+
+        return rows / self.wall_seconds
+
+    def metrics(self) -> Dict[str, float]:
+        metrics = {
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_rss_delta_bytes": self.peak_rss_delta_bytes,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_second": self.rows_per_second,
+            "failed": 1 if self.failed else None,
+        }
+
+        return {name: value for name, value in metrics.items() if value is not None}
+
+    def metadata_entries(self) -> List[EventMetadataEntry]:
+        return [
+            EventMetadataEntry.int(value, label) if isinstance(value, int) else EventMetadataEntry.float(value, label)
+            for label, value in self.metrics().items()
+        ]
+
+
+class Profiler:
+    """cProfile and tracemalloc capture of one solid"""
+
+    def __init__(self, solid: str, directory: Path, cprofile: bool = True, trace_memory: bool = False, top: int = 25):
+        self.solid = solid
+        self.directory = directory
+        self.top = top
+        self.profile = cProfile.Profile() if cprofile else None
+        # leave tracing alone when someone else already started it
+        self.trace_memory = trace_memory and not tracemalloc.is_tracing()
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self) -> AssetMaterialization:
+        metadata = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if self.profile is not None:
+            self.profile.disable()
+            pstats_file = self.directory / f"{self.solid}.pstats"
+            self.profile.dump_stats(str(pstats_file))
+
+            summary = io.StringIO()
+            pstats.Stats(self.profile, stream=summary).sort_stats("cumulative").print_stats(self.top)
+            metadata.update(self._save_summary("cprofile", summary.getvalue()))
+            metadata["pstats"] = EventMetadata.path(str(pstats_file))
+
+        if self.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            lines = [f"peak traced memory: {peak} bytes"]
+            lines.extend(str(statistic) for statistic in snapshot.statistics("lineno")[: self.top])
+            metadata.update(self._save_summary("tracemalloc", "\n".join(lines) + "\n"))
+
+        return AssetMaterialization(
+            asset_key=f"profile_{self.solid}",
+            description=f"Profile of the {self.solid} solid",
+            metadata=metadata,
+        )
+
+    def _save_summary(self, kind: str, summary: str) -> Dict[str, EventMetadata]:
+        summary_file = self.directory / f"{self.solid}.{kind}.txt"
+        summary_file.write_text(summary)
+
+        return {
+            f"{kind}_summary_path": EventMetadata.path(str(summary_file)),
+            f"{kind}_summary": EventMetadata.text(summary),
+        }
+
+
+class Instrumentation:
+    def __init__(
+        self,
+        sink: str = "none",
+        path: Optional[str] = None,
+        run_id: Optional[str] = None,
+        profile_solids: Iterable[str] = (),
+        profile_directory: str = "output/profiles",
+        cprofile: bool = True,
+        trace_memory: bool = False,
+        profile_top: int = 25,
+    ):
+        if sink not in SINKS:
+            raise UnsupportedMetricsSink(f"Unsupported metrics sink '{sink}', expected one of {SINKS}")
+        if sink != "none" and not path:
+            raise UnsupportedMetricsSink(f"The '{sink}' metrics sink needs a path")
+
+        self.sink = sink
+        self.path = path
+        self.run_id = run_id
+        self.profile_solids = frozenset(profile_solids)
+        self.profile_directory = Path(profile_directory) / (run_id or "local")
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.profile_top = profile_top
+
+    @contextmanager
+    def measure(self, solid: str, rows_in: Optional[int] = None) -> Iterator[Measurement]:
+        measurement = Measurement(solid, rows_in)
+        profiler = None
+        if solid in self.profile_solids:
+            profiler = Profiler(solid, self.profile_directory, self.cprofile, self.trace_memory, self.profile_top)
+            profiler.start()
+
+        rss_before = peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            yield measurement
+        except BaseException:
+            measurement.failed = True
+            raise
+        finally:
+            # a failing solid still stops the profilers and records how long it ran
+            measurement.wall_seconds = time.perf_counter() - wall_start
+            measurement.cpu_seconds = time.process_time() - cpu_start
+            if rss_before is not None:
+                measurement.peak_rss_delta_bytes = peak_rss() - rss_before
+            if profiler is not None:
+                measurement.materializations.append(profiler.stop())
+
+            self.record(measurement)
+
+    def record(self, measurement: Measurement):
+        if self.sink == "jsonl":
+            self._write_jsonl(measurement)
+        elif self.sink == "prometheus":
+            self._write_prometheus(measurement)
+
+    def _write_jsonl(self, measurement: Measurement):
+        record = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "run_id": self.run_id,
+            "solid": measurement.solid,
+            **measurement.metrics(),
+        }
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _write_prometheus(self, measurement: Measurement):
+        """Replace the solid's samples in the textfile with those of its latest measurement
+
+        Samples are only labelled by solid, the run id stays in the JSONL sink, so the textfile and the number of
+        series do not grow with the number of runs. Runs share the textfile, so the update holds an exclusive lock
+        on a sidecar lock file and the textfile is rewritten atomically so the collector never reads half of it.
+        """
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._update_prometheus(path, measurement)
+
+    def _update_prometheus(self, path: Path, measurement: Measurement):
+        labels = f'solid="{measurement.solid}"'
+        samples = {}
+        if path.exists():
+            for line in path.read_text().splitlines():
+                if line and not line.startswith("#"):
+                    name, value = line.rsplit(" ", 1)
+                    # metrics the latest measurement no longer has, like failed, are dropped with the rest
+                    if labels not in name:
+                        samples[name] = value
+
+        for metric, value in measurement.metrics().items():
+            samples[f"{METRIC_PREFIX}{metric}{{{labels}}}"] = repr(value)
+
+        lines = []
+        for metric in sorted({name.split("{")[0] for name in samples}):
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(f"{name} {value}" for name, value in sorted(samples.items()) if name.split("{")[0] == metric)
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+
+@resource(
+    config_schema={
+        "sink": Field(str, default_value="none", is_required=False, description="none, jsonl or prometheus"),
+        "path": Field(
+            Noneable(StringSource),
+            default_value=None,
+            is_required=False,
+            description="JSONL file or Prometheus textfile the metrics are written to",
+        ),
+        "profile": Field(
+            {
+                "solids": Field([str], description="solids to run under the profilers"),
+                "cprofile": Field(bool, default_value=True, is_required=False),
+                "tracemalloc": Field(bool, default_value=False, is_required=False),
+                "directory": Field(str, default_value="output/profiles", is_required=False),
+                "top": Field(int, default_value=25, is_required=False, description="lines of the text summaries"),
+            },
+            is_required=False,
+        ),
+    },
+    description="Per-solid timings, peak RSS growth, row counts and throughput",
+)
+def instrumentation(init_context) -> Instrumentation:
+    config = init_context.resource_config
+    profile = config.get("profile")
+    if profile is None:
+        return Instrumentation(config["sink"], config["path"], init_context.run_id)
+
+    return Instrumentation(
+        config["sink"],
+        config["path"],
+        init_context.run_id,
+        profile_solids=profile["solids"],
+        profile_directory=profile["directory"],
+        cprofile=profile["cprofile"],
+        trace_memory=profile["tracemalloc"],
+        profile_top=profile["top"],
+    )
@@ -0,0 +1,34 @@
+import os
+from typing import Optional
+
+from dagster import Field, Noneable, StringSource, resource
+
+from dealpipe.registry import FingerprintRegistry, source_version
+
+REGISTRY_FILE = os.path.join("dealpipe", "fingerprints.sqlite")
+
+
+@resource(
+    config_schema={
+        "enabled": Field(bool, default_value=True, is_required=False, description="skip inputs already processed"),
+        "path": Field(
+            Noneable(StringSource),
+            default_value=None,
+            is_required=False,
+            description=f"registry file, {REGISTRY_FILE} under the Dagster instance directory when not set",
+        ),
+        "code_version": Field(
+            Noneable(StringSource),
+            default_value=None,
+            is_required=False,
+            description="inputs are processed again when it changes, a digest of the package sources when not set",
+        ),
+    }
+)
+def fingerprint_registry(init_context) -> Optional[FingerprintRegistry]:
+    config = init_context.resource_config
+    if not config["enabled"]:
+        return None
+
+    path = config["path"] or os.path.join(init_context.instance.root_directory, REGISTRY_FILE)
+    return FingerprintRegistry(path, config["code_version"] or source_version())
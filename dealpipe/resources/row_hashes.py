@@ -0,0 +1,45 @@
+from typing import Optional
+
+import pandas as pd
+from dagster import Field, Noneable, resource
+
+from dealpipe.delta import read_row_hashes, write_row_hashes
+from dealpipe.schema.hashing import ALGORITHMS, DEFAULT_ALGORITHM
+
+
+class RowHashState:
+    """RowHash set of the rows emitted so far, incremental processing is off without a file"""
+
+    def __init__(self, file: Optional[str] = None, hash_algorithm: str = DEFAULT_ALGORITHM):
+        self.file = file
+        self.hash_algorithm = hash_algorithm
+
+    @property
+    def incremental(self) -> bool:
+        return self.file is not None
+
+    def load(self) -> pd.Index:
+        return read_row_hashes(self.file, self.hash_algorithm)
+
+    def save(self, row_hashes: pd.Index):
+        write_row_hashes(row_hashes, self.file, self.hash_algorithm)
+
+
+@resource(
+    config_schema={
+        "file": Field(
+            Noneable(str),
+            default_value=None,
+            is_required=False,
+            description="Parquet file with the RowHash of the rows emitted so far, every row is processed when not set",
+        ),
+        "hash_algorithm": Field(
+            str,
+            default_value=DEFAULT_ALGORITHM,
+            is_required=False,
+            description=f"RowHash algorithm of the state, the transform's must match, one of: {', '.join(ALGORITHMS)}",
+        ),
+    }
+)
+def row_hash_state(init_context) -> RowHashState:
+    return RowHashState(init_context.resource_config["file"], init_context.resource_config["hash_algorithm"])
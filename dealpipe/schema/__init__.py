@@ -1,4 +1,20 @@
-from dealpipe.schema.schema import InputSchema, OutputSchema, validate_input
-from dealpipe.schema.transform import transform
+from dealpipe.schema.schema import (
+    INPUT_DTYPES,
+    CompactOutputSchema,
+    InputSchema,
+    OutputSchema,
+    input_schema,
+    validate_input,
+)
+from dealpipe.schema.transform import transform, transform_compact
 
-__all__ = ("InputSchema", "OutputSchema", "validate_input", "transform")
+__all__ = (
+    "INPUT_DTYPES",
+    "CompactOutputSchema",
+    "InputSchema",
+    "OutputSchema",
+    "input_schema",
+    "validate_input",
+    "transform",
+    "transform_compact",
+)
@@ -1,31 +1,56 @@
-import decimal
-
 import pandas as pd
 from pandera.extensions import register_check_method
 
+# matched against the stripped text, the same text the decimal cast parses
+DECIMAL_PATTERN = r"^[+-]?(?P<integer>\d*)(?:\.(?P<fraction>\d*))?(?:[eE](?P<exponent>[+-]?\d+))?$"
+
+
+@register_check_method(supported_types=pd.Series)
+def is_numeric(series, *args):
+    return is_numeric_fn(series)
+
+
+def is_numeric_fn(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce").notnull()
+
+
+@register_check_method(statistics=["precision", "scale"], supported_types=pd.Series)
+def fits_decimal(series, *, precision, scale):
+    return fits_decimal_fn(series, precision, scale)
 
-@register_check_method(check_type="element_wise")
-def is_numeric(value, *args):
-    return is_numeric_fn(value)
 
+def fits_decimal_fn(series: pd.Series, precision: int, scale: int) -> pd.Series:
+    """Whether each value's text representation fits a Decimal(precision, scale) without rounding
 
-def is_numeric_fn(value):
-    return pd.notnull(pd.to_numeric(value, errors="coerce"))
+    Nulls pass, whether a column may hold them is up to its nullable setting.
+    """
+    mask = series.notna()
+    parts = series[mask].astype(str).str.strip().str.extract(DECIMAL_PATTERN)
+    integer = parts["integer"].fillna("")
+    fraction = parts["fraction"].fillna("")
+    exponent = pd.to_numeric(parts["exponent"]).fillna(0).astype(int)
 
+    digits = integer + fraction
+    significant = digits.str.lstrip("0")
+    leading_zeros = digits.str.len() - significant.str.len()
+    significant_length = significant.str.rstrip("0").str.len()
 
-@register_check_method(check_type="element_wise")
-def is_decimal(value, *args):
-    return is_decimal_fn(value)
+    # position of the decimal point relative to the first significant digit
+    point = integer.str.len() + exponent - leading_zeros
+    integer_digits = point.clip(lower=0).where(significant_length > 0, 0)
+    fraction_digits = (significant_length - point).clip(lower=0).where(significant_length > 0, 0)
 
+    fits = (digits.str.len() > 0) & (integer_digits <= precision - scale) & (fraction_digits <= scale)
 
-def is_decimal_fn(value):
-    return isinstance(value, decimal.Decimal)
+    result = pd.Series(True, index=series.index)
+    result[mask.to_numpy()] = fits.to_numpy(dtype=bool)
+    return result
 
 
-@register_check_method(check_type="element_wise")
-def is_active(value, *args):
-    return is_active_fn(value)
+@register_check_method(supported_types=pd.Series)
+def is_active(series, *args):
+    return is_active_fn(series)
 
 
-def is_active_fn(value):
-    return value in {"Yes", "No"}
+def is_active_fn(series: pd.Series) -> pd.Series:
+    return series.isin(["Yes", "No"])
@@ -0,0 +1,265 @@
+"""Pandas extension types used by the output schema."""
+import decimal
+import re
+import statistics
+from functools import reduce
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
+from pandas.api.indexers import check_array_indexer
+from pandas.api.types import is_bool_dtype, is_list_like, is_scalar
+
+REDUCTIONS = ("min", "max", "sum", "prod", "mean", "median", "var", "std")
+
+
+@register_extension_dtype
+class DecimalDtype(ExtensionDtype):
+    """Fixed-point decimal(precision, scale) column stored as an Arrow decimal128 array"""
+
+    type = decimal.Decimal
+    kind = "O"
+    na_value = None
+    _metadata = ("precision", "scale")
+    _match = re.compile(r"^decimal128\((?P<precision>\d+), ?(?P<scale>\d+)\)$")
+
+    def __init__(self, precision: int = 28, scale: int = 8):
+        self.precision = precision
+        self.scale = scale
+
+    @property
+    def name(self) -> str:
+        return f"decimal128({self.precision}, {self.scale})"
+
+    @property
+    def arrow_type(self) -> pa.DataType:
+        return pa.decimal128(self.precision, self.scale)
+
+    @classmethod
+    def construct_array_type(cls):
+        return DecimalArray
+
+    @classmethod
+    def construct_from_string(cls, string: str) -> "DecimalDtype":
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+
+        match = cls._match.match(string)
+        if not match:
+            raise TypeError(f"Cannot construct a '{cls.__name__}' from '{string}'")
+
+        return cls(int(match.group("precision")), int(match.group("scale")))
+
+    def __from_arrow__(self, array: Union[pa.Array, pa.ChunkedArray]) -> "DecimalArray":
+        if isinstance(array, pa.ChunkedArray):
+            array = pa.concat_arrays(array.chunks) if array.num_chunks else pa.array([], type=array.type)
+
+        return DecimalArray(array.cast(self.arrow_type), self)
+
+
+def to_arrow_decimal(values, dtype: DecimalDtype) -> pa.Array:
+    """Parse values into an Arrow decimal array in one vectorized cast, going through their stripped text form"""
+    values = pd.Series(values, dtype=object)
+    text = values.astype(str).str.strip().where(values.notna(), None)
+
+    return pa.array(text, type=pa.string(), from_pandas=True).cast(dtype.arrow_type)
+
+
+class DecimalArray(ExtensionArray):
+    def __init__(self, values: pa.Array, dtype: Optional[DecimalDtype] = None):
+        self._data = values
+        self._dtype = dtype or DecimalDtype(values.type.precision, values.type.scale)
+
+    @classmethod
+    def _from_sequence(cls, scalars, dtype=None, copy=False) -> "DecimalArray":
+        if isinstance(dtype, str):
+            dtype = DecimalDtype.construct_from_string(dtype)
+        dtype = dtype or DecimalDtype()
+
+        if isinstance(scalars, cls):
+            return cls(scalars._data.cast(dtype.arrow_type), dtype)
+
+        return cls(to_arrow_decimal(scalars, dtype), dtype)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, dtype=None, copy=False) -> "DecimalArray":
+        return cls._from_sequence(strings, dtype=dtype, copy=copy)
+
+    @classmethod
+    def _from_factorized(cls, values, original: "DecimalArray") -> "DecimalArray":
+        return cls._from_sequence(values, dtype=original.dtype)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat) -> "DecimalArray":
+        to_concat = list(to_concat)
+        return cls(pa.concat_arrays([array._data for array in to_concat]), to_concat[0].dtype)
+
+    @property
+    def dtype(self) -> DecimalDtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data.to_pylist())
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return self._data[int(item)].as_py()
+        if isinstance(item, slice):
+            return type(self)(self._data[item], self._dtype)
+
+        item = check_array_indexer(self, item)
+        if is_bool_dtype(item.dtype):
+            return type(self)(self._data.filter(pa.array(item)), self._dtype)
+
+        return self.take(item)
+
+    def __setitem__(self, key, value):
+        """Replace the values at `key`, the Arrow array is rebuilt as Arrow arrays are immutable"""
+        if isinstance(key, (int, np.integer)) or isinstance(key, slice):
+            mask = np.zeros(len(self), dtype=bool)
+            mask[key] = True
+            positions = np.arange(len(self))[key]
+        else:
+            key = check_array_indexer(self, key)
+            mask = key if is_bool_dtype(key.dtype) else np.isin(np.arange(len(self)), key)
+            positions = np.flatnonzero(key) if is_bool_dtype(key.dtype) else np.asarray(key)
+            positions = np.where(positions < 0, positions + len(self), positions)
+
+        count = int(np.size(positions))
+        if is_scalar(value) or value is None:
+            value = [value] * count
+        elif len(value) != count:
+            raise ValueError(f"Cannot set {len(value)} values to {count} positions")
+        replacements = value._data if isinstance(value, DecimalArray) else to_arrow_decimal(value, self._dtype)
+        # the replacements are matched to the positions in ascending order
+        replacements = replacements.cast(self._dtype.arrow_type).take(pa.array(np.argsort(positions, kind="stable")))
+
+        if hasattr(pc, "replace_with_mask"):
+            self._data = pc.replace_with_mask(self._data, pa.array(mask), replacements)
+        else:
+            # older pyarrow releases have no replace kernel
+            values = np.asarray(self)
+            values[np.sort(positions)] = replacements.to_pylist()
+            self._data = to_arrow_decimal(values, self._dtype)
+
+    def value_counts(self, dropna: bool = True) -> pd.Series:
+        try:
+            counts = pc.value_counts(self._data.drop_null())
+            values, sizes = counts.field("values"), counts.field("counts").to_numpy()
+        except (pa.ArrowNotImplementedError, AttributeError):
+            # older pyarrow releases cannot hash decimals, count their Python values
+            counts = pd.Series(np.asarray(self[~self.isna()])).value_counts(sort=False)
+            values, sizes = pa.array(counts.index, type=self._dtype.arrow_type), counts.to_numpy()
+
+        index = pd.Index(type(self)(values, self._dtype))
+        result = pd.Series(sizes.astype(np.int64), index=index)
+        if not dropna and self._data.null_count:
+            result = pd.concat([result, pd.Series([self._data.null_count], index=[None])])
+
+        return result
+
+    def __eq__(self, other):
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+
+        if is_list_like(other):
+            other = np.asarray(other, dtype=object)
+
+        return np.asarray(self, dtype=object) == other
+
+    def __array__(self, dtype=None):
+        return np.asarray(self._data.to_pylist(), dtype=object if dtype is None else dtype)
+
+    def __arrow_array__(self, type=None):
+        return self._data if type is None else self._data.cast(type)
+
+    def isna(self) -> np.ndarray:
+        return self._data.is_null().to_numpy(zero_copy_only=False)
+
+    def take(self, indices, allow_fill=False, fill_value=None) -> "DecimalArray":
+        indices = np.asarray(indices, dtype=np.intp)
+
+        if allow_fill and not pd.isna(fill_value):
+            values = take(np.asarray(self), indices, allow_fill=True, fill_value=fill_value)
+            return type(self)._from_sequence(values, dtype=self._dtype)
+
+        if allow_fill:
+            if (indices < -1).any():
+                raise ValueError("Invalid value in 'indices'. Must be between -1 and the length of the array.")
+            mask = indices == -1
+            arrow_indices = pa.array(np.where(mask, 0, indices), mask=mask)
+        else:
+            arrow_indices = pa.array(np.where(indices < 0, indices + len(self), indices))
+
+        return type(self)(self._data.take(arrow_indices), self._dtype)
+
+    def copy(self) -> "DecimalArray":
+        # Arrow arrays are immutable so the buffers can be shared
+        return type(self)(self._data, self._dtype)
+
+    def _reduce(self, name: str, skipna: bool = True, **kwargs):
+        if name not in REDUCTIONS:
+            raise TypeError(f"'{type(self).__name__}' does not support reduction '{name}'")
+        if not skipna and self._data.null_count:
+            return self._dtype.na_value
+
+        if name in ("min", "max", "sum"):
+            try:
+                result = (pc.sum(self._data) if name == "sum" else pc.min_max(self._data)[name]).as_py()
+                values = None
+            except pa.ArrowNotImplementedError:
+                # older pyarrow releases have no decimal aggregation kernels
+                values = [value for value in self._data.to_pylist() if value is not None]
+        else:
+            values = [value for value in self._data.to_pylist() if value is not None]
+
+        if values is not None:
+            result = decimal_reduction(name, values, kwargs.get("ddof", 1))
+
+        if result is None and name in ("sum", "prod") and kwargs.get("min_count", 0) == 0:
+            return decimal.Decimal(0 if name == "sum" else 1)
+
+        return result
+
+    def astype(self, dtype, copy=True):
+        if isinstance(dtype, str):
+            try:
+                dtype = DecimalDtype.construct_from_string(dtype)
+            except TypeError:
+                pass
+
+        if isinstance(dtype, DecimalDtype):
+            return type(self)(self._data.cast(dtype.arrow_type), dtype)
+
+        return super().astype(dtype, copy=copy)
+
+
+def decimal_reduction(name: str, values: list, ddof: int = 1) -> Optional[decimal.Decimal]:
+    """Reduction of non-null Decimal values, None when there are too few of them"""
+    if len(values) <= (ddof if name in ("var", "std") else 0):
+        return None
+
+    if name in ("min", "max"):
+        return min(values) if name == "min" else max(values)
+    if name == "sum":
+        return sum(values, decimal.Decimal(0))
+    if name == "prod":
+        return reduce(lambda left, right: left * right, values, decimal.Decimal(1))
+    if name == "mean":
+        return sum(values, decimal.Decimal(0)) / len(values)
+    if name == "median":
+        return statistics.median(values)
+
+    mean = sum(values, decimal.Decimal(0)) / len(values)
+    variance = sum(((value - mean) ** 2 for value in values), decimal.Decimal(0)) / (len(values) - ddof)
+    return variance.sqrt() if name == "std" else variance
@@ -0,0 +1,109 @@
+"""Batch RowHash engine.
+
+Rows are hashed from a canonical text encoding so the result only depends on the row's own values, never on its
+position, index label or on the other rows in the frame. Hashing a frame in one pass, in chunks or in parallel
+partitions therefore gives identical RowHash values.
+
+Canonical row encoding (version 1):
+
+* the row's values are taken in column order;
+* a null value (``None``, ``NaN``, ``NaT``) is encoded as ``NULL`` (``"\\x1e"``, ASCII record separator);
+* a datetime value is encoded as ``YYYY-MM-DDTHH:MM:SS.ffffff``;
+* every other value is encoded as ``str(value)``;
+* the encoded values are joined with ``SEPARATOR`` (``"\\x1f"``, the ASCII unit separator) and the resulting
+  string is encoded as UTF-8 before hashing.
+
+Supported algorithms:
+
+* ``md5`` - 128-bit MD5 digest, the default;
+* ``blake2b`` - 128-bit BLAKE2b digest;
+* ``siphash64`` - 64-bit keyed SipHash-2-4 (pandas' ``hash_array``), non-cryptographic and fully vectorized;
+* ``siphash128`` - two independently keyed ``siphash64`` digests concatenated.
+
+All digests are returned as lowercase hex strings. The encoding replaced the CSV text of the row that earlier
+releases hashed, so their RowHash values differ from these for every algorithm. ENCODING_VERSION changes with
+every change to the encoding.
+"""
+import hashlib
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from pandas.util import hash_array
+
+NULL = "\x1e"
+SEPARATOR = "\x1f"
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+DEFAULT_ALGORITHM = "md5"
+ENCODING_VERSION = 1
+
+SIPHASH_KEYS = ("dealpipe-rowhash", "rowhash-dealpipe")
+
+
+class UnsupportedHashAlgorithm(Exception):
+    """Unsupported row hash algorithm"""
+
+
+def encode_column(series: pd.Series) -> pd.Series:
+    if is_datetime64_any_dtype(series.dtype):
+        text = series.dt.strftime(DATETIME_FORMAT)
+    else:
+        text = series.astype(str)
+
+    return text.where(series.notna(), NULL)
+
+
+def encode_rows(df: pd.DataFrame) -> pd.Series:
+    if df.columns.empty:
+        return pd.Series("", index=df.index, dtype=object)
+
+    columns = [encode_column(df[column]) for column in df.columns]
+    encoded = columns[0]
+    for column in columns[1:]:
+        encoded = encoded + SEPARATOR + column
+
+    return encoded
+
+
+def _md5(encoded: pd.Series) -> List[str]:
+    return [hashlib.md5(value.encode("utf-8")).hexdigest() for value in encoded]
+
+
+def _blake2b(encoded: pd.Series) -> List[str]:
+    return [hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest() for value in encoded]
+
+
+def _siphash(encoded: pd.Series, hash_key: str) -> np.ndarray:
+    hashes = hash_array(encoded.to_numpy(dtype=object), encoding="utf8", hash_key=hash_key)
+    return np.char.mod("%016x", hashes)
+
+
+def _siphash64(encoded: pd.Series) -> np.ndarray:
+    return _siphash(encoded, SIPHASH_KEYS[0])
+
+
+def _siphash128(encoded: pd.Series) -> np.ndarray:
+    return np.char.add(_siphash(encoded, SIPHASH_KEYS[0]), _siphash(encoded, SIPHASH_KEYS[1]))
+
+
+ALGORITHMS: Dict[str, Callable[[pd.Series], List[str]]] = {
+    "md5": _md5,
+    "blake2b": _blake2b,
+    "siphash64": _siphash64,
+    "siphash128": _siphash128,
+}
+
+
+def hash_encoded(encoded: pd.Series, algorithm: str = DEFAULT_ALGORITHM) -> Sequence[str]:
+    """Digests of rows already in the canonical encoding"""
+    digest = ALGORITHMS.get(algorithm)
+
+    if not digest:
+        raise UnsupportedHashAlgorithm(algorithm)
+
+    return digest(encoded)
+
+
+def hash_rows(df: pd.DataFrame, algorithm: str = DEFAULT_ALGORITHM) -> pd.Series:
+    return pd.Series(hash_encoded(encode_rows(df), algorithm), index=df.index, dtype=object)
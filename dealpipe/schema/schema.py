@@ -1,22 +1,26 @@
-from typing import Tuple, cast
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple, cast
 
 import pandas as pd
 import pandera as pa
 from pandera.errors import SchemaErrors
-from pandera.typing import Bool, DateTime, Int32, Object, Series, String
+from pandera.typing import Bool, Category, DateTime, Int32, Series, String
 
-from dealpipe.lookups import LookupDict
+from dealpipe.lookups import LookupDict, LookupIndex, build_lookup_index
 from dealpipe.schema.checks import *  # noqa: F401, F403
+from dealpipe.schema.dtypes import DecimalDtype
+
+DECIMAL_28_8 = {"precision": 28, "scale": 8}
 
 
 class InputSchema(pa.SchemaModel):
-    _lookups: LookupDict = LookupDict(currencies=set(), countries=set(), companies={})
     deal_name: Series[String] = pa.Field(alias="DealName", str_length={"min_value": 1})
-    d1: Series[String] = pa.Field(alias="D1", coerce=True, is_numeric={})
-    d2: Series[String] = pa.Field(alias="D2", coerce=True, nullable=True, is_numeric={})
-    d3: Series[String] = pa.Field(alias="D3", coerce=True, nullable=True, is_numeric={})
-    d4: Series[String] = pa.Field(alias="D4", coerce=True, nullable=True, is_numeric={})
-    d5: Series[String] = pa.Field(alias="D5", coerce=True, nullable=True, is_numeric={})
+    d1: Series[String] = pa.Field(alias="D1", coerce=True, is_numeric={}, fits_decimal=DECIMAL_28_8)
+    d2: Series[String] = pa.Field(alias="D2", coerce=True, nullable=True, is_numeric={}, fits_decimal=DECIMAL_28_8)
+    d3: Series[String] = pa.Field(alias="D3", coerce=True, nullable=True, is_numeric={}, fits_decimal=DECIMAL_28_8)
+    d4: Series[String] = pa.Field(alias="D4", coerce=True, nullable=True, is_numeric={}, fits_decimal=DECIMAL_28_8)
+    d5: Series[String] = pa.Field(alias="D5", coerce=True, nullable=True, is_numeric={}, fits_decimal=DECIMAL_28_8)
     is_active: Series[String] = pa.Field(alias="IsActive", is_active={"error": """Must be either "Yes" or "No."""})
     country_code: Series[String] = pa.Field(
         alias="CountryCode", coerce=True, str_length={"min_value": 3, "max_value": 3}
@@ -30,21 +34,11 @@ class InputSchema(pa.SchemaModel):
         ordered = True
         strict = True
 
-    @classmethod
-    def set_lookups(cls, lookups: LookupDict):
-        cls._lookups = lookups
-
-    @pa.check(country_code, name="check_country__in_lookups", error="Country code not allowed.", element_wise=True)
-    def check_country(cls, country_code: str) -> bool:
-        return country_code in cls._lookups["countries"]
-
-    @pa.check(currency_code, name="check_currency_in_lookups", error="Currency code not allowed.", element_wise=True)
-    def check_currency(cls, currency_code: str) -> bool:
-        return currency_code in cls._lookups["currencies"]
 
-    @pa.check(company_id, name="check_company_in_lookups", error="Company not allowed.", element_wise=True)
-    def check_company(cls, company_id: int) -> bool:
-        return company_id in cls._lookups["companies"]
+# the types input files are parsed into, the exact text of D1 to D5 is kept for the decimal checks
+INPUT_DTYPES = {
+    name: str if column.dtype == "object" else column.dtype for name, column in InputSchema.to_schema().columns.items()
+}
 
 
 class RowNoMixin(pa.SchemaModel):
@@ -59,11 +53,11 @@ class AdditionalColumnsMixin(pa.SchemaModel):
 
 
 class OutputSchema(AdditionalColumnsMixin, InputSchema, RowNoMixin):
-    d1: Series[Object] = pa.Field(alias="D1", is_decimal={})
-    d2: Series[Object] = pa.Field(alias="D2", nullable=True, is_decimal={})
-    d3: Series[Object] = pa.Field(alias="D3", nullable=True, is_decimal={})
-    d4: Series[Object] = pa.Field(alias="D4", nullable=True, is_decimal={})
-    d5: Series[Object] = pa.Field(alias="D5", nullable=True, is_decimal={})
+    d1: Series[DecimalDtype] = pa.Field(alias="D1", dtype_kwargs=DECIMAL_28_8)
+    d2: Series[DecimalDtype] = pa.Field(alias="D2", nullable=True, dtype_kwargs=DECIMAL_28_8)
+    d3: Series[DecimalDtype] = pa.Field(alias="D3", nullable=True, dtype_kwargs=DECIMAL_28_8)
+    d4: Series[DecimalDtype] = pa.Field(alias="D4", nullable=True, dtype_kwargs=DECIMAL_28_8)
+    d5: Series[DecimalDtype] = pa.Field(alias="D5", nullable=True, dtype_kwargs=DECIMAL_28_8)
     is_active: Series[Bool] = pa.Field(alias="IsActive")
 
     class Config:
@@ -71,10 +65,149 @@ class OutputSchema(AdditionalColumnsMixin, InputSchema, RowNoMixin):
         strict = True
 
 
-def validate_input(df: pd.DataFrame, lookups: LookupDict) -> Tuple[bool, pd.DataFrame]:
-    InputSchema.set_lookups(lookups)
+def compact_string_dtype() -> pd.StringDtype:
+    """Arrow-backed strings on pandas 1.3 and later, pandas' own string dtype before that"""
+    try:
+        return pd.StringDtype("pyarrow")
+    except TypeError:
+        return pd.StringDtype()
+
+
+COMPACT_STRING_DTYPE = compact_string_dtype()
+COMPACT_STRING_KWARGS = {"storage": COMPACT_STRING_DTYPE.storage} if hasattr(COMPACT_STRING_DTYPE, "storage") else {}
+
+
+class CompactOutputSchema(OutputSchema):
+    """OutputSchema with the repetitive code, name and run columns as categoricals and free text as strings"""
+
+    deal_name: Series[pd.StringDtype] = pa.Field(
+        alias="DealName", str_length={"min_value": 1}, dtype_kwargs=COMPACT_STRING_KWARGS
+    )
+    country_code: Series[Category] = pa.Field(alias="CountryCode", str_length={"min_value": 3, "max_value": 3})
+    currency_code: Series[Category] = pa.Field(alias="CurrencyCode", str_length={"min_value": 3, "max_value": 3})
+    company_name: Series[Category] = pa.Field(alias="CompanyName")
+    as_of_date: Series[Category] = pa.Field(alias="AsOfDate")
+    process_identifier: Series[Category] = pa.Field(alias="ProcessIdentifier")
+
+    class Config:
+        ordered = True
+        strict = True
+
+
+def is_in_lookup(series: pd.Series, lookup: pd.Index) -> pd.Series:
+    return series.isin(lookup)
+
+
+def input_schema(lookup_index: LookupIndex) -> pa.DataFrameSchema:
+    """InputSchema with the lookup membership checks bound to the given lookups"""
+    schema = InputSchema.to_schema()
+    lookup_checks = {
+        InputSchema.country_code: pa.Check(
+            partial(is_in_lookup, lookup=lookup_index.countries),
+            name="check_country__in_lookups",
+            error="Country code not allowed.",
+        ),
+        InputSchema.currency_code: pa.Check(
+            partial(is_in_lookup, lookup=lookup_index.currencies),
+            name="check_currency_in_lookups",
+            error="Currency code not allowed.",
+        ),
+        InputSchema.company_id: pa.Check(
+            partial(is_in_lookup, lookup=lookup_index.companies),
+            name="check_company_in_lookups",
+            error="Company not allowed.",
+        ),
+    }
+
+    return schema.update_columns(
+        {column: {"checks": schema.columns[column].checks + [check]} for column, check in lookup_checks.items()}
+    )
+
+
+def validate_input(
+    df: pd.DataFrame, lookups: LookupDict, workers: int = 1, partition_size: Optional[int] = None
+) -> Tuple[bool, pd.DataFrame]:
+    """Validate the frame against the input schema, in row partitions across `workers` processes when above 1
+
+    The merged failure cases are the ones a single validation of the whole frame reports.
+    """
+    if workers > 1 and len(df) > 1:
+        partition_size = partition_size or -(-len(df) // workers)
+        if partition_size < len(df):
+            return validate_partitioned(df, lookups, workers, partition_size)
+
+    return validate_partition(df, lookups)
+
+
+def validate_partition(df: pd.DataFrame, lookups: LookupDict) -> Tuple[bool, pd.DataFrame]:
+    schema = input_schema(build_lookup_index(lookups))
     try:
-        valid_df = InputSchema.validate(df, lazy=True)
+        valid_df = schema.validate(df, lazy=True)
         return True, valid_df
     except SchemaErrors as e:
         return False, cast(pd.DataFrame, e.failure_cases)
+
+
+def validate_partitioned(
+    df: pd.DataFrame, lookups: LookupDict, workers: int, partition_size: int
+) -> Tuple[bool, pd.DataFrame]:
+    partitions = [df.iloc[start : start + partition_size] for start in range(0, len(df), partition_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(partial(validate_partition, lookups=lookups), partitions))
+
+    if all(valid for valid, _ in results):
+        return True, pd.concat([valid_df for _, valid_df in results])
+
+    return False, merge_failure_cases([failure_cases for valid, failure_cases in results if not valid])
+
+
+# pandera stops at the first failing step of a column, these are its steps in the order pandera 0.6 runs them,
+# TestValidateInputPartitionedSamples checks the merged failure cases against a single validation of the sample files
+COLUMN_STEPS = ["coerce_dtype", "field_name", "not_nullable", "nullable_integer", "no_duplicates", "pandas_dtype"]
+FAILURE_KEY = ["schema_context", "column", "check", "check_number", "failure_case"]
+
+
+def column_step(check: str, check_number) -> int:
+    if pd.notna(check_number):
+        return len(COLUMN_STEPS) + int(check_number)
+
+    return next((step for step, name in enumerate(COLUMN_STEPS) if str(check).startswith(name)), len(COLUMN_STEPS))
+
+
+def merge_failure_cases(partition_failure_cases: List[pd.DataFrame]) -> pd.DataFrame:
+    """Merge the failure cases of row partitions into the ones a single validation of the whole frame reports
+
+    Whole-column failures (no row index) are kept once per occurrence instead of once per partition, and for each
+    column only the failures of its earliest failing step are kept, as that is where pandera stops.
+    """
+    failure_cases = pd.concat(
+        [cases.assign(partition=partition) for partition, cases in enumerate(partition_failure_cases)],
+        ignore_index=True,
+    )
+    failure_cases["key"] = failure_cases[FAILURE_KEY].astype(str).agg("\x1f".join, axis=1)
+    failure_cases["occurrence"] = failure_cases.groupby(["key", "partition"]).cumcount()
+    whole_column = failure_cases["index"].isna()
+    failure_cases = failure_cases[~(whole_column & failure_cases.duplicated(["key", "occurrence"]))]
+
+    is_column = failure_cases["schema_context"] == "Column"
+    # a coercion failure is reported by the dataframe-wide coercion first and again by the column validation
+    is_coercion = is_column & failure_cases["check"].astype(str).str.startswith("coerce_dtype")
+    failure_cases["stage"] = is_column.astype(int) + (is_column & ~(is_coercion & (failure_cases["occurrence"] == 0)))
+    failure_cases["step"] = [
+        column_step(check, check_number)
+        for check, check_number in zip(failure_cases["check"], failure_cases["check_number"])
+    ]
+
+    column_stage = failure_cases["stage"] == 2
+    earliest = failure_cases[column_stage].groupby("column")["step"].transform("min")
+    failure_cases = failure_cases[~column_stage | (failure_cases["step"] == earliest.reindex(failure_cases.index))]
+
+    column_order = {column: position for position, column in enumerate(InputSchema.to_schema().columns)}
+    failure_cases["position"] = failure_cases["column"].map(column_order).fillna(-1)
+
+    return (
+        failure_cases.sort_values(["stage", "position"], kind="mergesort")
+        .drop(columns=["partition", "key", "occurrence", "stage", "step", "position"])
+        .reset_index(drop=True)
+    )
@@ -1,52 +1,94 @@
 import datetime
-import decimal
-import hashlib
-import math
 from typing import cast
 
+import numpy as np
 import pandas as pd
 import pandera as pa
 from pandera.typing import DataFrame
 
 from dealpipe.lookups import LookupDict
-from dealpipe.schema.schema import InputSchema, OutputSchema
+from dealpipe.schema.dtypes import DecimalArray, DecimalDtype
+from dealpipe.schema.hashing import DEFAULT_ALGORITHM, hash_rows
+from dealpipe.schema.schema import COMPACT_STRING_DTYPE, DECIMAL_28_8, CompactOutputSchema, InputSchema, OutputSchema
 
 
-def hash_row(row):
-    row_string = row.to_csv().encode("utf-8")
-    md5_hash = hashlib.md5(row_string).hexdigest()
-    return md5_hash
+def to_decimal(series: pd.Series) -> pd.Series:
+    values = DecimalArray._from_sequence(series, dtype=DecimalDtype(**DECIMAL_28_8))
+    return pd.Series(values, index=series.index, name=series.name)
 
 
-def to_decimal(x):
-    if x is None:
-        return None
+def hash_input_rows(df: pd.DataFrame, hash_algorithm: str = DEFAULT_ALGORITHM) -> pd.Series:
+    """RowHash over the input columns only, so it stays the same across runs and row positions
 
-    val = decimal.Decimal(str(x))
+    Missing input columns hash as nulls, which lets unvalidated frames be hashed too.
+    """
+    return hash_rows(df.reindex(columns=list(InputSchema.__fields__.keys())), hash_algorithm)
 
-    if math.isnan(val):
-        val = None
 
-    return val
+def constant(value, index: pd.Index) -> pd.Categorical:
+    """A run-level value as a single category, one byte per row"""
+    return pd.Categorical.from_codes(np.zeros(len(index), dtype=np.int8), categories=[value])
 
 
-@pa.check_types
-def transform(
-    df: DataFrame[InputSchema], run_id: str, as_of_date: datetime.datetime, lookups: LookupDict
-) -> DataFrame[OutputSchema]:
+def output_frame(
+    df: pd.DataFrame,
+    run_id: str,
+    as_of_date: datetime.datetime,
+    lookups: LookupDict,
+    hash_algorithm: str,
+    compact: bool,
+) -> pd.DataFrame:
     columns = {}
-    columns[OutputSchema.d1] = lambda x: x[OutputSchema.d1].map(to_decimal)
-    columns[OutputSchema.d2] = lambda x: x[OutputSchema.d2].map(to_decimal)
-    columns[OutputSchema.d3] = lambda x: x[OutputSchema.d3].map(to_decimal)
-    columns[OutputSchema.d4] = lambda x: x[OutputSchema.d4].map(to_decimal)
-    columns[OutputSchema.d5] = lambda x: x[OutputSchema.d5].map(to_decimal)
-    columns[OutputSchema.is_active] = lambda x: x[OutputSchema.is_active].map({"Yes": True, "No": False}.get)
+    columns[OutputSchema.d1] = to_decimal(df[OutputSchema.d1])
+    columns[OutputSchema.d2] = to_decimal(df[OutputSchema.d2])
+    columns[OutputSchema.d3] = to_decimal(df[OutputSchema.d3])
+    columns[OutputSchema.d4] = to_decimal(df[OutputSchema.d4])
+    columns[OutputSchema.d5] = to_decimal(df[OutputSchema.d5])
+    columns[OutputSchema.is_active] = (
+        lambda x: x[OutputSchema.is_active].map({"Yes": True, "No": False}.get).astype(bool)
+    )
     columns[OutputSchema.company_name] = lambda x: x[InputSchema.company_id].map(lookups["companies"].get)
-    columns[OutputSchema.row_hash] = lambda x: x.apply(hash_row, axis=1)
+    columns[OutputSchema.row_hash] = hash_input_rows(df, hash_algorithm)
     columns[OutputSchema.process_identifier] = run_id
     columns[OutputSchema.as_of_date] = as_of_date
-    columns[OutputSchema.row_no] = pd.Series(range(len(df)))
+    # the index carries the global row offset, so chunks of a larger file keep their RowNo
+    columns[OutputSchema.row_no] = df.index.to_series()
+
+    if compact:
+        # the row hash is taken over the input text above, before any column changes its type
+        columns[OutputSchema.deal_name] = df[OutputSchema.deal_name].astype(COMPACT_STRING_DTYPE)
+        columns[OutputSchema.country_code] = df[OutputSchema.country_code].astype("category")
+        columns[OutputSchema.currency_code] = df[OutputSchema.currency_code].astype("category")
+        columns[OutputSchema.company_name] = lambda x: (
+            x[InputSchema.company_id].map(lookups["companies"].get).astype("category")
+        )
+        columns[OutputSchema.process_identifier] = constant(run_id, df.index)
+        columns[OutputSchema.as_of_date] = constant(pd.Timestamp(as_of_date), df.index)
 
     out_df = df.assign(**columns)
-    out_df = out_df[list(OutputSchema.__fields__.keys())]
+    return out_df[list(OutputSchema.__fields__.keys())]
+
+
+@pa.check_types
+def transform(
+    df: DataFrame[InputSchema],
+    run_id: str,
+    as_of_date: datetime.datetime,
+    lookups: LookupDict,
+    hash_algorithm: str = DEFAULT_ALGORITHM,
+) -> DataFrame[OutputSchema]:
+    out_df = output_frame(df, run_id, as_of_date, lookups, hash_algorithm, compact=False)
     return cast(DataFrame[OutputSchema], out_df)
+
+
+@pa.check_types
+def transform_compact(
+    df: DataFrame[InputSchema],
+    run_id: str,
+    as_of_date: datetime.datetime,
+    lookups: LookupDict,
+    hash_algorithm: str = DEFAULT_ALGORITHM,
+) -> DataFrame[CompactOutputSchema]:
+    """`transform` with the memory-compact column types of CompactOutputSchema, the values are the same"""
+    out_df = output_frame(df, run_id, as_of_date, lookups, hash_algorithm, compact=True)
+    return cast(DataFrame[CompactOutputSchema], out_df)
@@ -0,0 +1,140 @@
+"""Sensor launching a process_deals run for every new deals file in a landing directory.
+
+The sensor is configured from the environment:
+
+* ``DEALPIPE_LANDING_DIR`` - the watched directory, the sensor skips when it is not set;
+* ``DEALPIPE_LOOKUPS_FILE`` - the lookups file of every run, ``files/lookups.csv`` by default;
+* ``DEALPIPE_OUTPUT_DIR`` - where the output and errors files are written, ``output`` by default;
+* ``DEALPIPE_MAX_CONCURRENT_RUNS`` - the cap on queued and running runs, the number of CPUs by default;
+* ``DEALPIPE_LANDING_SETTLE_SECONDS`` - files modified more recently are still being written, 5 by default.
+
+The run key is the content hash of the file, so a file is processed once however often it is dropped. Each tick
+requests runs for the oldest new files, up to the concurrency cap less the runs still in flight, and the rest are
+picked up by later ticks as runs finish.
+"""
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Mapping, NamedTuple, Optional, Set, Union
+
+from dagster import DagsterInstance, RunRequest, SkipReason, sensor
+from dagster.core.storage.pipeline_run import PipelineRunStatus, PipelineRunsFilter
+from dagster.core.storage.tags import RUN_KEY_TAG
+
+from dealpipe.batch import source_name
+from dealpipe.fingerprint import content_hash
+from dealpipe.reader.mime import detect_format
+
+PIPELINE_NAME = "process_deals"
+DEALS_FILE_TAG = "dealpipe/deals_file"
+IN_FLIGHT_STATUSES = [
+    PipelineRunStatus.QUEUED,
+    PipelineRunStatus.NOT_STARTED,
+    PipelineRunStatus.MANAGED,
+    PipelineRunStatus.STARTING,
+    PipelineRunStatus.STARTED,
+]
+DEALS_FORMATS = ("csv", "excel", "yaml", "parquet")
+
+
+class LandingSettings(NamedTuple):
+    directory: Optional[str]
+    lookups_file: str = "files/lookups.csv"
+    output_directory: str = "output"
+    max_concurrent_runs: int = os.cpu_count() or 1
+    settle_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "LandingSettings":
+        defaults = cls(None)
+        return cls(
+            directory=environ.get("DEALPIPE_LANDING_DIR"),
+            lookups_file=environ.get("DEALPIPE_LOOKUPS_FILE", defaults.lookups_file),
+            output_directory=environ.get("DEALPIPE_OUTPUT_DIR", defaults.output_directory),
+            max_concurrent_runs=int(environ.get("DEALPIPE_MAX_CONCURRENT_RUNS", defaults.max_concurrent_runs)),
+            settle_seconds=float(environ.get("DEALPIPE_LANDING_SETTLE_SECONDS", defaults.settle_seconds)),
+        )
+
+
+@lru_cache(maxsize=4096)
+def _run_key(path: str, size: int, mtime_ns: int) -> str:
+    return content_hash(path)
+
+
+def run_key(file: Path) -> str:
+    """The content hash of the file, cached until its size or modification time changes"""
+    stat = file.stat()
+    return _run_key(str(file.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def landed_files(directory: str, settle_seconds: float, now: Optional[float] = None) -> List[Path]:
+    """Deals files in the directory, oldest first, leaving out hidden files and files still being written"""
+    now = time.time() if now is None else now
+    files = []
+    for entry in os.scandir(directory):
+        if entry.name.startswith(".") or not entry.is_file():
+            continue
+        if now - entry.stat().st_mtime < settle_seconds:
+            continue
+        if detect_format(entry.path) not in DEALS_FORMATS:
+            continue
+        files.append((entry.stat().st_mtime_ns, entry.name, Path(entry.path)))
+
+    return [file for _, _, file in sorted(files)]
+
+
+def is_requested(instance: DagsterInstance, key: str) -> bool:
+    """Whether a run has the run key, looked up by its tag so the cost does not grow with the run history"""
+    return bool(instance.get_runs(PipelineRunsFilter(tags={RUN_KEY_TAG: key}), limit=1))
+
+
+def run_request(file: Path, key: str, settings: LandingSettings) -> RunRequest:
+    # the content hash keeps apart files of one burst that share a name up to their format or date suffix
+    stem = f"{source_name(str(file))}_{key[:12]}"
+    output_directory = Path(settings.output_directory)
+    run_config = {
+        "solids": {
+            "load_deals": {"config": {"deals_file": str(file)}},
+            "load_deals_lookup": {"config": {"lookups_file": settings.lookups_file}},
+            "save_errors": {"config": {"errors_excel_file": str(output_directory / f"{stem}_errors.xlsx")}},
+            "save_output": {"config": {"output_file": str(output_directory / f"{stem}.parquet.gz")}},
+        }
+    }
+
+    return RunRequest(run_key=key, run_config=run_config, tags={DEALS_FILE_TAG: str(file)})
+
+
+def landing_run_requests(
+    instance: DagsterInstance, settings: LandingSettings, now: Optional[float] = None
+) -> Iterator[Union[RunRequest, SkipReason]]:
+    in_flight = instance.get_runs_count(PipelineRunsFilter(pipeline_name=PIPELINE_NAME, statuses=IN_FLIGHT_STATUSES))
+    capacity = settings.max_concurrent_runs - in_flight
+    if capacity <= 0:
+        yield SkipReason(f"{in_flight} runs in flight, at the cap of {settings.max_concurrent_runs}")
+        return
+
+    keys: Set[str] = set()
+    for file in landed_files(settings.directory, settings.settle_seconds, now):
+        key = run_key(file)
+        # a file dropped twice under different names is requested once
+        if key in keys or is_requested(instance, key):
+            continue
+
+        keys.add(key)
+        yield run_request(file, key, settings)
+        if len(keys) == capacity:
+            return
+
+    if not keys:
+        yield SkipReason(f"No new deals files in {settings.directory}")
+
+
+@sensor(pipeline_name=PIPELINE_NAME, mode="dev", minimum_interval_seconds=30)
+def landing_directory_sensor(context):
+    settings = LandingSettings.from_env()
+    if settings.directory is None:
+        yield SkipReason("DEALPIPE_LANDING_DIR is not set")
+        return
+
+    yield from landing_run_requests(context.instance, settings)
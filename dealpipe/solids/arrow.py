@@ -0,0 +1,118 @@
+"""Solids of the Arrow-native pipeline, named after the pandas solids they stand in for so presets apply to both"""
+import datetime
+from typing import Dict
+
+import pyarrow as pa
+from dagster import (
+    AssetMaterialization,
+    EventMetadata,
+    EventMetadataEntry,
+    Field,
+    Output,
+    OutputDefinition,
+    SolidExecutionContext,
+    solid,
+)
+from pandas import DataFrame
+
+from dealpipe import arrow
+from dealpipe.metadata import METADATA_CONFIG, metadata_entries
+from dealpipe.schema.hashing import ALGORITHMS, DEFAULT_ALGORITHM
+from dealpipe.solids.writer import OUTPUT_CONFIG, write_output
+
+
+@solid(
+    name="load_deals",
+    config_schema={"deals_file": str},
+    output_defs=[OutputDefinition(dagster_type=pa.Table)],
+    required_resource_keys={"instrumentation"},
+)
+def load_deals_table(context):
+    with context.resources.instrumentation.measure("load_deals") as measurement:
+        table = arrow.read_table(context.solid_config["deals_file"])
+        measurement.rows_out = table.num_rows
+
+    yield from measurement.materializations
+    yield Output(value=table, metadata_entries=measurement.metadata_entries())
+
+
+@solid(
+    name="validate",
+    config_schema=METADATA_CONFIG,
+    output_defs=[
+        OutputDefinition(name="valid", dagster_type=pa.Table, is_required=False),
+        OutputDefinition(name="errors", dagster_type=DataFrame, is_required=False),
+    ],
+    required_resource_keys={"instrumentation"},
+)
+def validate_table(context: SolidExecutionContext, table: pa.Table, lookup: Dict):
+    with context.resources.instrumentation.measure("validate", rows_in=table.num_rows) as measurement:
+        valid, validated = arrow.validate_table(table, lookup)
+        measurement.rows_out = len(validated)
+
+    yield from measurement.materializations
+
+    if valid:
+        yield Output(
+            validated,
+            "valid",
+            metadata_entries=[EventMetadataEntry.int(validated.num_rows, "Valid rows")]
+            + measurement.metadata_entries(),
+        )
+    else:
+        yield Output(
+            validated,
+            "errors",
+            metadata_entries=metadata_entries(
+                validated,
+                "Deals validation Stats",
+                context.solid_config["metadata"],
+                context.solid_config["metadata_sample_rows"],
+                failure_cases=True,
+            )
+            + measurement.metadata_entries(),
+        )
+
+
+@solid(
+    name="transform",
+    config_schema={
+        "hash_algorithm": Field(
+            str,
+            default_value=DEFAULT_ALGORITHM,
+            is_required=False,
+            description=f"RowHash algorithm, one of: {', '.join(ALGORITHMS)}",
+        ),
+    },
+    output_defs=[OutputDefinition(dagster_type=pa.Table)],
+    required_resource_keys={"instrumentation"},
+)
+def transform_table(context: SolidExecutionContext, table: pa.Table, deals_lookup: Dict):
+    run_id = context.pipeline_run.run_id
+    run_stats = context.instance.get_run_stats(run_id)
+    as_of_date = datetime.datetime.fromtimestamp(run_stats.start_time)
+    with context.resources.instrumentation.measure("transform", rows_in=table.num_rows) as measurement:
+        table = arrow.transform_table(table, run_id, as_of_date, deals_lookup, context.solid_config["hash_algorithm"])
+        measurement.rows_out = table.num_rows
+
+    yield from measurement.materializations
+    yield Output(value=table, metadata_entries=measurement.metadata_entries())
+
+
+@solid(
+    name="save_output",
+    config_schema=OUTPUT_CONFIG,
+    required_resource_keys={"instrumentation"},
+)
+def save_output_table(context: SolidExecutionContext, table: pa.Table):
+    output_file = context.solid_config["output_file"]
+    with context.resources.instrumentation.measure("save_output", rows_in=table.num_rows) as measurement:
+        write_output(table, output_file, context.solid_config)
+
+    yield AssetMaterialization(
+        asset_key="output_parquet_file",
+        description="Processed parquet output file",
+        metadata={"output_parquet_file_path": EventMetadata.path(output_file)},
+    )
+    yield from measurement.materializations
+    yield Output(None, metadata_entries=measurement.metadata_entries())
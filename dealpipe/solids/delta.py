@@ -0,0 +1,87 @@
+from dagster import (
+    AssetMaterialization,
+    EventMetadata,
+    EventMetadataEntry,
+    Field,
+    InputDefinition,
+    Noneable,
+    Nothing,
+    Output,
+    OutputDefinition,
+    SolidExecutionContext,
+    solid,
+)
+from pandas import DataFrame
+
+from dealpipe import delta, writer
+
+
+@solid(
+    output_defs=[
+        OutputDefinition(name="changed", dagster_type=DataFrame),
+        OutputDefinition(name="deleted", dagster_type=DataFrame, is_required=False),
+        OutputDefinition(name="row_hashes", is_required=False),
+    ],
+    required_resource_keys={"instrumentation", "row_hash_state"},
+)
+def detect_changes(context: SolidExecutionContext, df: DataFrame):
+    state = context.resources.row_hash_state
+    if not state.incremental:
+        yield Output(df, "changed")
+        return
+
+    with context.resources.instrumentation.measure("detect_changes", rows_in=len(df)) as measurement:
+        changes = delta.detect_changes(df, state.load(), state.hash_algorithm)
+        measurement.rows_out = len(changes.changed)
+
+    yield from measurement.materializations
+    yield Output(
+        changes.changed,
+        "changed",
+        metadata_entries=[
+            EventMetadataEntry.int(len(df) - len(changes.changed), "Unchanged rows"),
+            EventMetadataEntry.int(len(changes.deleted), "Deleted rows"),
+            *measurement.metadata_entries(),
+        ],
+    )
+    yield Output(changes.deleted, "deleted")
+    yield Output(changes.unchanged, "row_hashes")
+
+
+@solid(
+    config_schema={
+        "deleted_file": Field(
+            Noneable(str),
+            default_value=None,
+            is_required=False,
+            description="Parquet file with the RowHash of deleted deals and of the previous versions of changed ones",
+        ),
+    },
+    input_defs=[
+        InputDefinition("deleted", DataFrame),
+        InputDefinition("row_hashes"),
+        InputDefinition("emitted", DataFrame),
+        InputDefinition("output_saved", Nothing),
+    ],
+    required_resource_keys={"row_hash_state"},
+)
+def save_delta(context: SolidExecutionContext, deleted: DataFrame, row_hashes, emitted: DataFrame):
+    deleted_file = context.solid_config["deleted_file"]
+    if deleted_file:
+        writer.write_parquet(deleted, deleted_file)
+        yield AssetMaterialization(
+            asset_key="deleted_row_hashes_file",
+            description="RowHash of the rows deleted since the previous run",
+            metadata={"deleted_row_hashes_file_path": EventMetadata.path(deleted_file)},
+        )
+
+    # only advanced once the output is saved, a failed run is processed again in full, and only with the rows that
+    # were emitted, rows of files that failed validation are processed again on the next run
+    state = context.resources.row_hash_state
+    state.save(delta.next_row_hashes(row_hashes, emitted[delta.ROW_HASH]))
+    yield AssetMaterialization(
+        asset_key="row_hash_state_file",
+        description="RowHash of the rows emitted so far",
+        metadata={"row_hash_state_file_path": EventMetadata.path(state.file)},
+    )
+    yield Output(None)
@@ -1,13 +1,62 @@
-from dagster import solid
+from typing import Dict
+
+from dagster import EventMetadataEntry, Failure, Field, Output, OutputDefinition, solid
 from pandas import DataFrame
 
-from dealpipe import reader
+from dealpipe import batch, reader
+from dealpipe.lookups import lookups_version
+from dealpipe.schema import INPUT_DTYPES
 
 
 @solid(
-    config_schema={"deals_file": str},
+    config_schema={
+        "deals_file": Field(str, is_required=False, description="path to the deals file"),
+        "deals_files": Field(
+            [str],
+            is_required=False,
+            description="paths or glob patterns of small deals files loaded and processed as one batch",
+        ),
+    },
+    output_defs=[
+        OutputDefinition(dagster_type=DataFrame, is_required=False),
+        OutputDefinition(name="fingerprint", is_required=False),
+    ],
+    required_resource_keys={"instrumentation", "fingerprint_registry"},
 )
-def load_deals(context) -> DataFrame:
-    deals_file = context.solid_config["deals_file"]
+def load_deals(context, deals_lookup: Dict):
+    config = context.solid_config
+    if "deals_files" in config:
+        deals_files = batch.expand_files(config["deals_files"])
+    elif "deals_file" in config:
+        deals_files = [config["deals_file"]]
+    else:
+        raise Failure("Either deals_file or deals_files has to be configured")
+
+    registry = context.resources.fingerprint_registry
+    fingerprint = None
+    if registry is not None:
+        fingerprint = registry.fingerprint(deals_files, lookups_version(deals_lookup))
+        processed = registry.find(fingerprint)
+        if processed is not None:
+            context.log.info(f"{', '.join(deals_files)} already processed by run {processed.run_id}, skipping it")
+            yield from processed.materializations
+            return
+
+    with context.resources.instrumentation.measure("load_deals") as measurement:
+        if "deals_files" in config:
+            df = batch.concat_sources((file, reader.read(file, dtype=INPUT_DTYPES)) for file in deals_files)
+        else:
+            df = reader.read(deals_files[0], dtype=INPUT_DTYPES)
+        measurement.rows_out = len(df)
 
-    return reader.read(deals_file)
+    yield from measurement.materializations
+    yield Output(
+        value=df,
+        metadata_entries=[EventMetadataEntry.int(len(deals_files), "Deals files"), *measurement.metadata_entries()],
+    )
+    if fingerprint is not None:
+        yield Output(
+            fingerprint,
+            "fingerprint",
+            metadata_entries=[EventMetadataEntry.text(fingerprint.content_hash, "Content hash")],
+        )
@@ -1,26 +1,51 @@
 from typing import Dict
 
-from dagster import EventMetadataEntry, Output, OutputDefinition, solid
+from dagster import EventMetadataEntry, Field, Noneable, Output, OutputDefinition, solid
 
+from dealpipe.cache import LookupCache
 from dealpipe.lookups import build_lookups
 
 
 @solid(
-    config_schema={"lookups_file": str},
+    config_schema={
+        "lookups_file": str,
+        "cache_dir": Field(
+            Noneable(str),
+            default_value=None,
+            is_required=False,
+            description="directory of the persistent lookups cache, caching is disabled when not set",
+        ),
+        "cache_max_entries": Field(int, default_value=32, is_required=False),
+    },
     output_defs=[OutputDefinition(dagster_type=Dict)],
+    required_resource_keys={"instrumentation"},
 )
 def load_deals_lookup(context):
     lookups_file = context.solid_config["lookups_file"]
-    lookup = build_lookups(lookups_file)
+    cache_dir = context.solid_config["cache_dir"]
+
+    with context.resources.instrumentation.measure("load_deals_lookup") as measurement:
+        if cache_dir:
+            cache = LookupCache(cache_dir, context.solid_config["cache_max_entries"])
+            lookup, hit = cache.get_or_build(lookups_file, build_lookups)
+            cache_status = "hit" if hit else "miss"
+        else:
+            lookup = build_lookups(lookups_file)
+            cache_status = "disabled"
+        measurement.rows_out = len(lookup["companies"])
 
     meta_stats = EventMetadataEntry.json(
         data={**lookup, "countries": list(lookup["countries"]), "currencies": list(lookup["currencies"])},
         label="Deals validation lookups",
     )
+    meta_cache = EventMetadataEntry.text(cache_status, label="Lookups cache")
 
-    return Output(
+    yield from measurement.materializations
+    yield Output(
         value=lookup,
         metadata_entries=[
             meta_stats,
+            meta_cache,
+            *measurement.metadata_entries(),
         ],
     )
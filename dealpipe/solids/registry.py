@@ -0,0 +1,16 @@
+from dagster import DagsterEventType, InputDefinition, Nothing, Output, SolidExecutionContext, solid
+
+from dealpipe.registry import Fingerprint
+
+
+@solid(
+    input_defs=[InputDefinition("fingerprint", Fingerprint), InputDefinition("outputs_saved", Nothing)],
+    required_resource_keys={"fingerprint_registry"},
+)
+def record_fingerprint(context: SolidExecutionContext, fingerprint: Fingerprint):
+    """Record the processed input with the asset materializations of this run, to be re-emitted for duplicates"""
+    records = context.instance.all_logs(context.run_id, of_type=DagsterEventType.ASSET_MATERIALIZATION)
+    materializations = [record.dagster_event.event_specific_data.materialization for record in records]
+
+    context.resources.fingerprint_registry.record(fingerprint, context.run_id, materializations)
+    yield Output(None)
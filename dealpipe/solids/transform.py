@@ -1,28 +1,62 @@
 import datetime
+from functools import partial
 from typing import Dict
 
-from dagster import EventMetadataEntry, Output, OutputDefinition, SolidExecutionContext, solid
+from dagster import Field, Output, OutputDefinition, SolidExecutionContext, solid
 from pandas import DataFrame
 
-from dealpipe import schema
+from dealpipe import batch, schema
+from dealpipe.delta import HashAlgorithmMismatch
+from dealpipe.metadata import METADATA_CONFIG, metadata_entries
+from dealpipe.schema.hashing import ALGORITHMS, DEFAULT_ALGORITHM
 
 
 @solid(
+    config_schema={
+        "hash_algorithm": Field(
+            str,
+            default_value=DEFAULT_ALGORITHM,
+            is_required=False,
+            description=f"RowHash algorithm, one of: {', '.join(ALGORITHMS)}",
+        ),
+        "compact": Field(
+            bool,
+            default_value=False,
+            is_required=False,
+            description="categorical code, name and run columns and Arrow-backed DealName strings, to save memory",
+        ),
+        **METADATA_CONFIG,
+    },
     output_defs=[OutputDefinition(dagster_type=DataFrame)],
+    required_resource_keys={"instrumentation", "row_hash_state"},
 )
 def transform(context: SolidExecutionContext, df: DataFrame, deals_lookup: Dict):
+    hash_algorithm = context.solid_config["hash_algorithm"]
+    state = context.resources.row_hash_state
+    if state.incremental and state.hash_algorithm != hash_algorithm:
+        raise HashAlgorithmMismatch(
+            f"The transform hashes rows with {hash_algorithm}, the row hash state with {state.hash_algorithm}"
+        )
+
     run_id = context.pipeline_run.run_id
     run_stats = context.instance.get_run_stats(run_id)
     as_of_date = datetime.datetime.fromtimestamp(run_stats.start_time)
-    df = schema.transform(df, run_id, as_of_date, deals_lookup)
+    with context.resources.instrumentation.measure("transform", rows_in=len(df)) as measurement:
+        transform = partial(
+            schema.transform_compact if context.solid_config["compact"] else schema.transform,
+            run_id=run_id,
+            as_of_date=as_of_date,
+            lookups=deals_lookup,
+            hash_algorithm=hash_algorithm,
+        )
+        df = batch.apply_without_source(df, transform) if batch.is_batch(df) else transform(df)
+        measurement.rows_out = len(df)
 
-    meta_stats = EventMetadataEntry.md(
-        md_str=df.to_markdown(),
-        label="Processed Deals",
-    )
+    yield from measurement.materializations
     yield Output(
         value=df,
-        metadata_entries=[
-            meta_stats,
-        ],
+        metadata_entries=metadata_entries(
+            df, "Processed Deals", context.solid_config["metadata"], context.solid_config["metadata_sample_rows"]
+        )
+        + measurement.metadata_entries(),
     )
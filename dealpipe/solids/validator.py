@@ -1,38 +1,95 @@
 from typing import Dict
 
-from dagster import EventMetadataEntry, Output, OutputDefinition, SolidExecutionContext, solid
+from dagster import EventMetadataEntry, Field, Noneable, Output, OutputDefinition, SolidExecutionContext, solid
 from pandas import DataFrame
 
+from dealpipe import batch
+from dealpipe.metadata import METADATA_CONFIG, metadata_entries
 from dealpipe.schema import validate_input
 
 
 @solid(
+    config_schema={
+        "workers": Field(int, default_value=1, is_required=False, description="validation processes"),
+        "partition_size": Field(
+            Noneable(int),
+            default_value=None,
+            is_required=False,
+            description="rows per validated partition, the rows split evenly across the workers when not set",
+        ),
+        **METADATA_CONFIG,
+    },
     output_defs=[
         OutputDefinition(name="valid", dagster_type=DataFrame, is_required=False),
         OutputDefinition(name="errors", dagster_type=DataFrame, is_required=False),
     ],
+    required_resource_keys={"instrumentation"},
 )
 def validate(context: SolidExecutionContext, df: DataFrame, lookup: Dict):
-    valid, input_df = validate_input(df, lookup)
+    config = context.solid_config
+    if batch.is_batch(df):
+        yield from validate_batch(context, df, lookup)
+        return
 
-    meta_stats = EventMetadataEntry.md(
-        md_str=input_df.to_markdown(),
-        label="Deals validation Stats",
+    with context.resources.instrumentation.measure("validate", rows_in=len(df)) as measurement:
+        valid, input_df = validate_input(df, lookup, config["workers"], config["partition_size"])
+        measurement.rows_out = len(input_df)
+
+    meta_stats = (
+        metadata_entries(
+            input_df,
+            "Deals validation Stats",
+            config["metadata"],
+            config["metadata_sample_rows"],
+            failure_cases=not valid,
+        )
+        + measurement.metadata_entries()
     )
 
+    yield from measurement.materializations
+
     if valid:
         yield Output(
             input_df,
             "valid",
-            metadata_entries=[
-                meta_stats,
-            ],
+            metadata_entries=meta_stats,
         )
     else:
         yield Output(
             input_df,
             "errors",
-            metadata_entries=[
-                meta_stats,
-            ],
+            metadata_entries=meta_stats,
+        )
+
+
+def validate_batch(context: SolidExecutionContext, df: DataFrame, lookup: Dict):
+    """Both outputs can be yielded for a batch, the valid files are processed and the others reported"""
+    config = context.solid_config
+    with context.resources.instrumentation.measure("validate", rows_in=len(df)) as measurement:
+        valid_df, errors_df = batch.validate_batch(df, lookup, config["workers"], config["partition_size"])
+        measurement.rows_out = 0 if valid_df is None else len(valid_df)
+
+    yield from measurement.materializations
+
+    if valid_df is not None:
+        yield Output(
+            valid_df,
+            "valid",
+            metadata_entries=metadata_entries(
+                valid_df, "Deals validation Stats", config["metadata"], config["metadata_sample_rows"]
+            )
+            + measurement.metadata_entries(),
+        )
+    if errors_df is not None:
+        yield Output(
+            errors_df,
+            "errors",
+            metadata_entries=[EventMetadataEntry.int(errors_df[batch.SOURCE_FILE].nunique(), "Invalid files")]
+            + metadata_entries(
+                errors_df,
+                "Deals validation Stats",
+                config["metadata"],
+                config["metadata_sample_rows"],
+                failure_cases=True,
+            ),
         )
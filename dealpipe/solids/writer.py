@@ -1,37 +1,97 @@
-from dagster import AssetMaterialization, EventMetadata, Field, Output, SolidExecutionContext, solid
+from dagster import AssetMaterialization, EventMetadata, Field, Noneable, Output, SolidExecutionContext, solid
 from pandas import DataFrame
 
-from dealpipe import writer
+from dealpipe import batch, writer
+
+OUTPUT_CONFIG = {
+    "output_file": Field(str, description="path to the output file, {source} is replaced per file of a batch"),
+    "compression": Field(str, default_value="gzip", is_required=False, description="gzip, zstd, snappy, lz4 or none"),
+    "compression_level": Field(Noneable(int), default_value=None, is_required=False),
+    "row_group_size": Field(Noneable(int), default_value=None, is_required=False, description="rows per row group"),
+    "use_dictionary": Field(bool, default_value=True, is_required=False),
+    "dictionary_columns": Field(
+        Noneable([str]),
+        default_value=None,
+        is_required=False,
+        description="dictionary encode only these low-cardinality columns",
+    ),
+    "write_statistics": Field(bool, default_value=True, is_required=False),
+}
+
+
+def write_output(data, file: str, config: dict) -> int:
+    return writer.write_parquet(
+        data,
+        file,
+        config["compression"],
+        compression_level=config["compression_level"],
+        row_group_size=config["row_group_size"],
+        use_dictionary=config["dictionary_columns"] or config["use_dictionary"],
+        write_statistics=config["write_statistics"],
+    )
 
 
 @solid(
-    config_schema={
-        "output_file": Field(str, description="path to the output file"),
-        "compression": Field(str, default_value="gzip", is_required=False),
-    }
+    config_schema=OUTPUT_CONFIG,
+    required_resource_keys={"instrumentation"},
 )
 def save_output(context: SolidExecutionContext, df: DataFrame):
-    output_file = context.solid_config["output_file"]
-    writer.write_parquet(df, output_file, context.solid_config["compression"])
+    config = context.solid_config
+    output_file = config["output_file"]
+    outputs = list(batch.split_outputs(df, output_file))
+    with context.resources.instrumentation.measure("save_output", rows_in=len(df)) as measurement:
+        for file, _, frame in outputs:
+            write_output(frame, file, config)
 
-    yield AssetMaterialization(
-        asset_key="output_parquet_file",
-        description="Processed parquet output file",
-        metadata={"output_parquet_file_path": EventMetadata.path(output_file)},
-    )
-    yield Output(None)
+    for file, source, _ in outputs:
+        yield AssetMaterialization(
+            asset_key="output_parquet_file",
+            description="Processed parquet output file",
+            metadata={"output_parquet_file_path": EventMetadata.path(file)},
+            partition=source,
+        )
+    yield from measurement.materializations
+    yield Output(None, metadata_entries=measurement.metadata_entries())
 
 
 @solid(
-    config_schema={"errors_excel_file": str},
+    config_schema={
+        "errors_excel_file": Field(
+            str, description="path to the errors file, {source} is replaced per file of a batch"
+        ),
+        "format": Field(str, default_value="xlsx", is_required=False, description="xlsx, csv or parquet"),
+        "max_errors_per_check": Field(
+            Noneable(int),
+            default_value=None,
+            is_required=False,
+            description="failure cases written per column and check, the counts go to a summary when set",
+        ),
+    },
+    required_resource_keys={"instrumentation"},
 )
 def save_errors(context: SolidExecutionContext, df: DataFrame):
     errors_excel_file = context.solid_config["errors_excel_file"]
-    writer.write_excel(df, errors_excel_file, sheet_name="Errors")
+    outputs = list(batch.split_outputs(df, errors_excel_file))
+    with context.resources.instrumentation.measure("save_errors", rows_in=len(df)) as measurement:
+        for file, _, frame in outputs:
+            written = writer.write_errors(
+                frame,
+                file,
+                context.solid_config["format"],
+                max_per_check=context.solid_config["max_errors_per_check"],
+            )
+            if written < len(frame) and context.solid_config["max_errors_per_check"] is None:
+                context.log.warning(
+                    f"{file} holds {written} of {len(frame)} failure cases, the rest are past the xlsx row limit and "
+                    "only counted in its Summary sheet, use the csv or parquet format to keep them all"
+                )
 
-    yield AssetMaterialization(
-        asset_key="errors_excel_file",
-        description="Excel row-wise aggregate error report",
-        metadata={"errors_excel_file_path": EventMetadata.path(errors_excel_file)},
-    )
-    yield Output(None)
+    for file, source, _ in outputs:
+        yield AssetMaterialization(
+            asset_key="errors_excel_file",
+            description="Row-wise aggregate error report",
+            metadata={"errors_excel_file_path": EventMetadata.path(file)},
+            partition=source,
+        )
+    yield from measurement.materializations
+    yield Output(None, metadata_entries=measurement.metadata_entries())
@@ -0,0 +1,76 @@
+import datetime
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dealpipe import reader, writer
+from dealpipe.arrow import read_table, transform_table, validate_table
+from dealpipe.lookups import build_lookups
+from dealpipe.schema import INPUT_DTYPES, transform, validate_input
+
+AS_OF_DATE = datetime.datetime(2021, 6, 1)
+
+
+class TestArrowPath(TestCase):
+    def setUp(self):
+        self.lookups = build_lookups("files/lookups.csv")
+
+    def pandas_output(self, file):
+        valid, df = validate_input(reader.read(file, dtype=INPUT_DTYPES), self.lookups)
+        return pa.Table.from_pandas(transform(df, "run", AS_OF_DATE, self.lookups), preserve_index=False)
+
+    def arrow_output(self, file):
+        valid, table = validate_table(read_table(file), self.lookups)
+        assert valid
+        return transform_table(table, "run", AS_OF_DATE, self.lookups)
+
+    def test_read_csv_as_text(self):
+        table = read_table("files/valid.csv")
+
+        assert set(table.schema.types) == {pa.string()}
+        assert table.column("D2").to_pylist() == ["15.33333", "11", "221.22", None]
+
+    def test_same_output_as_pandas(self):
+        for file in ("files/valid.csv", "files/valid.xlsx", "files/valid.yaml"):
+            expected = self.pandas_output(file).replace_schema_metadata()
+
+            assert self.arrow_output(file).equals(expected), file
+
+    def test_same_failure_cases_as_pandas(self):
+        for file in ("files/invalid.csv", "files/invalid.xlsx", "files/invalid.yaml"):
+            _, expected = validate_input(reader.read(file), self.lookups)
+            valid, failure_cases = validate_table(read_table(file), self.lookups)
+
+            assert not valid
+            pd.testing.assert_frame_equal(failure_cases, expected)
+
+    def test_padded_decimals(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "padded.csv")
+            Path(file).write_text(Path("files/valid.csv").read_text().replace(",15.33333,", ", 15.33333 ,"))
+
+            valid, validated = validate_table(read_table(file), self.lookups)
+            assert valid
+            assert validated.column("D2").to_pylist()[0] == " 15.33333 "
+
+            assert self.arrow_output(file).equals(self.pandas_output(file).replace_schema_metadata())
+
+    def test_utf16_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "deals.csv")
+            Path(file).write_bytes(Path("files/valid.csv").read_text().encode("utf-16"))
+
+            assert read_table(file).equals(read_table("files/valid.csv"))
+            assert self.arrow_output(file).equals(self.pandas_output(file).replace_schema_metadata())
+
+    def test_write_table(self):
+        table = self.arrow_output("files/valid.csv")
+
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "deals.parquet")
+            assert writer.write_parquet(table, file) == 4
+            assert pq.read_table(file).equals(table)
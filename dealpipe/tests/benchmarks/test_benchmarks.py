@@ -0,0 +1,82 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from dealpipe import reader
+from dealpipe.benchmarks.generator import FORMATS, corrupt_deals, generate_deals, generate_lookups, write_deals
+from dealpipe.benchmarks.runner import run_benchmarks, write_results
+from dealpipe.schema import validate_input
+
+STAGES = [
+    "reader.read",
+    "reader.read",
+    "build_lookups",
+    "validate_input",
+    "validate_input",
+    "schema.transform",
+    "writer.write_parquet",
+    "writer.write_excel",
+]
+
+
+class TestGenerator(TestCase):
+    def setUp(self):
+        self.lookups = generate_lookups(companies=5)
+        self.deals = generate_deals(50, self.lookups)
+
+    def test_generated_deals_are_valid(self):
+        valid, _ = validate_input(self.deals, self.lookups)
+
+        assert valid
+        assert self.deals["D2"].isna().any()
+
+    def test_corrupted_deals_are_invalid(self):
+        invalid_deals = corrupt_deals(self.deals, invalid_ratio=0.2)
+
+        valid, errors = validate_input(invalid_deals, self.lookups)
+
+        assert not valid
+        assert self.deals.equals(generate_deals(50, self.lookups))
+
+    def test_corrupt_at_least_one_row(self):
+        valid, _ = validate_input(corrupt_deals(self.deals, invalid_ratio=0), self.lookups)
+
+        assert not valid
+
+    @mock.patch("dealpipe.benchmarks.generator.XLSX_MAX_ROWS", 10)
+    def test_write_deals_past_the_sheet_limit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                write_deals(self.deals, str(Path(directory) / "deals.xlsx"), self.lookups)
+
+    def test_write_deals(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for file_format in FORMATS:
+                file = str(Path(directory) / f"deals.{file_format}")
+
+                write_deals(self.deals, file, self.lookups)
+
+                assert len(reader.read(file)) == 50, file_format
+
+
+class TestRunner(TestCase):
+    def test_run_benchmarks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = str(Path(directory) / "results.jsonl")
+
+            write_results(run_benchmarks(20, "csv", directory, invalid_ratio=0.5), results_file)
+
+            with open(results_file) as f:
+                records = [json.loads(line) for line in f]
+
+        assert [record["stage"] for record in records] == STAGES
+        assert all(record["rows"] == 20 and record["seconds"] >= 0 for record in records)
+        assert all(record["peak_memory_bytes"] > 0 for record in records)
+
+    @mock.patch("dealpipe.benchmarks.runner.XLSX_MAX_ROWS", 10)
+    def test_xlsx_rows_capped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            records = list(run_benchmarks(20, "xlsx", directory, memory=False))
+
+        assert all(record["rows"] == 10 and record["requested_rows"] == 20 for record in records)
@@ -1,10 +1,14 @@
+import copy
+import tempfile
 import unittest
 import warnings
+from pathlib import Path
 from unittest import mock
 
 import pandas as pd
 from dagster import AssetMaterialization, DagsterEventType, ExperimentalWarning, execute_pipeline
 
+from dealpipe.delta import HashAlgorithmMismatch
 from dealpipe.pipelines.process_deals import (
     INVALID_CSV_PRESET,
     INVALID_XLSX_PRESET,
@@ -31,10 +35,10 @@ VALIDATE_COLUMNS = [
 ]
 VALID_OUTPUT = """
 RowNo,DealName,D1,D2,D3,D4,D5,IsActive,CountryCode,CurrencyCode,CompanyId,CompanyName
-0,Kindle Paperwhite,12.22322,15.33333,18.0001,9.999999,5.3,True,USA,USD,1,Amazon
-1,Surface Pro,123.22,11.0,22.12222,14.2,123123.123123,True,USA,USD,2,Microsoft
-2,Glass,-12.33,221.22,,5.33,11.2,True,USA,USD,3,Google
-3,Airbus A320,22219387192.1293,,,,,False,BGR,BGN,4,Bulgaria Air
+0,Kindle Paperwhite,12.22322000,15.33333000,18.00010000,9.99999900,5.30000000,True,USA,USD,1,Amazon
+1,Surface Pro,123.22000000,11.00000000,22.12222000,14.20000000,123123.12312300,True,USA,USD,2,Microsoft
+2,Glass,-12.33000000,221.22000000,,5.33000000,11.20000000,True,USA,USD,3,Google
+3,Airbus A320,22219387192.12930000,,,,,False,BGR,BGN,4,Bulgaria Air
 """
 ERROR_OUTPUT = """
 schema_context,column,check,check_number,failure_case,index
@@ -61,7 +65,7 @@ def is_skipped(pipeline_result, solid_name):
     return pipeline_result.result_for_solid(solid_name).step_events[0].event_type == DagsterEventType.STEP_SKIPPED
 
 
-@mock.patch("dealpipe.writer.write_excel")
+@mock.patch("dealpipe.writer.write_errors")
 @mock.patch("dealpipe.writer.write_parquet")
 class TestProcessDealsPipeline(unittest.TestCase):
     def setUp(self) -> None:
@@ -69,7 +73,7 @@ class TestProcessDealsPipeline(unittest.TestCase):
         pd.options.mode.chained_assignment = None
         return super().setUp()
 
-    def run_valid_test(self, preset, write_parquet, write_excel):
+    def run_valid_test(self, preset, write_parquet, write_errors):
         pipeline_result = execute_pipeline(process_deals, preset.run_config, mode="test")
         solid_result = pipeline_result.result_for_solid("save_output")
         postprocess_solid_result = pipeline_result.result_for_solid("transform")
@@ -93,11 +97,22 @@ class TestProcessDealsPipeline(unittest.TestCase):
         assert isinstance(materialization, AssetMaterialization)
         assert materialization.label == "output_parquet_file"
         assert materialization.metadata_entries[0].entry_data.path == "output/deals.parquet.gz"
+        output_labels = [entry.label for entry in solid_result.step_events[4].event_specific_data.metadata_entries]
+        assert output_labels == ["wall_seconds", "cpu_seconds", "peak_rss_delta_bytes", "rows_in", "rows_per_second"]
         assert is_skipped(pipeline_result, "save_errors")
-        write_parquet.assert_called_with(output_value, "output/deals.parquet.gz", "gzip")
-        write_excel.assert_not_called()
+        write_parquet.assert_called_with(
+            output_value,
+            "output/deals.parquet.gz",
+            "gzip",
+            compression_level=None,
+            row_group_size=None,
+            use_dictionary=True,
+            write_statistics=True,
+        )
+        write_errors.assert_not_called()
 
-    def run_invalid_test(self, preset, write_parquet, write_excel):
+    def run_invalid_test(self, preset, write_parquet, write_errors):
+        write_errors.side_effect = lambda df, *args, **kwargs: len(df)
         pipeline_result = execute_pipeline(process_deals, preset.run_config, mode="test")
         solid_result = pipeline_result.result_for_solid("save_errors")
         error_report_solid_result = pipeline_result.result_for_solid("validate")
@@ -123,23 +138,211 @@ class TestProcessDealsPipeline(unittest.TestCase):
         assert materialization.metadata_entries[0].entry_data.path == "output/deals_errors.xlsx"
         assert is_skipped(pipeline_result, "transform")
         assert is_skipped(pipeline_result, "save_output")
-        write_excel.assert_called_with(output_value, "output/deals_errors.xlsx", sheet_name="Errors")
+        write_errors.assert_called_with(output_value, "output/deals_errors.xlsx", "xlsx", max_per_check=None)
         write_parquet.assert_not_called()
 
-    def test_valid_xlsx(self, write_parquet, write_excel):
-        self.run_valid_test(VALID_XLSX_PRESET, write_parquet, write_excel)
+    def test_valid_xlsx(self, write_parquet, write_errors):
+        self.run_valid_test(VALID_XLSX_PRESET, write_parquet, write_errors)
 
-    def test_invalid_xlsx(self, write_parquet, write_excel):
-        self.run_invalid_test(INVALID_XLSX_PRESET, write_parquet, write_excel)
+    def test_invalid_xlsx(self, write_parquet, write_errors):
+        self.run_invalid_test(INVALID_XLSX_PRESET, write_parquet, write_errors)
 
-    def test_valid_csv(self, write_parquet, write_excel):
-        self.run_valid_test(VALID_CSV_PRESET, write_parquet, write_excel)
+    def test_valid_csv(self, write_parquet, write_errors):
+        self.run_valid_test(VALID_CSV_PRESET, write_parquet, write_errors)
 
-    def test_invalid_csv(self, write_parquet, write_excel):
-        self.run_invalid_test(INVALID_CSV_PRESET, write_parquet, write_excel)
+    def test_invalid_csv(self, write_parquet, write_errors):
+        self.run_invalid_test(INVALID_CSV_PRESET, write_parquet, write_errors)
 
-    def test_valid_yaml(self, write_parquet, write_excel):
-        self.run_valid_test(VALID_YAML_PRESET, write_parquet, write_excel)
+    def test_valid_yaml(self, write_parquet, write_errors):
+        self.run_valid_test(VALID_YAML_PRESET, write_parquet, write_errors)
 
-    def test_invalid_yaml(self, write_parquet, write_excel):
-        self.run_invalid_test(INVALID_YAML_PRESET, write_parquet, write_excel)
+    def test_invalid_yaml(self, write_parquet, write_errors):
+        self.run_invalid_test(INVALID_YAML_PRESET, write_parquet, write_errors)
+
+
+class TestProcessDealsIncremental(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.filterwarnings("ignore", category=ExperimentalWarning)
+        pd.options.mode.chained_assignment = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.deals_file = self.root / "deals.csv"
+        self.deals_file.write_text(Path("files/valid.csv").read_text())
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def run_config(self):
+        run_config = copy.deepcopy(VALID_CSV_PRESET.run_config)
+        run_config["solids"]["load_deals"]["config"]["deals_file"] = str(self.deals_file)
+        run_config["solids"]["save_output"]["config"]["output_file"] = str(self.root / "deals.parquet.gz")
+        run_config["solids"]["save_delta"] = {"config": {"deleted_file": str(self.root / "deleted.parquet")}}
+        run_config["resources"] = {"row_hash_state": {"config": {"file": str(self.root / "row_hashes.parquet")}}}
+        return run_config
+
+    def run_pipeline(self):
+        pipeline_result = execute_pipeline(process_deals, self.run_config(), mode="test")
+        assert pipeline_result.success
+        return pipeline_result
+
+    def test_only_changes_are_emitted(self):
+        first = self.run_pipeline().result_for_solid("transform").output_value()
+        assert len(first) == 4
+
+        assert self.run_pipeline().result_for_solid("transform").output_value().empty
+        assert pd.read_parquet(self.root / "deleted.parquet").empty
+
+        self.deals_file.write_text(self.deals_file.read_text().replace("Surface Pro", "Surface Go"))
+        changed = self.run_pipeline().result_for_solid("transform").output_value()
+
+        assert changed["DealName"].tolist() == ["Surface Go"]
+        assert changed["RowNo"].tolist() == [1]
+        assert pd.read_parquet(self.root / "deleted.parquet")["RowHash"].tolist() == [first["RowHash"].iloc[1]]
+        assert len(pd.read_parquet(self.root / "row_hashes.parquet")) == 4
+
+    def test_transform_algorithm_must_match_state(self):
+        run_config = self.run_config()
+        run_config["solids"]["transform"] = {"config": {"hash_algorithm": "blake2b"}}
+
+        with self.assertRaises(HashAlgorithmMismatch):
+            execute_pipeline(process_deals, run_config, mode="test")
+
+        assert not (self.root / "row_hashes.parquet").exists()
+
+
+@mock.patch("dealpipe.writer.write_errors")
+@mock.patch("dealpipe.writer.write_parquet")
+class TestProcessDealsRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.filterwarnings("ignore", category=ExperimentalWarning)
+        pd.options.mode.chained_assignment = None
+        self.directory = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def run_pipeline(self, preset):
+        run_config = copy.deepcopy(preset.run_config)
+        registry_file = str(Path(self.directory.name) / "fingerprints.sqlite")
+        run_config["resources"] = {"fingerprint_registry": {"config": {"path": registry_file}}}
+        metrics_file = str(Path(self.directory.name) / "dealpipe.prom")
+
+        with mock.patch.dict("os.environ", {"DEALPIPE_METRICS_TEXTFILE": metrics_file}):
+            pipeline_result = execute_pipeline(process_deals, run_config, mode="prod")
+        assert pipeline_result.success
+        return pipeline_result
+
+    def materializations(self, pipeline_result):
+        return [
+            event.event_specific_data.materialization
+            for event in pipeline_result.event_list
+            if event.event_type == DagsterEventType.ASSET_MATERIALIZATION
+        ]
+
+    def test_duplicate_input_is_skipped(self, write_parquet, write_errors):
+        write_errors.side_effect = lambda df, *args, **kwargs: len(df)
+        for preset in (VALID_CSV_PRESET, INVALID_CSV_PRESET):
+            first = self.run_pipeline(preset)
+            assert not is_skipped(first, "record_fingerprint")
+
+            second = self.run_pipeline(preset)
+            assert is_skipped(second, "validate")
+            assert is_skipped(second, "record_fingerprint")
+            assert self.materializations(second) == self.materializations(first)
+
+        assert write_parquet.call_count == 1
+        assert write_errors.call_count == 1
+
+    def test_dev_mode_always_processes(self, write_parquet, write_errors):
+        for _ in range(2):
+            pipeline_result = execute_pipeline(process_deals, VALID_CSV_PRESET.run_config, mode="dev")
+            assert pipeline_result.success
+            assert not is_skipped(pipeline_result, "validate")
+
+
+class TestProcessDealsBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.filterwarnings("ignore", category=ExperimentalWarning)
+        pd.options.mode.chained_assignment = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        lines = Path("files/valid.csv").read_text().splitlines(keepends=True)
+        (self.root / "deals_1.csv").write_text("".join(lines[:3]))
+        (self.root / "deals_2.csv").write_text("".join(lines[:1] + lines[3:]))
+        (self.root / "deals_3.csv").write_text(Path("files/invalid.csv").read_text())
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_batch_is_split_per_file(self):
+        run_config = copy.deepcopy(VALID_CSV_PRESET.run_config)
+        run_config["solids"]["load_deals"]["config"] = {"deals_files": [str(self.root / "deals_*.csv")]}
+        run_config["solids"]["save_output"]["config"]["output_file"] = str(self.root / "{source}.parquet.gz")
+        run_config["solids"]["save_errors"]["config"]["errors_excel_file"] = str(self.root / "{source}_errors.xlsx")
+
+        pipeline_result = execute_pipeline(process_deals, run_config, mode="test")
+
+        assert pipeline_result.success
+        deals_1 = pd.read_parquet(self.root / "deals_1.parquet.gz")
+        deals_2 = pd.read_parquet(self.root / "deals_2.parquet.gz")
+        assert deals_1["RowNo"].tolist() == [0, 1]
+        assert deals_2["RowNo"].tolist() == [0, 1]
+        assert pd.concat([deals_1, deals_2])[VALIDATE_COLUMNS].to_csv(index=False).strip() == (
+            VALID_OUTPUT.strip().replace("\n2,", "\n0,").replace("\n3,", "\n1,")
+        )
+        assert "SourceFile" not in deals_1.columns
+        assert (self.root / "deals_3_errors.xlsx").exists()
+        assert not (self.root / "deals_1_errors.xlsx").exists()
+
+    def test_incremental_batch_reports_invalid_file_again(self):
+        run_config = copy.deepcopy(VALID_CSV_PRESET.run_config)
+        run_config["solids"]["load_deals"]["config"] = {"deals_files": [str(self.root / "deals_*.csv")]}
+        run_config["solids"]["save_output"]["config"]["output_file"] = str(self.root / "{source}.parquet.gz")
+        run_config["solids"]["save_errors"]["config"]["errors_excel_file"] = str(self.root / "{source}_errors.xlsx")
+        run_config["resources"] = {"row_hash_state": {"config": {"file": str(self.root / "row_hashes.parquet")}}}
+        errors_file = self.root / "deals_3_errors.xlsx"
+
+        assert execute_pipeline(process_deals, run_config, mode="test").success
+        assert len(pd.read_parquet(self.root / "row_hashes.parquet")) == 4
+        errors_file.unlink()
+
+        pipeline_result = execute_pipeline(process_deals, run_config, mode="test")
+
+        assert pipeline_result.success
+        assert errors_file.exists()
+        assert len(pd.read_parquet(self.root / "row_hashes.parquet")) == 4
+
+
+class TestProcessDealsCompact(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.filterwarnings("ignore", category=ExperimentalWarning)
+        pd.options.mode.chained_assignment = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def run_pipeline(self, compact: bool) -> pd.DataFrame:
+        output_file = self.root / f"deals_{compact}.parquet.gz"
+        run_config = copy.deepcopy(VALID_CSV_PRESET.run_config)
+        run_config["solids"]["transform"] = {"config": {"compact": compact}}
+        run_config["solids"]["save_output"]["config"]["output_file"] = str(output_file)
+
+        pipeline_result = execute_pipeline(process_deals, run_config, mode="test")
+
+        assert pipeline_result.success
+        return pd.read_parquet(output_file)
+
+    def test_compact_output_reads_the_same(self):
+        plain = self.run_pipeline(compact=False)
+        compact = self.run_pipeline(compact=True)
+
+        run_columns = ["AsOfDate", "ProcessIdentifier"]
+        assert compact.dtypes.equals(plain.dtypes)
+        assert compact.drop(columns=run_columns).equals(plain.drop(columns=run_columns))
+        assert compact["ProcessIdentifier"].nunique() == 1
@@ -0,0 +1,42 @@
+import unittest
+import warnings
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+from dagster import ExperimentalWarning, execute_pipeline
+
+from dealpipe.pipelines.process_deals import INVALID_CSV_PRESET, VALID_XLSX_PRESET
+from dealpipe.pipelines.process_deals_arrow import process_deals_arrow
+from dealpipe.tests.pipelines.test_process_deals import ERROR_OUTPUT, VALIDATE_COLUMNS, VALID_OUTPUT, is_skipped
+
+
+@mock.patch("dealpipe.writer.write_errors")
+@mock.patch("dealpipe.writer.write_parquet")
+class TestProcessDealsArrowPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.filterwarnings("ignore", category=ExperimentalWarning)
+        return super().setUp()
+
+    def test_valid(self, write_parquet, write_errors):
+        pipeline_result = execute_pipeline(process_deals_arrow, VALID_XLSX_PRESET.run_config, mode="test")
+        output_value = pipeline_result.result_for_solid("transform").output_value()
+
+        assert pipeline_result.success
+        assert isinstance(output_value, pa.Table)
+        assert output_value.to_pandas()[VALIDATE_COLUMNS].to_csv(index=False).strip() == VALID_OUTPUT.strip()
+        assert is_skipped(pipeline_result, "save_errors")
+        assert write_parquet.call_args[0][:3] == (output_value, "output/deals.parquet.gz", "gzip")
+        write_errors.assert_not_called()
+
+    def test_invalid(self, write_parquet, write_errors):
+        write_errors.side_effect = lambda df, *args, **kwargs: len(df)
+        pipeline_result = execute_pipeline(process_deals_arrow, INVALID_CSV_PRESET.run_config, mode="test")
+        output_value = pipeline_result.result_for_solid("validate").output_value("errors")
+
+        assert pipeline_result.success
+        assert isinstance(output_value, pd.DataFrame)
+        assert output_value.to_csv(index=False).strip() == ERROR_OUTPUT.strip()
+        assert is_skipped(pipeline_result, "save_output")
+        write_errors.assert_called_with(output_value, "output/deals_errors.xlsx", "xlsx", max_per_check=None)
+        write_parquet.assert_not_called()
@@ -1,7 +1,10 @@
+import tempfile
 from importlib.resources import files
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import Mock, call
 
+import pandas as pd
 from pandas.core.frame import DataFrame
 
 from dealpipe.reader.formats.csv import CsvReader
@@ -32,3 +35,41 @@ class TestCsvReader(TestCase):
         converters["E"].assert_has_calls((call("Yes"), call("No")))
         assert output_df["A"].iloc[0] == 1
         assert output_df["E"].iloc[0]
+
+    def test_iter_chunks(self):
+        reader = CsvReader()
+
+        chunks = list(reader.iter_chunks(str(self.test_file_path), chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks).equals(reader.read(str(self.test_file_path))[0])
+
+    def test_iter_chunks_with_converters(self):
+        reader = CsvReader()
+        converters = {"A": Mock(return_value=1)}
+
+        chunks = list(reader.iter_chunks(str(self.test_file_path), converters=converters, chunksize=1))
+
+        converters["A"].assert_has_calls((call("1"), call("12")))
+        assert chunks[1]["A"].iloc[0] == 1
+
+    def test_read_with_dtype(self):
+        reader = CsvReader()
+
+        with tempfile.TemporaryDirectory() as directory:
+            file = Path(directory) / "deals.csv"
+            file.write_text("A,B,C\n1,1.50,x\n2,,y\n")
+
+            output_df = reader.read(str(file), dtype={"A": "int32", "B": str, "C": str})[0]
+
+        assert output_df["A"].dtype == "int32"
+        assert output_df["B"].tolist()[0] == "1.50"
+        assert output_df["B"].isna().tolist() == [False, True]
+
+    def test_read_with_dtype_not_parsing(self):
+        reader = CsvReader()
+
+        output_df = reader.read(str(self.test_file_path), dtype={"B": "int32", "C": str})[0]
+
+        assert output_df["B"].tolist() == [1.2322, 2.1323]
+        assert output_df["C"].tolist() == ["string", "string"]
@@ -1,10 +1,12 @@
 from importlib.resources import files
-from unittest import TestCase
+from unittest import TestCase, mock
 from unittest.mock import Mock, call
 
+import pandas as pd
 from pandas.core.frame import DataFrame
 
 from dealpipe.reader.formats.excel import ExcelReader
+from dealpipe.reader.reader import InvalidSheetError
 
 SHEET1 = """
 A,B,C,D,E
@@ -49,6 +51,51 @@ class TestExcelReader(TestCase):
         assert isinstance(output_df2, DataFrame)
         assert output_df2.to_csv(index=False).strip() == SHEET2.strip()
 
+    def test_read_sheet_by_index(self):
+        reader = ExcelReader()
+
+        for file_path in (self.xlsx_file_path, self.xls_file_path):
+            sheets = reader.read(str(file_path), sheet=1)
+
+            assert len(sheets) == 1
+            assert sheets[0].to_csv(index=False).strip() == SHEET2.strip()
+
+    def test_read_sheet_by_name(self):
+        reader = ExcelReader()
+
+        for file_path in (self.xlsx_file_path, self.xls_file_path):
+            sheets = reader.read(str(file_path), sheet="Sheet2")
+
+            assert len(sheets) == 1
+            assert sheets[0].to_csv(index=False).strip() == SHEET2.strip()
+
+    @mock.patch("dealpipe.reader.formats.excel.read_worksheet")
+    def test_read_sheet_parses_only_that_sheet(self, read_worksheet):
+        reader = ExcelReader()
+
+        reader.read(str(self.xlsx_file_path), sheet=1)
+
+        read_worksheet.assert_called_once()
+        assert read_worksheet.call_args[0][0].title == "Sheet2"
+
+    def test_read_invalid_sheet(self):
+        reader = ExcelReader()
+
+        for file_path in (self.xlsx_file_path, self.xls_file_path):
+            with self.assertRaises(InvalidSheetError):
+                reader.read(str(file_path), sheet=2)
+            with self.assertRaises(InvalidSheetError):
+                reader.read(str(file_path), sheet="Sheet3")
+
+    def test_iter_chunks_sheet(self):
+        reader = ExcelReader()
+
+        for file_path in (self.xlsx_file_path, self.xls_file_path):
+            chunks = list(reader.iter_chunks(str(file_path), chunksize=1, sheet="Sheet2"))
+
+            assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+            assert pd.concat(chunks).to_csv(index=False).strip() == SHEET2.strip()
+
     def test_read_with_converters(self):
         reader = ExcelReader()
         converters = {"A": Mock(return_value=1), "E": Mock(return_value=True)}
@@ -59,3 +106,30 @@ class TestExcelReader(TestCase):
         converters["E"].assert_has_calls((call("Yes"), call("No")))
         assert output_df["A"].iloc[0] == 1
         assert output_df["E"].iloc[0]
+
+    def test_iter_chunks_xlsx(self):
+        reader = ExcelReader()
+
+        chunks = list(reader.iter_chunks(str(self.xlsx_file_path), chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks).to_csv(index=False).strip() == SHEET1.strip()
+
+    def test_iter_chunks_xls(self):
+        reader = ExcelReader()
+
+        chunks = list(reader.iter_chunks(str(self.xls_file_path), chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks).to_csv(index=False).strip() == SHEET1.strip()
+
+    def test_iter_chunks_with_converters(self):
+        reader = ExcelReader()
+        converters = {"A": Mock(return_value=1), "E": Mock(return_value=True)}
+
+        output_df = pd.concat(reader.iter_chunks(str(self.xlsx_file_path), converters=converters))
+
+        converters["A"].assert_has_calls((call(1), call(12)))
+        converters["E"].assert_has_calls((call("Yes"), call("No")))
+        assert output_df["A"].iloc[0] == 1
+        assert output_df["E"].iloc[0]
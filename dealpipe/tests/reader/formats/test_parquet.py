@@ -1,9 +1,15 @@
+import tempfile
 from importlib.resources import files
+from pathlib import Path
 from unittest import TestCase
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pandas.core.frame import DataFrame
 
 from dealpipe.reader.formats.parquet import ParquetReader
+from dealpipe.reader.reader import select
 
 CONTENT = """
 A,B,C,D,E
@@ -24,3 +30,48 @@ class TestParquetReader(TestCase):
         assert len(sheets) == 1
         assert isinstance(output_df, DataFrame)
         assert output_df.to_csv(index=False).strip() == CONTENT.strip()
+
+    def test_iter_chunks(self):
+        reader = ParquetReader()
+        test_file_path = files("dealpipe.tests") / "resources" / "test.parquet.gz"
+
+        chunks = list(reader.iter_chunks(str(test_file_path), chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks).to_csv(index=False).strip() == CONTENT.strip()
+
+    def test_read_selected(self):
+        reader = ParquetReader()
+        df = pd.DataFrame({"CountryCode": ["BGR", "BGR", "ROU", "ROU"], "Amount": [1, 2, 3, 4], "Name": list("abcd")})
+
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "deals.parquet")
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), file, row_group_size=2)
+
+            sheets = reader.read_selected(
+                file, columns=["Amount"], filters=[("CountryCode", "==", "ROU")], memory_map=True
+            )
+
+        assert len(sheets) == 1
+        assert sheets[0].to_dict("list") == {"Amount": [3, 4]}
+
+    def test_filters_match_pandas_with_nulls(self):
+        reader = ParquetReader()
+        df = pd.DataFrame({"CountryCode": ["BGR", None, "USA"], "Amount": [1.0, None, 3.0]})
+        filters = [
+            [("CountryCode", "!=", "BGR")],
+            [("CountryCode", "==", "BGR")],
+            [("CountryCode", "in", ["BGR"])],
+            [("CountryCode", "not in", ["BGR"])],
+            [("Amount", "<", 5)],
+            [("Amount", ">=", 0), ("CountryCode", "!=", "USA")],
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "deals.parquet")
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), file)
+
+            for row_filter in filters:
+                pushed_down = reader.read_selected(file, filters=row_filter)[0]
+
+                pd.testing.assert_frame_equal(select(df, filters=row_filter), pushed_down, obj=str(row_filter))
@@ -1,10 +1,13 @@
+import tempfile
 from importlib.resources import files
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import Mock, call
 
+import pandas as pd
 from pandas.core.frame import DataFrame
 
-from dealpipe.reader.formats.yaml import YamlReader
+from dealpipe.reader.formats.yaml import UnsupportedYamlLayout, YamlReader
 
 CONTENT = """
 A,B,C,D,E
@@ -13,6 +16,27 @@ A,B,C,D,E
 """
 
 
+COLUMNAR = """
+A: ["1", "12"]
+B: [1.2322, 2.1323]
+C: [string, string]
+D: [2021-01-01, 2021-02-01]
+E: ["Yes", "No"]
+"""
+
+MULTI_DOCUMENT = """
+---
+- {A: "1", B: 1.2322, C: string, D: 2021-01-01, E: "Yes"}
+---
+---
+A: ["12"]
+B: [2.1323]
+C: [string]
+D: [2021-02-01]
+E: ["No"]
+"""
+
+
 class TestYamlReader(TestCase):
     def setUp(self):
         resource_path = files("dealpipe.tests") / "resources"
@@ -35,6 +59,67 @@ class TestYamlReader(TestCase):
         output_df = reader.read(str(self.test_file_path), converters=converters)[0]
 
         converters["A"].assert_has_calls((call("1"), call("12")))
+        assert converters["A"].call_count == 2
         converters["E"].assert_has_calls((call("Yes"), call("No")))
         assert output_df["A"].iloc[0] == 1
         assert output_df["E"].iloc[0]
+
+    def test_iter_chunks(self):
+        reader = YamlReader()
+
+        chunks = list(reader.iter_chunks(str(self.test_file_path), chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks).to_csv(index=False).strip() == CONTENT.strip()
+
+
+class TestYamlLayouts(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content: str) -> str:
+        file = Path(self.directory.name) / "deals.yaml"
+        file.write_text(content)
+        return str(file)
+
+    def test_read_columnar(self):
+        output_df = YamlReader().read(self.write(COLUMNAR))[0]
+
+        assert output_df.to_csv(index=False).strip() == CONTENT.strip()
+
+    def test_read_multi_document(self):
+        sheets = YamlReader().read(self.write(MULTI_DOCUMENT), converters={"A": int})
+
+        assert len(sheets) == 1
+        assert sheets[0]["A"].tolist() == [1, 12]
+        assert sheets[0].to_csv(index=False).strip() == CONTENT.strip()
+
+    def test_converters_see_the_parsed_values(self):
+        output_df = YamlReader().read(self.write("- {B: 1}\n- {}\n"), converters={"B": str})[0]
+
+        assert output_df["B"].iloc[0] == "1"
+        assert pd.isna(output_df["B"].iloc[1])
+
+    def test_converted_values_stay_aligned(self):
+        content = "---\n- {A: '1', B: x}\n- {B: y}\n---\nA: ['3', null]\nC: [true, false]\n"
+        converter = Mock(side_effect=int)
+
+        output_df = YamlReader().read(self.write(content), converters={"A": converter})[0]
+
+        assert converter.call_args_list == [call("1"), call("3")]
+        assert output_df["A"].tolist()[0::2] == [1, 3]
+        assert output_df["A"].isna().tolist() == [False, True, False, True]
+        assert output_df["B"].tolist()[:2] == ["x", "y"]
+        assert output_df["C"].tolist()[2:] == [True, False]
+
+    def test_iter_chunks_multi_document(self):
+        chunks = list(YamlReader().iter_chunks(self.write(MULTI_DOCUMENT), chunksize=5))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+
+    def test_read_unsupported_layout(self):
+        with self.assertRaises(UnsupportedYamlLayout):
+            YamlReader().read(self.write("just a string"))
@@ -0,0 +1,119 @@
+import bz2
+import gzip
+import io
+import tempfile
+from importlib.resources import files
+from pathlib import Path
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from dealpipe import reader
+from dealpipe.reader.compression import ThreadedReader, UnsupportedCompression, open_decompressed, open_input
+from dealpipe.reader.formats.csv import CsvReader
+
+
+class TestCompression(TestCase):
+    def setUp(self):
+        self.resource_path = files("dealpipe.tests") / "resources"
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def compress(self, resource: str, name: str, compress) -> str:
+        file = self.root / name
+        file.write_bytes(compress((self.resource_path / resource).read_bytes()))
+        return str(file)
+
+    def test_threaded_reader(self):
+        content = bytes(range(256)) * 100
+
+        with io.BufferedReader(ThreadedReader(io.BytesIO(content), block_size=1000, max_blocks=2)) as stream:
+            assert stream.read(10) == content[:10]
+            assert stream.read() == content[10:]
+            assert stream.read() == b""
+
+    def test_threaded_reader_raises_source_errors(self):
+        source = mock.Mock()
+        source.read.side_effect = OSError("broken")
+
+        reader = ThreadedReader(source)
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                reader.read(10)
+
+    def test_threaded_reader_close_before_end(self):
+        stream = ThreadedReader(io.BytesIO(bytes(10_000)), block_size=10, max_blocks=1)
+        stream.read(5)
+
+        stream.close()
+
+        assert stream.closed
+
+    def test_open_decompressed(self):
+        file = self.compress("test.csv", "test.csv.bz2", bz2.compress)
+
+        with open_decompressed(file, "bz2") as stream:
+            assert stream.read() == (self.resource_path / "test.csv").read_bytes()
+
+    def test_open_input_uncompressed(self):
+        file = str(self.resource_path / "test.csv")
+
+        with open_input(file) as source:
+            assert source == file
+
+    def test_unsupported_compression(self):
+        with self.assertRaises(UnsupportedCompression):
+            open_decompressed(str(self.resource_path / "test.csv"), "lzma")
+
+    def test_read_compressed(self):
+        expected = {
+            "csv": reader.read(str(self.resource_path / "test.csv")),
+            "yaml": reader.read(str(self.resource_path / "test.yaml")),
+        }
+
+        for format, extension, compress in [
+            ("csv", "gz", gzip.compress),
+            ("csv", "bz2", bz2.compress),
+            ("yaml", "gz", gzip.compress),
+            ("yaml", "bz2", bz2.compress),
+        ]:
+            file = self.compress(f"test.{format}", f"test.{format}.{extension}", compress)
+
+            assert reader.read(file).equals(expected[format]), file
+
+    def test_read_compressed_without_inner_extension(self):
+        file = self.compress("test.csv", "deals.gz", gzip.compress)
+
+        assert reader.read(file).equals(reader.read(str(self.resource_path / "test.csv")))
+
+    def test_iter_chunks_compressed(self):
+        file = self.compress("test.csv", "test.csv.gz", gzip.compress)
+
+        chunks = list(reader.iter_chunks(file, chunksize=1))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+
+    def test_read_encoded(self):
+        for format in ("csv", "yaml"):
+            text = (self.resource_path / f"test.{format}").read_text()
+            expected = reader.read(str(self.resource_path / f"test.{format}"))
+
+            for encoding in ("utf-8-sig", "utf-16"):
+                for name, compress in [(f"test.{format}", None), (f"test.{format}.gz", gzip.compress)]:
+                    file = self.root / name
+                    content = text.encode(encoding)
+                    file.write_bytes(compress(content) if compress else content)
+
+                    assert reader.read(str(file)).equals(expected), (file, encoding)
+                    assert pd.concat(reader.iter_chunks(str(file), chunksize=1)).equals(expected), (file, encoding)
+
+    def test_read_encoded_csv_with_dtype(self):
+        file = self.root / "test.csv"
+        file.write_bytes((self.resource_path / "test.csv").read_text().encode("utf-16"))
+
+        df = CsvReader().read(str(file), dtype={"A": "int64"})[0]
+
+        assert df["A"].tolist() == [1, 12]
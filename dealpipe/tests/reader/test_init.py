@@ -1,6 +1,6 @@
 from unittest import TestCase, mock
 
-from dealpipe.reader import InvalidSheetError, read
+from dealpipe.reader import InvalidSheetError, iter_chunks, read
 
 
 class TestReaderInit(TestCase):
@@ -28,6 +28,34 @@ class TestReaderInit(TestCase):
 
         assert result == 2
 
+    @mock.patch("dealpipe.reader.detect_format")
+    @mock.patch("dealpipe.reader.factory")
+    def test_read_passes_sheet_to_reader(self, factory, detect_format):
+        """Readers that support sheets parse only the requested one"""
+
+        detect_format.return_value = "excel"
+        factory.get_reader().read.return_value = [2]
+
+        result = read("dummy.xlsx", sheet="lookups")
+
+        factory.get_reader().read.assert_called_with("dummy.xlsx", None, "lookups", None)
+        assert result == 2
+
+    @mock.patch("dealpipe.reader.detect_format")
+    @mock.patch("dealpipe.reader.factory")
+    def test_read_passes_selection_to_reader(self, factory, detect_format):
+        """Column lists and row filters go to the reader so that it can push them down"""
+
+        detect_format.return_value = "parquet"
+        factory.get_reader().read_selected.return_value = [3]
+        filters = [("CountryCode", "==", "BGR")]
+
+        result = read("dummy.parquet", columns=["A"], filters=filters, memory_map=True)
+
+        factory.get_reader().read_selected.assert_called_with("dummy.parquet", None, 0, None, ["A"], filters, True)
+        factory.get_reader().read.assert_not_called()
+        assert result == 3
+
     @mock.patch("dealpipe.reader.detect_format")
     @mock.patch("dealpipe.reader.factory")
     def test_read_raise_when_invalid_sheet(self, factory, detect_format):
@@ -38,3 +66,14 @@ class TestReaderInit(TestCase):
 
         with self.assertRaises(InvalidSheetError):
             read("dummy.csv", sheet=4)
+
+    @mock.patch("dealpipe.reader.detect_format")
+    @mock.patch("dealpipe.reader.factory")
+    def test_iter_chunks(self, factory, detect_format):
+        detect_format.return_value = "csv"
+        factory.get_reader().iter_chunks.return_value = iter([1, 2])
+
+        result = iter_chunks("dummy.csv", chunksize=10)
+
+        factory.get_reader().iter_chunks.assert_called_with("dummy.csv", None, 10, 0, None)
+        assert list(result) == [1, 2]
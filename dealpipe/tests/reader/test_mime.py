@@ -1,81 +1,111 @@
+import bz2
+import gzip
+import shutil
+import tempfile
 from importlib.resources import files
+from pathlib import Path
 from unittest import TestCase, mock
 
-from dealpipe.reader.mime import detect_format, is_excel
+from dealpipe.reader.mime import Sniffed, detect_format, sniff
 
 
 class TestMime(TestCase):
     def setUp(self):
         self.resource_path = files("dealpipe.tests") / "resources"
-
-    def test_is_excel_xls(self):
-        file = str(self.resource_path / "test.xls")
-
-        assert is_excel(file)
-
-    def test_is_excel_xlsx(self):
-        file = str(self.resource_path / "test.xlsx")
-
-        assert is_excel(file)
-
-    def test_is_excel_csv(self):
-        file = str(self.resource_path / "test.csv")
-
-        assert not is_excel(file)
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_xls(self, _is_excel):
-        _is_excel.return_value = True
-        file = "test_file.xlsx"
-
-        format = detect_format(file)
-
-        _is_excel.assert_called_with(file)
-        assert format == "excel"
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_xlsx(self, _is_excel):
-        _is_excel.return_value = True
-        file = "test_file.xlsx"
-
-        format = detect_format(file)
-
-        _is_excel.assert_called_with(file)
-        assert format == "excel"
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_csv(self, _is_excel):
-        file = "test_file.csv"
-
-        format = detect_format(file)
-
-        _is_excel.assert_not_called()
-        assert format == "csv"
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_yaml(self, _is_excel):
-        file = "test_file.yaml"
-
-        format = detect_format(file)
-
-        _is_excel.assert_not_called()
-        assert format == "yaml"
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_parquet(self, _is_excel):
-        file = "test_file.parquet.gz"
-
-        format = detect_format(file)
-
-        _is_excel.assert_not_called()
-        assert format == "parquet"
-
-    @mock.patch("dealpipe.reader.mime.is_excel")
-    def test_detect_format_unknown(self, _is_excel):
-        _is_excel.return_value = False
-        file = "test_file.unknown"
-
-        format = detect_format(file)
-
-        _is_excel.assert_called_with(file)
-        assert format == "unknown"
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def copy(self, resource: str, name: str) -> str:
+        file = str(self.root / name)
+        shutil.copyfile(str(self.resource_path / resource), file)
+        return file
+
+    def test_detect_format_resources(self):
+        formats = {
+            "test.xls": "excel",
+            "test.xlsx": "excel",
+            "test.csv": "csv",
+            "test.yaml": "yaml",
+            "test.parquet.gz": "parquet",
+        }
+
+        for resource, format in formats.items():
+            assert detect_format(str(self.resource_path / resource)) == format, resource
+
+    def test_detect_format_without_extension(self):
+        formats = {"test.xls": "excel", "test.xlsx": "excel", "test.parquet.gz": "parquet", "test.csv": "csv"}
+
+        for resource, format in formats.items():
+            assert detect_format(self.copy(resource, f"{resource.split('.')[0]}_{format}")) == format, resource
+
+    def test_detect_format_yaml_without_extension(self):
+        file = self.root / "deals"
+        file.write_text("---\n- DealName: deal\n")
+
+        assert detect_format(str(file)) == "yaml"
+
+    def test_sniff_compressed(self):
+        gzip_file = self.root / "deals.csv.gz"
+        gzip_file.write_bytes(gzip.compress(b"DealName\ndeal\n"))
+        bz2_file = self.root / "deals.yaml.bz2"
+        bz2_file.write_bytes(bz2.compress(b"---\n"))
+        zstd_file = self.root / "deals.csv.zst"
+        zstd_file.write_bytes(b"\x28\xb5\x2f\xfd" + bytes(10))
+
+        assert sniff(str(gzip_file)) == Sniffed("csv", "gzip")
+        assert sniff(str(bz2_file)) == Sniffed("yaml", "bz2")
+        assert sniff(str(zstd_file)) == Sniffed("csv", "zstd")
+
+    def test_sniff_compressed_content(self):
+        csv_file = self.root / "deals.gz"
+        csv_file.write_bytes(gzip.compress("DealName,D1\ndeal,1\n".encode("utf-16")))
+        yaml_file = self.root / "deals.bz2"
+        yaml_file.write_bytes(bz2.compress(b"- DealName: deal\n"))
+        parquet_file = self.root / "deals.csv.gz"
+        parquet_file.write_bytes(gzip.compress(b"PAR1" + bytes(10)))
+
+        assert sniff(str(csv_file)) == Sniffed("csv", "gzip", "utf-16")
+        assert sniff(str(yaml_file)) == Sniffed("yaml", "bz2")
+        assert sniff(str(parquet_file)) == Sniffed("parquet", "gzip")
+
+    def test_sniff_bom(self):
+        utf8_file = self.root / "deals.csv"
+        utf8_file.write_bytes(b"\xef\xbb\xbfDealName,D1\n")
+        utf16_file = self.root / "deals"
+        utf16_file.write_bytes("DealName,D1\n".encode("utf-16"))
+
+        assert sniff(str(utf8_file)) == Sniffed("csv", encoding="utf-8-sig")
+        assert sniff(str(utf16_file)) == Sniffed("csv", encoding="utf-16")
+
+    def test_detect_format_unknown(self):
+        binary_file = self.root / "deals.bin"
+        binary_file.write_bytes(bytes(range(256)))
+
+        assert detect_format(str(binary_file)) == "unknown"
+
+    def test_detect_format_missing_file_uses_name(self):
+        assert detect_format("test_file.csv") == "csv"
+        assert detect_format("test_file.yml") == "yaml"
+        assert detect_format("test_file.parquet.gz") == "parquet"
+        assert detect_format("test_file.unknown") == "unknown"
+
+    def test_sniff_opens_file_once_and_caches(self):
+        file = self.copy("test.xlsx", "cached.xlsx")
+
+        with mock.patch("builtins.open", wraps=open) as _open:
+            assert detect_format(file) == "excel"
+            assert detect_format(file) == "excel"
+
+        _open.assert_called_once()
+
+    def test_sniff_cache_invalidated_on_change(self):
+        file = self.root / "deals"
+        file.write_text("DealName,D1\n")
+        assert detect_format(str(file)) == "csv"
+
+        file.write_text("---\n- DealName: deal\n")
+
+        assert detect_format(str(file)) == "yaml"
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from pandas import DataFrame
+
+from dealpipe.reader.reader import InvalidFilterError, InvalidSheetError, resolve_sheet, select
+
+SHEET_NAMES = ["data", "lookups"]
+
+
+class TestResolveSheet(TestCase):
+    def test_resolve_sheet_index(self):
+        assert resolve_sheet(SHEET_NAMES, 1) == "lookups"
+
+    def test_resolve_sheet_name(self):
+        assert resolve_sheet(SHEET_NAMES, "data") == "data"
+
+    def test_resolve_single_sheet(self):
+        """A workbook with a single sheet ignores the `sheet` parameter, like `reader.read` does"""
+
+        assert resolve_sheet(["data"], 1) == "data"
+
+    def test_resolve_invalid_sheet(self):
+        with self.assertRaises(InvalidSheetError):
+            resolve_sheet(SHEET_NAMES, 2)
+        with self.assertRaises(InvalidSheetError):
+            resolve_sheet(SHEET_NAMES, -1)
+        with self.assertRaises(InvalidSheetError):
+            resolve_sheet(SHEET_NAMES, "missing")
+
+
+class TestSelect(TestCase):
+    def setUp(self):
+        self.df = DataFrame({"CountryCode": ["BGR", "ROU", "BGR", "GRC"], "Amount": [1, 2, 3, 4]})
+
+    def test_select_columns(self):
+        assert select(self.df, columns=["Amount"]).columns.tolist() == ["Amount"]
+
+    def test_select_conjunction(self):
+        result = select(self.df, filters=[("CountryCode", "==", "BGR"), ("Amount", ">", 1)])
+
+        assert result.to_dict("list") == {"CountryCode": ["BGR"], "Amount": [3]}
+        assert result.index.tolist() == [0]
+
+    def test_select_disjunction(self):
+        filters = [[("CountryCode", "in", ["GRC"])], [("Amount", "<=", 1)]]
+
+        assert select(self.df, ["Amount"], filters)["Amount"].tolist() == [1, 4]
+
+    def test_select_invalid_operator(self):
+        with self.assertRaises(InvalidFilterError):
+            select(self.df, filters=[("Amount", "~", 1)])
+
+    def test_select_comparisons_exclude_nulls(self):
+        df = DataFrame({"CountryCode": ["BGR", None, "USA"]})
+
+        assert select(df, filters=[("CountryCode", "!=", "BGR")])["CountryCode"].tolist() == ["USA"]
+        assert select(df, filters=[("CountryCode", "not in", ["BGR"])])["CountryCode"].tolist() == [None, "USA"]
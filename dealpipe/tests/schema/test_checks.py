@@ -1,26 +1,59 @@
+import pickle
 from decimal import Decimal
 
-from dealpipe.schema.checks import is_active_fn, is_decimal_fn, is_numeric_fn
+from pandas import Series
+
+from dealpipe.schema.checks import fits_decimal_fn, is_active_fn, is_numeric_fn
 
 
 def test_is_numeric():
-    assert is_numeric_fn(12.32)
-    assert is_numeric_fn(1)
-    assert is_numeric_fn("123.3343334")
-    assert is_numeric_fn("12")
-    assert is_numeric_fn(Decimal("11.33"))
+    values = Series([12.32, 1, "123.3343334", "12", Decimal("11.33"), "invalid", ""])
+
+    assert is_numeric_fn(values).tolist() == [True, True, True, True, True, False, False]
+
+
+def test_fits_decimal():
+    values = Series(
+        [
+            "12.12345678",
+            "-0.5",
+            "1.500000000",
+            "0.0000000000",
+            "1e-05",
+            "99999999999999999999.99999999",
+            12.32,
+            Decimal("11.33"),
+        ]
+    )
+
+    assert fits_decimal_fn(values, 28, 8).all()
+
+
+def test_fits_decimal_nulls():
+    values = pickle.loads(pickle.dumps(Series(["1.5", None, float("nan"), " 12 "], dtype=object)))
+
+    assert fits_decimal_fn(values, 28, 8).tolist() == [True, True, True, True]
 
 
-def test_is_decimal():
-    assert is_decimal_fn(Decimal("12.22"))
-    assert is_decimal_fn(Decimal("NaN"))
-    assert not is_decimal_fn(12.22)
-    assert not is_decimal_fn(12)
+def test_fits_decimal_too_large():
+    values = Series(["100000000000000000000", "1E+20", -100000000000000000000])
+
+    assert not fits_decimal_fn(values, 28, 8).any()
+
+
+def test_fits_decimal_too_precise():
+    values = Series(["12.123456789", "1e-9", 0.000000001])
+
+    assert not fits_decimal_fn(values, 28, 8).any()
+
+
+def test_fits_decimal_not_a_number():
+    values = Series(["invalid", "", ".", "inf", "NaN"])
+
+    assert not fits_decimal_fn(values, 28, 8).any()
 
 
 def test_is_active():
-    assert is_active_fn("Yes")
-    assert is_active_fn("No")
-    assert not is_active_fn("True")
-    assert not is_active_fn("False")
-    assert not is_active_fn(None)
+    values = Series(["Yes", "No", "True", "False", None])
+
+    assert is_active_fn(values).tolist() == [True, True, False, False, False]
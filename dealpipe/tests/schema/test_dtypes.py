@@ -0,0 +1,106 @@
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dealpipe.schema.dtypes import DecimalArray, DecimalDtype
+
+
+class TestDecimalDtype(TestCase):
+    def test_name(self):
+        assert DecimalDtype().name == "decimal128(28, 8)"
+        assert DecimalDtype(10, 2).arrow_type == pa.decimal128(10, 2)
+
+    def test_construct_from_string(self):
+        assert DecimalDtype.construct_from_string("decimal128(10, 2)") == DecimalDtype(10, 2)
+        assert pd.api.types.pandas_dtype("decimal128(28, 8)") == DecimalDtype()
+
+        with self.assertRaises(TypeError):
+            DecimalDtype.construct_from_string("decimal")
+
+
+class TestDecimalArray(TestCase):
+    def setUp(self):
+        self.series = pd.Series(["12.22322", None, "-1", 3.5, Decimal("0.00000001")])
+        self.array = DecimalArray._from_sequence(self.series, dtype=DecimalDtype())
+
+    def test_from_sequence(self):
+        assert self.array.dtype == DecimalDtype()
+        assert list(self.array) == [Decimal("12.22322"), None, Decimal("-1"), Decimal("3.5"), Decimal("0.00000001")]
+        assert self.array.isna().tolist() == [False, True, False, False, False]
+
+    def test_from_sequence_padded(self):
+        array = DecimalArray._from_sequence([" 12", "1.5 "], dtype=DecimalDtype())
+
+        assert list(array) == [Decimal("12"), Decimal("1.5")]
+
+    def test_from_sequence_too_precise(self):
+        with self.assertRaises(pa.ArrowInvalid):
+            DecimalArray._from_sequence(["0.000000001"], dtype=DecimalDtype())
+
+    def test_compact_storage(self):
+        assert self.array.nbytes <= 16 * len(self.array) + 1
+
+    def test_series_operations(self):
+        series = pd.Series(self.array)
+
+        assert series.iloc[0] == Decimal("12.22322")
+        assert series.iloc[1] is None
+        assert series[series.notna()].tolist() == [Decimal("12.22322"), Decimal("-1"), Decimal("3.5"), Decimal("1E-8")]
+        assert series.iloc[[2, 0]].tolist() == [Decimal("-1"), Decimal("12.22322")]
+        assert series.reindex([0, 10]).tolist() == [Decimal("12.22322"), None]
+        assert pd.concat([series, series]).dtype == DecimalDtype()
+        assert series.astype(str).iloc[0] == "12.22322000"
+
+    def test_reductions(self):
+        series = pd.Series(self.array)
+
+        assert series.min() == Decimal("-1")
+        assert series.max() == Decimal("12.22322")
+        assert series.sum() == Decimal("14.72322001")
+        assert series.max(skipna=False) is None
+        assert pd.Series(self.array[1:2]).sum() == Decimal("0")
+        assert series.mean() == Decimal("3.6808050025")
+        assert series.median() == Decimal("1.750000005")
+        assert series.var() == (series.std() ** 2).quantize(series.var())
+        assert pd.Series(self.array[1:2]).mean() is None
+
+        with self.assertRaises(TypeError):
+            series.any()
+
+    def test_setitem(self):
+        series = pd.Series(self.array)
+
+        assert series.fillna(Decimal("0")).tolist()[:2] == [Decimal("12.22322"), Decimal("0")]
+        assert series.where(series.notna(), "7.5").iloc[1] == Decimal("7.5")
+        assert series.iloc[1] is None
+
+        series.iloc[1] = "2"
+        series.loc[[4, 0]] = [Decimal("4"), None]
+        series[series == Decimal("-1")] = Decimal("1")
+
+        assert series.tolist() == [None, Decimal("2"), Decimal("1"), Decimal("3.5"), Decimal("4")]
+        assert series.dtype == DecimalDtype()
+
+    def test_value_counts(self):
+        series = pd.Series(DecimalArray._from_sequence(["1", None, "2.5", "1"]))
+
+        assert series.value_counts().to_dict() == {Decimal("1"): 2, Decimal("2.5"): 1}
+        assert series.value_counts(dropna=False).sum() == 4
+
+    def test_parquet_round_trip(self):
+        df = pd.DataFrame({"D1": self.array})
+
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "decimal.parquet")
+            df.to_parquet(file)
+
+            table = pq.read_table(file)
+
+        assert table.schema.field("D1").type == pa.decimal128(28, 8)
+        assert table.to_pandas()["D1"].iloc[0] == Decimal("12.22322")
+        assert table.to_pandas(types_mapper={pa.decimal128(28, 8): DecimalDtype()}.get)["D1"].dtype == DecimalDtype()
@@ -0,0 +1,69 @@
+import datetime
+from unittest import TestCase
+
+import pandas as pd
+from pandas import DataFrame
+
+from dealpipe.schema.hashing import ALGORITHMS, UnsupportedHashAlgorithm, encode_rows, hash_rows
+
+INPUT = DataFrame(
+    {
+        "DealName": ["deal", "other deal", "", None],
+        "D1": ["0.3", "12", "-1.5", "7"],
+        "D2": [None, 1.25, 3.0, float("nan")],
+        "CompanyId": [1, 2, 3, 4],
+        "AsOfDate": pd.to_datetime(["2021-01-01", "2021-01-02 10:00", None, "2021-01-04"]),
+    }
+)
+
+
+class TestHashing(TestCase):
+    def test_encode_rows(self):
+        encoded = encode_rows(INPUT)
+
+        assert encoded.iloc[0] == "deal\x1f0.3\x1f\x1e\x1f1\x1f2021-01-01T00:00:00.000000"
+        assert encoded.iloc[2] == "\x1f-1.5\x1f3.0\x1f3\x1f\x1e"
+        assert encoded.iloc[3] == "\x1e\x1f7\x1f\x1e\x1f4\x1f2021-01-04T00:00:00.000000"
+
+    def test_hash_rows_md5(self):
+        hashes = hash_rows(INPUT, "md5")
+
+        assert hashes.iloc[0] == "0fccfee760975f2e9ddad0b5e2f7f4e1"
+        assert hashes.index.equals(INPUT.index)
+
+    def test_hash_rows_digest_length(self):
+        lengths = {"md5": 32, "blake2b": 32, "siphash64": 16, "siphash128": 32}
+
+        for algorithm in ALGORITHMS:
+            hashes = hash_rows(INPUT, algorithm)
+
+            assert hashes.str.len().eq(lengths[algorithm]).all(), algorithm
+            assert hashes.is_unique, algorithm
+
+    def test_hash_rows_chunked(self):
+        for algorithm in ALGORITHMS:
+            full = hash_rows(INPUT, algorithm)
+            chunked = pd.concat([hash_rows(INPUT.iloc[:1], algorithm), hash_rows(INPUT.iloc[1:], algorithm)])
+
+            assert full.equals(chunked), algorithm
+
+    def test_hash_rows_ignores_index(self):
+        reindexed = INPUT.set_index(pd.Index([10, 11, 12, 13]))
+
+        assert hash_rows(INPUT).tolist() == hash_rows(reindexed).tolist()
+
+    def test_hash_rows_null_differs_from_empty(self):
+        df = DataFrame({"DealName": ["", None]})
+
+        hashes = hash_rows(df)
+
+        assert hashes.iloc[0] != hashes.iloc[1]
+
+    def test_hash_rows_unsupported(self):
+        with self.assertRaises(UnsupportedHashAlgorithm):
+            hash_rows(INPUT, "sha1024")
+
+    def test_hash_rows_datetime_value(self):
+        df = DataFrame({"AsOfDate": [datetime.datetime(2020, 1, 1)]})
+
+        assert encode_rows(df).iloc[0] == "2020-01-01T00:00:00.000000"
@@ -1,9 +1,13 @@
+import pickle
 from unittest import TestCase
 
+import pandas as pd
 from pandas import DataFrame
+from pandera.errors import SchemaError
 
-from dealpipe.lookups import LookupDict
-from dealpipe.schema import InputSchema, validate_input
+from dealpipe.lookups import LookupDict, build_lookup_index, build_lookups
+from dealpipe.reader import read
+from dealpipe.schema import INPUT_DTYPES, InputSchema, input_schema, validate_input
 
 LOOKUPS: LookupDict = {"companies": {1: "Microsoft"}, "currencies": {"USD"}, "countries": {"USA"}}
 VALID_INPUT = DataFrame(
@@ -29,6 +33,14 @@ class TestValidateInput(TestCase):
         valid, _ = validate_input(VALID_INPUT, LOOKUPS)
         assert valid
 
+    def test_null_optional_decimals_after_pickling(self):
+        """Partitions reach the validation workers pickled, nullable decimals must still accept nulls"""
+        input_df = VALID_INPUT.assign(**{column: None for column in ("D2", "D3", "D4", "D5")})
+
+        valid, _ = validate_input(pickle.loads(pickle.dumps(input_df)), LOOKUPS)
+
+        assert valid
+
     def test_empty_deal_name(self):
         input_df = VALID_INPUT.copy(deep=True)
         input_df[InputSchema.deal_name] = [""]
@@ -77,6 +89,32 @@ class TestValidateInput(TestCase):
 
         assert not valid
 
+    def test_d1_too_many_integer_digits(self):
+        input_df = VALID_INPUT.copy(deep=True)
+        input_df[InputSchema.d1] = ["100000000000000000000"]
+
+        valid, errors = validate_input(input_df, LOOKUPS)
+
+        assert not valid
+        assert errors["check"].tolist() == ["fits_decimal"]
+
+    def test_d1_too_many_decimal_places(self):
+        input_df = VALID_INPUT.copy(deep=True)
+        input_df[InputSchema.d1] = ["0.123456789"]
+
+        valid, errors = validate_input(input_df, LOOKUPS)
+
+        assert not valid
+        assert errors["check"].tolist() == ["fits_decimal"]
+
+    def test_d1_exponent_notation(self):
+        input_df = VALID_INPUT.copy(deep=True)
+        input_df[InputSchema.d1] = ["1e-05"]
+
+        valid, _ = validate_input(input_df, LOOKUPS)
+
+        assert valid
+
     def test_empty_d2(self):
         input_df = VALID_INPUT.copy(deep=True)
         input_df[InputSchema.d2] = [""]
@@ -244,3 +282,99 @@ class TestValidateInput(TestCase):
         valid, _ = validate_input(input_df, LOOKUPS)
 
         assert not valid
+
+
+class TestInputSchema(TestCase):
+    def test_lookups_bound_per_schema(self):
+        usa_schema = input_schema(build_lookup_index(LOOKUPS))
+        irl_schema = input_schema(build_lookup_index({**LOOKUPS, "countries": {"IRL"}}))
+
+        usa_schema.validate(VALID_INPUT)
+        with self.assertRaises(SchemaError):
+            irl_schema.validate(VALID_INPUT)
+
+    def test_lookup_errors(self):
+        input_df = DataFrame([VALID_INPUT.iloc[0]] * 2).reset_index(drop=True)
+        input_df[InputSchema.country_code] = ["IRL", "USA"]
+        input_df[InputSchema.currency_code] = ["USD", "GBP"]
+        input_df[InputSchema.company_id] = ["1", "5"]
+
+        valid, errors = validate_input(input_df, LOOKUPS)
+
+        assert not valid
+        assert errors[["column", "check", "failure_case", "index"]].values.tolist() == [
+            [InputSchema.country_code, "Country code not allowed.", "IRL", 0],
+            [InputSchema.currency_code, "Currency code not allowed.", "GBP", 1],
+            [InputSchema.company_id, "Company not allowed.", 5, 1],
+        ]
+
+
+class TestValidateInputPartitioned(TestCase):
+    def setUp(self):
+        self.input_df = pd.concat([VALID_INPUT] * 6, ignore_index=True)
+
+    def test_valid_input(self):
+        valid, valid_df = validate_input(self.input_df, LOOKUPS, workers=2, partition_size=4)
+
+        assert valid
+        assert valid_df.equals(validate_input(self.input_df, LOOKUPS)[1])
+
+    def test_failure_cases_match_sequential(self):
+        self.input_df.loc[1, InputSchema.d1] = "invalid"
+        self.input_df.loc[4, InputSchema.d1] = "0.123456789"
+        self.input_df.loc[5, InputSchema.deal_name] = None
+        self.input_df.loc[0, InputSchema.country_code] = "US"
+        self.input_df.loc[3, InputSchema.country_code] = "GBR"
+
+        valid, errors = validate_input(self.input_df, LOOKUPS, workers=3, partition_size=2)
+
+        assert not valid
+        assert errors.equals(validate_input(self.input_df, LOOKUPS)[1])
+        assert errors["index"].tolist() == [5, 1, 0]
+
+    def test_whole_column_failures_reported_once(self):
+        self.input_df.loc[1, InputSchema.company_id] = "invalid"
+        self.input_df.loc[4, InputSchema.company_id] = "2"
+        self.input_df.drop(InputSchema.d3, axis="columns", inplace=True)
+
+        valid, errors = validate_input(self.input_df, LOOKUPS, workers=3, partition_size=2)
+
+        assert not valid
+        assert errors.equals(validate_input(self.input_df, LOOKUPS)[1])
+        assert errors["check"].tolist() == ["column_in_dataframe", "coerce_dtype('int32')", "coerce_dtype('int32')"]
+
+    def test_null_optional_decimals(self):
+        """Every worker gets a pickled partition, nulls in all of D2-D5 must stay valid"""
+        input_df = self.input_df.assign(**{column: None for column in ("D2", "D3", "D4", "D5")})
+
+        valid, valid_df = validate_input(input_df, LOOKUPS, workers=2, partition_size=3)
+
+        assert valid
+        assert len(valid_df) == 6
+
+
+class TestValidateInputPartitionedSamples(TestCase):
+    """merge_failure_cases mirrors the order in which the installed pandera runs its column steps, the sample files
+    hit most of those steps, so a pandera upgrade that changes the order fails here"""
+
+    def setUp(self):
+        self.lookups = build_lookups("files/lookups.csv")
+
+    def assert_matches_sequential(self, file: str):
+        input_df = read(file, dtype=INPUT_DTYPES)
+        expected_valid, expected = validate_input(input_df, self.lookups)
+
+        for partition_size in (1, 2, 3):
+            valid, errors = validate_input(input_df, self.lookups, workers=2, partition_size=partition_size)
+
+            assert valid == expected_valid
+            pd.testing.assert_frame_equal(errors, expected)
+
+    def test_invalid_csv(self):
+        self.assert_matches_sequential("files/invalid.csv")
+
+    def test_invalid_xlsx(self):
+        self.assert_matches_sequential("files/invalid.xlsx")
+
+    def test_invalid_yaml(self):
+        self.assert_matches_sequential("files/invalid.yaml")
@@ -3,21 +3,24 @@ from decimal import Decimal
 from unittest import TestCase
 
 import numpy as np
+import pandas as pd
 from pandas import DataFrame
 
 from dealpipe.lookups import LookupDict
-from dealpipe.schema import InputSchema, OutputSchema, transform
+from dealpipe.metadata import profile
+from dealpipe.schema import InputSchema, OutputSchema, transform, transform_compact
+from dealpipe.schema.dtypes import DecimalDtype
 
 LOOKUPS: LookupDict = {"companies": {1: "Microsoft"}, "currencies": {"USD"}, "countries": {"USA"}}
 VALID_INPUT = DataFrame(
     [
         {
             InputSchema.deal_name: "deal",
-            InputSchema.d1: "129389.3232453454345333387439283",
+            InputSchema.d1: "129389.32324534",
             InputSchema.d2: None,
             InputSchema.d3: 1,
             InputSchema.d4: "1",
-            InputSchema.d5: 129389.3232453454345333387439283,
+            InputSchema.d5: 129389.32324534,
             InputSchema.is_active: "Yes",
             InputSchema.country_code: "USA",
             InputSchema.currency_code: "USD",
@@ -29,13 +32,18 @@ VALID_INPUT = DataFrame(
 
 class TestTransform(TestCase):
     def transform(self):
-        InputSchema.set_lookups(LOOKUPS)
         return transform(VALID_INPUT, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
 
     def test_transform_decimal_string(self):
         transformed = self.transform()
 
-        assert transformed[OutputSchema.d1].iloc[0] == Decimal("129389.3232453454345333387439283")
+        assert transformed[OutputSchema.d1].iloc[0] == Decimal("129389.32324534")
+
+    def test_transform_decimal_dtype(self):
+        transformed = self.transform()
+
+        for column in (OutputSchema.d1, OutputSchema.d2, OutputSchema.d3, OutputSchema.d4, OutputSchema.d5):
+            assert transformed[column].dtype == DecimalDtype(28, 8)
 
     def test_transform_decimal_null(self):
         transformed = self.transform()
@@ -55,7 +63,14 @@ class TestTransform(TestCase):
     def test_transform_decimal_float(self):
         transformed = self.transform()
 
-        assert transformed[OutputSchema.d5].iloc[0] == Decimal("129389.32324534544")
+        assert transformed[OutputSchema.d5].iloc[0] == Decimal("129389.32324534")
+
+    def test_transform_decimal_padded(self):
+        input_df = VALID_INPUT.assign(**{InputSchema.d1: " 12"})
+
+        transformed = transform(input_df, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
+
+        assert transformed[OutputSchema.d1].iloc[0] == Decimal("12")
 
     def test_transform_is_active_bool(self):
         transformed = self.transform()
@@ -85,7 +100,49 @@ class TestTransform(TestCase):
 
         assert transformed[OutputSchema.process_identifier].iloc[0] == "123"
 
+    def test_transform_row_no_from_index(self):
+        input_df = VALID_INPUT.set_index(pd.RangeIndex(5, 6))
+
+        transformed = transform(input_df, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
+
+        assert transformed[OutputSchema.row_no].tolist() == [5]
+
     def test_transform_row_hash(self):
         transformed = self.transform()
 
-        assert transformed[OutputSchema.row_hash].iloc[0] == "d99968d4e376a6da7660d6a605bc9d4d"
+        assert transformed[OutputSchema.row_hash].iloc[0] == "8456a80a87be41d07d15df7bf891f721"
+
+
+class TestTransformCompact(TestCase):
+    def transform(self, input_df: DataFrame = VALID_INPUT):
+        return transform_compact(input_df, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
+
+    def test_transform_compact_dtypes(self):
+        transformed = self.transform()
+
+        assert isinstance(transformed[OutputSchema.deal_name].dtype, pd.StringDtype)
+        for column in (
+            OutputSchema.country_code,
+            OutputSchema.currency_code,
+            OutputSchema.company_name,
+            OutputSchema.as_of_date,
+            OutputSchema.process_identifier,
+        ):
+            assert isinstance(transformed[column].dtype, pd.CategoricalDtype)
+
+    def test_transform_compact_values(self):
+        input_df = pd.concat([VALID_INPUT] * 3, ignore_index=True)
+
+        compact = self.transform(input_df)
+        expected = transform(input_df, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
+
+        assert compact.columns.tolist() == expected.columns.tolist()
+        assert compact.astype(object).equals(expected.astype(object))
+        assert compact[OutputSchema.process_identifier].cat.categories.tolist() == ["123"]
+        assert compact.memory_usage(deep=True).sum() < expected.memory_usage(deep=True).sum()
+
+    def test_transform_compact_profile(self):
+        compact = self.transform()
+        expected = transform(VALID_INPUT, "123", datetime.datetime(2020, 1, 1, 0, 0), LOOKUPS)
+
+        assert profile(compact) == profile(expected)
@@ -0,0 +1,124 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from dagster import DagsterInstance, RunRequest, SkipReason
+from dagster.core.execution.api import create_execution_plan
+from dagster.core.storage.pipeline_run import PipelineRunStatus
+from dagster.core.storage.tags import RUN_KEY_TAG
+
+from dealpipe.fingerprint import content_hash
+from dealpipe.pipelines.process_deals import VALID_CSV_PRESET, process_deals
+from dealpipe.sensors.landing import LandingSettings, landed_files, landing_run_requests
+
+
+class TestLandingSettings(TestCase):
+    def test_from_env(self):
+        settings = LandingSettings.from_env({"DEALPIPE_LANDING_DIR": "landing", "DEALPIPE_MAX_CONCURRENT_RUNS": "3"})
+
+        assert settings.directory == "landing"
+        assert settings.max_concurrent_runs == 3
+        assert settings.lookups_file == "files/lookups.csv"
+        assert LandingSettings.from_env({}).directory is None
+
+
+class TestLandingRunRequests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.instance = DagsterInstance.ephemeral()
+        self.settings = LandingSettings(self.directory.name, max_concurrent_runs=2, settle_seconds=0)
+        for number in range(3):
+            self.land(f"deals_{number}.csv", f"DealName,D1\nDeal {number},1\n", mtime=1000 + number)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def land(self, name, text, mtime):
+        file = self.root / name
+        file.write_text(text)
+        os.utime(file, (mtime, mtime))
+        return file
+
+    def add_run(self, run_key, status):
+        self.instance.create_run_for_pipeline(
+            process_deals,
+            mode="dev",
+            status=status,
+            tags={RUN_KEY_TAG: run_key},
+            run_config=VALID_CSV_PRESET.run_config,
+        )
+
+    def test_oldest_files_up_to_the_cap(self):
+        requests = list(landing_run_requests(self.instance, self.settings))
+
+        assert [request.tags["dealpipe/deals_file"] for request in requests] == [
+            str(self.root / "deals_0.csv"),
+            str(self.root / "deals_1.csv"),
+        ]
+        assert requests[0].run_key == content_hash(str(self.root / "deals_0.csv"))
+        key = requests[0].run_key
+        assert requests[0].run_config["solids"]["save_output"]["config"]["output_file"] == (
+            f"output/deals_0_{key[:12]}.parquet.gz"
+        )
+        create_execution_plan(process_deals, requests[0].run_config, mode="dev")
+
+    def test_outputs_of_similar_names_are_kept_apart(self):
+        self.directory.cleanup()
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.land("deals.2024-01-01.csv", "DealName,D1\nDeal A,1\n", mtime=1000)
+        self.land("deals.2024-01-02.csv", "DealName,D1\nDeal B,1\n", mtime=1001)
+        settings = self.settings._replace(directory=self.directory.name)
+
+        requests = list(landing_run_requests(self.instance, settings))
+
+        output_files = [request.run_config["solids"]["save_output"]["config"]["output_file"] for request in requests]
+        errors_files = [
+            request.run_config["solids"]["save_errors"]["config"]["errors_excel_file"] for request in requests
+        ]
+        assert len(set(output_files)) == 2
+        assert len(set(errors_files)) == 2
+        assert Path(output_files[0]).name.startswith("deals.2024-01-01_")
+
+    def test_runs_in_flight_count_against_the_cap(self):
+        self.add_run("other", PipelineRunStatus.STARTED)
+        self.add_run(content_hash(str(self.root / "deals_0.csv")), PipelineRunStatus.SUCCESS)
+
+        requests = list(landing_run_requests(self.instance, self.settings))
+        assert [Path(request.tags["dealpipe/deals_file"]).name for request in requests] == ["deals_1.csv"]
+
+        self.add_run("another", PipelineRunStatus.NOT_STARTED)
+        (skip,) = landing_run_requests(self.instance, self.settings)
+        assert isinstance(skip, SkipReason)
+
+    def test_requested_keys_are_looked_up_by_tag(self):
+        for number in range(5):
+            self.add_run(f"old_{number}", PipelineRunStatus.SUCCESS)
+        self.add_run(content_hash(str(self.root / "deals_1.csv")), PipelineRunStatus.SUCCESS)
+
+        with mock.patch.object(self.instance, "get_run_tags", side_effect=AssertionError("scans every run tag")):
+            requests = list(landing_run_requests(self.instance, self.settings))
+
+        names = [Path(request.tags["dealpipe/deals_file"]).name for request in requests]
+        assert names == ["deals_0.csv", "deals_2.csv"]
+
+    def test_duplicates_are_requested_once(self):
+        self.land("deals_copy.csv", (self.root / "deals_0.csv").read_text(), mtime=999)
+        settings = self.settings._replace(max_concurrent_runs=10)
+
+        requests = list(landing_run_requests(self.instance, settings))
+
+        assert all(isinstance(request, RunRequest) for request in requests)
+        assert [Path(request.tags["dealpipe/deals_file"]).name for request in requests] == [
+            "deals_copy.csv",
+            "deals_1.csv",
+            "deals_2.csv",
+        ]
+
+    def test_files_still_being_written_are_left_out(self):
+        self.land(".deals_3.csv.part", "DealName\n", mtime=1000)
+        self.land("notes.txt", "\x00\x01", mtime=1000)
+
+        assert [file.name for file in landed_files(self.directory.name, 60, now=1060.5)] == ["deals_0.csv"]
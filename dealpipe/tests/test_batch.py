@@ -0,0 +1,79 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+
+from dealpipe import reader
+from dealpipe.batch import (
+    DuplicateOutputPath,
+    NoDealsFiles,
+    concat_sources,
+    expand_files,
+    split_outputs,
+    validate_batch,
+)
+from dealpipe.lookups import build_lookups
+
+
+class TestExpandFiles(TestCase):
+    def test_patterns_and_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            for name in ("b.csv", "a.csv", "c.yaml"):
+                (root / name).write_text("DealName\n")
+
+            files = expand_files([str(root / "*.csv"), str(root / "c.yaml"), str(root / "a.csv")])
+
+            assert [Path(file).name for file in files] == ["a.csv", "b.csv", "c.yaml"]
+            with self.assertRaises(NoDealsFiles):
+                expand_files([str(root / "*.xlsx")])
+
+
+class TestValidateBatch(TestCase):
+    def setUp(self):
+        self.lookups = build_lookups("files/lookups.csv")
+        valid = reader.read("files/valid.csv")
+        self.frames = [("first.csv", valid.iloc[:2]), ("second.csv", valid.iloc[2:].reset_index(drop=True))]
+
+    def test_valid_batch(self):
+        valid_df, errors_df = validate_batch(concat_sources(self.frames), self.lookups)
+
+        assert errors_df is None
+        assert valid_df.index.tolist() == [0, 1, 0, 1]
+        assert valid_df["SourceFile"].tolist() == ["first.csv", "first.csv", "second.csv", "second.csv"]
+        assert valid_df.columns[-1] == "SourceFile"
+
+    def test_invalid_file_is_reported_on_its_own(self):
+        invalid = reader.read("files/invalid.csv")
+        valid_df, errors_df = validate_batch(concat_sources([*self.frames, ("invalid.csv", invalid)]), self.lookups)
+        _, expected_errors = validate_batch(concat_sources([("invalid.csv", invalid)]), self.lookups)
+
+        assert valid_df["SourceFile"].unique().tolist() == ["first.csv", "second.csv"]
+        pd.testing.assert_frame_equal(errors_df, expected_errors)
+        assert set(errors_df["SourceFile"]) == {"invalid.csv"}
+
+
+class TestSplitOutputs(TestCase):
+    def test_split_by_source(self):
+        df = pd.DataFrame({"DealName": ["a", "b", "c"], "SourceFile": ["in/x.csv", "in/y.csv.gz", "in/x.csv"]})
+
+        outputs = [
+            (file, source, frame["DealName"].tolist()) for file, source, frame in split_outputs(df, "{source}.pq")
+        ]
+
+        assert outputs == [("x.pq", "x", ["a", "c"]), ("y.pq", "y", ["b"])]
+        assert [file for file, _, _ in split_outputs(df, "all.pq")] == ["all.pq"]
+
+    def test_split_keeps_dotted_names_apart(self):
+        df = pd.DataFrame({"DealName": ["a", "b"], "SourceFile": ["in/feed.2024-01-01.csv", "in/feed.2024-01-02.csv"]})
+
+        files = [file for file, _, _ in split_outputs(df, "out/{source}.parquet")]
+
+        assert files == ["out/feed.2024-01-01.parquet", "out/feed.2024-01-02.parquet"]
+
+    def test_split_duplicate_output_path(self):
+        df = pd.DataFrame({"DealName": ["a", "b"], "SourceFile": ["in/a/feed.csv", "in/b/feed.csv"]})
+
+        with self.assertRaises(DuplicateOutputPath):
+            list(split_outputs(df, "out/{source}.parquet"))
@@ -0,0 +1,63 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from dealpipe.cache import LookupCache
+
+LOOKUPS = {"companies": {1: "A"}, "currencies": {"EUR"}, "countries": {"IRL"}}
+
+
+class TestLookupCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.file = self.root / "lookups.csv"
+        self.file.write_text("CompanyId,CompanyName\n1,A\n")
+        self.cache = LookupCache(str(self.root / "cache"), max_entries=2)
+        self.build = mock.Mock(return_value=LOOKUPS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_miss_then_hit(self):
+        assert self.cache.get_or_build(str(self.file), self.build) == (LOOKUPS, False)
+        assert self.cache.get_or_build(str(self.file), self.build) == (LOOKUPS, True)
+        self.build.assert_called_once_with(str(self.file))
+
+    def test_touched_file_is_a_hit(self):
+        self.cache.put(str(self.file), LOOKUPS)
+        stat = self.file.stat()
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert self.cache.get(str(self.file)) == LOOKUPS
+
+    def test_changed_file_is_a_miss(self):
+        self.cache.put(str(self.file), LOOKUPS)
+        stat = self.file.stat()
+        self.file.write_text("CompanyId,CompanyName\n1,B\n")
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert self.cache.get(str(self.file)) is None
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.cache.put(str(self.file), LOOKUPS)
+        next((self.root / "cache").glob("*.lookups")).write_bytes(b"garbage")
+
+        assert self.cache.get(str(self.file)) is None
+
+    def test_evicts_least_recently_used(self):
+        files = []
+        for i in range(3):
+            file = self.root / f"lookups_{i}.csv"
+            file.write_text(str(i))
+            files.append(file)
+            self.cache.put(str(file), LOOKUPS)
+            entry = self.cache._entry_path(str(file))
+            os.utime(entry, ns=(i * 10**9, i * 10**9))
+
+        self.cache._evict()
+
+        assert self.cache.get(str(files[0])) is None
+        assert self.cache.get(str(files[1])) == LOOKUPS
+        assert self.cache.get(str(files[2])) == LOOKUPS
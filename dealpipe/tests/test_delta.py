@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+
+from dealpipe.delta import (
+    HashAlgorithmMismatch,
+    RowEncodingMismatch,
+    detect_changes,
+    next_row_hashes,
+    read_row_hashes,
+    write_row_hashes,
+)
+from dealpipe.schema.transform import hash_input_rows
+
+DEALS = pd.DataFrame(
+    {
+        "DealName": ["Glass", "Surface Pro", "Kindle"],
+        "D1": ["1.5", "2", None],
+        "IsActive": ["Yes", "No", "Yes"],
+        "CompanyId": ["1", "2", "3"],
+    }
+)
+
+
+class TestDetectChanges(TestCase):
+    def test_first_run_emits_every_row(self):
+        delta = detect_changes(DEALS, pd.Index([]))
+
+        pd.testing.assert_frame_equal(delta.changed, DEALS)
+        assert delta.deleted.empty
+        assert delta.unchanged.empty
+
+    def test_unchanged_rows_are_skipped(self):
+        previous = pd.Index(hash_input_rows(DEALS))
+        df = DEALS.copy()
+        df.loc[1, "D1"] = "3"
+        df = df.drop(index=0)
+
+        delta = detect_changes(df, previous)
+
+        assert delta.changed.index.tolist() == [1]
+        assert delta.changed["D1"].tolist() == ["3"]
+        assert delta.deleted["RowHash"].tolist() == [previous[0], previous[1]]
+        assert delta.unchanged.tolist() == [previous[2]]
+
+    def test_next_row_hashes_leave_out_rejected_rows(self):
+        hashes = hash_input_rows(DEALS)
+        delta = detect_changes(DEALS, pd.Index(hashes[:1]))
+
+        # the second row was rejected by the validation
+        assert next_row_hashes(delta.unchanged, hashes[2:]).tolist() == [hashes[0], hashes[2]]
+
+    def test_run_columns_are_ignored(self):
+        previous = pd.Index(hash_input_rows(DEALS))
+        df = DEALS.assign(RowNo=[5, 6, 7], ProcessIdentifier="run", AsOfDate=pd.Timestamp("2021-01-01"))
+
+        assert detect_changes(df, previous).changed.empty
+
+
+class TestRowHashesFile(TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "state" / "row_hashes.parquet")
+
+            assert read_row_hashes(file).empty
+            write_row_hashes(pd.Index(["a", "b"]), file)
+
+            assert read_row_hashes(file).tolist() == ["a", "b"]
+            assert [path.name for path in Path(file).parent.iterdir()] == ["row_hashes.parquet"]
+
+    def test_rejects_files_without_encoding_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "deals.parquet")
+            pd.DataFrame({"DealName": ["Glass", "Kindle"], "RowHash": ["a", "a"]}).to_parquet(file)
+
+            with self.assertRaises(RowEncodingMismatch):
+                read_row_hashes(file)
+
+    def test_algorithm_mismatch_raises(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = str(Path(directory) / "row_hashes.parquet")
+            write_row_hashes(pd.Index(["a"]), file, "sha256")
+
+            assert read_row_hashes(file, "sha256").tolist() == ["a"]
+            with self.assertRaises(HashAlgorithmMismatch):
+                read_row_hashes(file, "md5")
@@ -0,0 +1,134 @@
+import json
+import pstats
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from unittest import TestCase
+
+from dealpipe.resources.instrumentation import Instrumentation, UnsupportedMetricsSink
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_measure(self):
+        with Instrumentation().measure("validate", rows_in=100) as measurement:
+            measurement.rows_out = 90
+
+        metrics = measurement.metrics()
+        assert metrics["rows_in"] == 100
+        assert metrics["rows_out"] == 90
+        assert metrics["wall_seconds"] > 0
+        assert metrics["cpu_seconds"] >= 0
+        assert metrics["peak_rss_delta_bytes"] >= 0
+        assert metrics["rows_per_second"] == 100 / metrics["wall_seconds"]
+        assert [entry.label for entry in measurement.metadata_entries()] == list(metrics)
+
+    def test_measure_without_rows(self):
+        with Instrumentation().measure("save_output") as measurement:
+            pass
+
+        assert "rows_per_second" not in measurement.metrics()
+
+    def test_jsonl_sink(self):
+        path = self.root / "metrics.jsonl"
+        instrumentation = Instrumentation("jsonl", str(path), run_id="run")
+
+        for solid in ["load_deals", "validate"]:
+            with instrumentation.measure(solid, rows_in=10):
+                pass
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(record["run_id"], record["solid"], record["rows_in"]) for record in records] == [
+            ("run", "load_deals", 10),
+            ("run", "validate", 10),
+        ]
+
+    def test_prometheus_sink(self):
+        path = self.root / "metrics" / "dealpipe.prom"
+        instrumentation = Instrumentation("prometheus", str(path))
+
+        for rows in [10, 20]:
+            with instrumentation.measure("validate", rows_in=rows):
+                pass
+        with instrumentation.measure("transform", rows_in=5):
+            pass
+
+        lines = path.read_text().splitlines()
+        assert "# TYPE dealpipe_solid_rows_in gauge" in lines
+        assert 'dealpipe_solid_rows_in{solid="validate"} 20' in lines
+        assert 'dealpipe_solid_rows_in{solid="transform"} 5' in lines
+        assert len([line for line in lines if line.startswith("dealpipe_solid_wall_seconds")]) == 2
+
+    def test_prometheus_keeps_latest_run(self):
+        path = self.root / "dealpipe.prom"
+
+        with self.assertRaises(ValueError):
+            with Instrumentation("prometheus", str(path), run_id="first").measure("validate", rows_in=10):
+                raise ValueError("invalid")
+        with Instrumentation("prometheus", str(path), run_id="second").measure("validate", rows_in=20):
+            pass
+
+        lines = path.read_text().splitlines()
+        assert 'dealpipe_solid_rows_in{solid="validate"} 20' in lines
+        assert len([line for line in lines if line.startswith("dealpipe_solid_rows_in")]) == 1
+        assert not any("run_id" in line or "dealpipe_solid_failed" in line for line in lines)
+
+    def test_failed_solid_is_recorded(self):
+        path = self.root / "metrics.jsonl"
+        instrumentation = Instrumentation(
+            "jsonl", str(path), run_id="run", profile_solids=["validate"], profile_directory=str(self.root)
+        )
+
+        with self.assertRaises(ValueError):
+            with instrumentation.measure("validate", rows_in=10):
+                raise ValueError("invalid")
+
+        (record,) = [json.loads(line) for line in path.read_text().splitlines()]
+        assert record["failed"] == 1
+        assert record["wall_seconds"] >= 0
+        assert (self.root / "run" / "validate.pstats").exists()
+        assert sys.getprofile() is None
+
+    def test_unsupported_sink(self):
+        with self.assertRaises(UnsupportedMetricsSink):
+            Instrumentation("statsd", "localhost")
+
+        with self.assertRaises(UnsupportedMetricsSink):
+            Instrumentation("jsonl")
+
+    def test_profile_selected_solids(self):
+        instrumentation = Instrumentation(
+            run_id="run",
+            profile_solids=["validate"],
+            profile_directory=str(self.root),
+            trace_memory=True,
+            profile_top=5,
+        )
+
+        with instrumentation.measure("validate") as measurement:
+            values = sorted(range(1000), reverse=True)
+        with instrumentation.measure("transform") as unprofiled:
+            pass
+
+        assert values[0] == 999
+        assert unprofiled.materializations == []
+        (materialization,) = measurement.materializations
+        assert materialization.asset_key.path == ["profile_validate"]
+        labels = [entry.label for entry in materialization.metadata_entries]
+        assert labels == [
+            "cprofile_summary_path",
+            "cprofile_summary",
+            "pstats",
+            "tracemalloc_summary_path",
+            "tracemalloc_summary",
+        ]
+        assert pstats.Stats(str(self.root / "run" / "validate.pstats")).total_calls > 0
+        assert "peak traced memory" in (self.root / "run" / "validate.tracemalloc.txt").read_text()
+        assert not tracemalloc.is_tracing()
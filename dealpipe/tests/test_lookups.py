@@ -2,7 +2,7 @@ from unittest import TestCase, mock
 
 from pandas import DataFrame
 
-from dealpipe.lookups import build_lookups
+from dealpipe.lookups import build_lookup_index, build_lookups, lookups_version
 
 LOOKUP_DATA = {
     "CompanyId": [1, 2, 3, None],
@@ -21,3 +21,19 @@ class TestLookups(TestCase):
         lookup = build_lookups("lookups.csv")
 
         assert lookup == {"companies": {1: "A", 2: "B"}, "currencies": {"EUR", "USD"}, "countries": {"IRL", "USA"}}
+
+    def test_build_lookup_index(self):
+        lookup = {"companies": {2: "B", 1: "A"}, "currencies": {"USD", "EUR"}, "countries": {"USA", "IRL"}}
+
+        index = build_lookup_index(lookup)
+
+        assert index.companies.tolist() == [1, 2]
+        assert index.currencies.tolist() == ["EUR", "USD"]
+        assert index.countries.tolist() == ["IRL", "USA"]
+
+    def test_lookups_version(self):
+        lookup = {"companies": {2: "B", 1: "A"}, "currencies": {"USD", "EUR"}, "countries": {"USA", "IRL"}}
+        reordered = {"companies": {1: "A", 2: "B"}, "currencies": {"EUR", "USD"}, "countries": {"IRL", "USA"}}
+
+        assert lookups_version(lookup) == lookups_version(reordered)
+        assert lookups_version(lookup) != lookups_version({**lookup, "companies": {1: "A", 2: "C"}})
@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import pandas as pd
+from pandas import DataFrame
+
+from dealpipe.metadata import UnsupportedMetadataMode, errors_profile, metadata_entries, profile
+from dealpipe.schema.dtypes import DecimalArray
+
+DEALS = DataFrame(
+    {
+        "DealName": ["a", "b", None, "d"],
+        "D1": DecimalArray._from_sequence(["1.5", None, "2", "3"]),
+        "CountryCode": ["USA", "USA", "IRL", None],
+        "AsOfDate": pd.to_datetime(["2021-01-01", "2021-01-02", "2021-01-03", "2021-01-04"]),
+    }
+)
+ERRORS = DataFrame(
+    {
+        "column": ["D1", "D1", "IsActive", None],
+        "check": ["is_numeric", "is_numeric", "is_active", "column_in_dataframe"],
+        "failure_case": ["x", "y", "Maybe", "D3"],
+        "index": [1, 2, 1, None],
+    }
+)
+
+
+class TestMetadata(TestCase):
+    def test_profile(self):
+        result = profile(DEALS)
+
+        assert result["rows"] == 4
+        assert result["columns"]["DealName"] == {"nulls": 1, "min": "a", "max": "d"}
+        assert result["columns"]["D1"] == {"nulls": 1, "min": "1.50000000", "max": "3.00000000"}
+        assert result["columns"]["CountryCode"] == {"nulls": 1, "min": "IRL", "max": "USA", "distinct": 2}
+        assert result["columns"]["AsOfDate"]["max"] == "2021-01-04 00:00:00"
+
+    def test_profile_extension_without_reductions(self):
+        result = profile(DataFrame({"Name": pd.array(["b", None, "a"], dtype="string")}))
+
+        assert result["columns"]["Name"] == {"nulls": 1, "min": "a", "max": "b"}
+
+    def test_profile_categoricals_by_used_categories(self):
+        unordered = pd.Categorical(["m", None, "z", "m"], categories=["z", "a", "m"])
+        ordered = pd.Categorical(["high", None, "high", "high"], categories=["low", "high", "top"], ordered=True)
+
+        result = profile(DataFrame({"CountryCode": unordered, "Level": ordered, "Empty": pd.Categorical([None] * 4)}))
+
+        assert result["columns"]["CountryCode"] == {"nulls": 1, "min": "m", "max": "z", "distinct": 2}
+        assert result["columns"]["Level"] == {"nulls": 1, "min": "high", "max": "high"}
+        assert result["columns"]["Empty"] == {"nulls": 4, "min": None, "max": None}
+
+    def test_profile_mixed_types(self):
+        result = profile(DataFrame({"D1": ["1.5", 2, None]}))
+
+        assert result["columns"]["D1"]["nulls"] == 1
+        assert "min" not in result["columns"]["D1"]
+        assert "not supported" in result["columns"]["D1"]["min_max_error"]
+
+    def test_errors_profile(self):
+        result = errors_profile(ERRORS)
+
+        assert result == {
+            "failure_cases": 4,
+            "checks": [
+                {"column": "D1", "check": "is_numeric", "count": 2},
+                {"column": "IsActive", "check": "is_active", "count": 1},
+                {"column": None, "check": "column_in_dataframe", "count": 1},
+            ],
+        }
+
+    def test_metadata_entries_profile(self):
+        entries = metadata_entries(DEALS, "Deals", sample_rows=2)
+
+        assert [entry.label for entry in entries] == ["Deals profile", "Deals sample"]
+        assert entries[1].entry_data.md_str.count("\n") == 3
+
+    def test_metadata_entries_modes(self):
+        assert metadata_entries(DEALS, "Deals", "none") == []
+        assert metadata_entries(DEALS, "Deals", "full")[0].entry_data.md_str == DEALS.to_markdown()
+        assert len(metadata_entries(DEALS, "Deals", sample_rows=0)) == 1
+
+        with self.assertRaises(UnsupportedMetadataMode):
+            metadata_entries(DEALS, "Deals", "everything")
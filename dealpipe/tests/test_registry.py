@@ -0,0 +1,75 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from dagster import AssetMaterialization, EventMetadata
+
+import dealpipe
+from dealpipe.registry import FingerprintRegistry, source_version
+
+MATERIALIZATION = AssetMaterialization(
+    asset_key="output_parquet_file", metadata={"output_parquet_file_path": EventMetadata.path("output/deals.parquet")}
+)
+
+
+class TestFingerprintRegistry(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.file = self.root / "deals.csv"
+        self.file.write_text("DealName\nGlass\n")
+        self.registry = FingerprintRegistry(str(self.root / "registry" / "fingerprints.sqlite"), "1.0")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_and_find(self):
+        fingerprint = self.registry.fingerprint([str(self.file)], "lookups")
+        assert self.registry.find(fingerprint) is None
+
+        self.registry.record(fingerprint, "run", [MATERIALIZATION])
+        processed = self.registry.find(fingerprint)
+
+        assert processed.run_id == "run"
+        assert processed.materializations == [MATERIALIZATION]
+
+    def test_same_content_under_another_name(self):
+        self.registry.record(self.registry.fingerprint([str(self.file)], "lookups"), "run", [])
+        copy = self.root / "deals_retry.csv"
+        copy.write_bytes(self.file.read_bytes())
+
+        assert self.registry.find(self.registry.fingerprint([str(copy)], "lookups")).run_id == "run"
+
+    def test_changed_inputs_are_not_found(self):
+        self.registry.record(self.registry.fingerprint([str(self.file)], "lookups"), "run", [])
+
+        assert self.registry.find(self.registry.fingerprint([str(self.file)], "other lookups")) is None
+        other_code = FingerprintRegistry(str(self.registry.path), "2.0")
+        assert other_code.find(other_code.fingerprint([str(self.file)], "lookups")) is None
+        self.file.write_text("DealName\nKindle\n")
+        assert self.registry.find(self.registry.fingerprint([str(self.file)], "lookups")) is None
+
+    def test_batch_in_any_order(self):
+        other = self.root / "deals_2.csv"
+        other.write_text("DealName\nKindle\n")
+        fingerprint = self.registry.fingerprint([str(self.file), str(other)], "lookups")
+
+        assert fingerprint == self.registry.fingerprint([str(other), str(self.file)], "lookups")
+        assert fingerprint.size == self.file.stat().st_size + other.stat().st_size
+        assert fingerprint != self.registry.fingerprint([str(self.file)], "lookups")
+
+
+class TestSourceVersion(TestCase):
+    def test_changes_with_the_sources(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / "tests").mkdir()
+            (root / "delta.py").write_text("ROW_HASH = 'RowHash'\n")
+            (root / "tests" / "test_delta.py").write_text("")
+            version = source_version(directory)
+
+            (root / "tests" / "test_delta.py").write_text("assert True\n")
+            assert source_version.__wrapped__(directory) == version
+            (root / "delta.py").write_text("ROW_HASH = 'Hash'\n")
+            assert source_version.__wrapped__(directory) != version
+            assert version.startswith(f"{dealpipe.__version__}+")
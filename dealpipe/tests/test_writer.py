@@ -0,0 +1,136 @@
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase, mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas import DataFrame
+
+from dealpipe.writer import UnsupportedErrorFormat, write_errors, write_parquet
+
+DATA = DataFrame({"DealName": ["a", "b", "c", "d", "e"], "Currency": ["EUR", "EUR", "USD", "EUR", None]})
+
+
+class TestWriteParquet(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = str(Path(self.directory.name) / "output" / "deals.parquet")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_frame(self):
+        rows = write_parquet(DATA, self.file)
+
+        assert rows == 5
+        assert pd.read_parquet(self.file).equals(DATA)
+        assert pq.ParquetFile(self.file).metadata.row_group(0).column(0).compression == "GZIP"
+
+    def test_write_chunks(self):
+        chunks = (DATA.iloc[start : start + 2] for start in range(0, len(DATA), 2))
+
+        rows = write_parquet(chunks, self.file, "zstd", compression_level=3, row_group_size=1)
+
+        metadata = pq.ParquetFile(self.file).metadata
+        assert rows == 5
+        assert metadata.num_row_groups == 5
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+        assert pd.read_parquet(self.file).equals(DATA)
+
+    def test_dictionary_and_statistics_columns(self):
+        write_parquet(DATA, self.file, "snappy", use_dictionary=["Currency"], write_statistics=["Currency"])
+
+        row_group = pq.ParquetFile(self.file).metadata.row_group(0)
+        assert not row_group.column(0).has_dictionary_page
+        assert row_group.column(1).has_dictionary_page
+        assert not row_group.column(0).is_stats_set
+        assert row_group.column(1).is_stats_set
+
+    def test_write_compact_frame(self):
+        compact = DATA.assign(DealName=DATA["DealName"].astype("string"), Currency=DATA["Currency"].astype("category"))
+        chunks = (compact.iloc[start : start + 2] for start in range(0, len(compact), 2))
+
+        write_parquet(chunks, self.file)
+
+        assert pd.read_parquet(self.file).equals(DATA)
+
+
+ERRORS = DataFrame(
+    {
+        "schema_context": ["Column"] * 5,
+        "column": ["D1", "D1", "D1", "IsActive", "CompanyId"],
+        "check": ["is_numeric", "is_numeric", "is_numeric", "is_active", "coerce_dtype('int32')"],
+        "check_number": [0, 0, 0, 0, None],
+        "failure_case": ["x", "y", Decimal("1.5"), "Maybe", "object"],
+        "index": [1, 2, 3, 1, None],
+    }
+)
+
+
+class TestWriteErrors(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_xlsx(self):
+        file = str(self.root / "errors.xlsx")
+
+        write_errors(ERRORS, file)
+
+        errors = pd.read_excel(file, sheet_name=None)
+        assert list(errors) == ["Errors"]
+        assert errors["Errors"]["failure_case"].tolist() == ["x", "y", "1.5", "Maybe", "object"]
+
+    def test_write_xlsx_capped(self):
+        file = str(self.root / "errors.xlsx")
+
+        write_errors(ERRORS, file, max_per_check=2)
+
+        errors = pd.read_excel(file, sheet_name=None)
+        assert errors["Errors"]["index"].tolist()[:3] == [1, 2, 1]
+        assert errors["Summary"].to_dict("list") == {
+            "column": ["D1", "IsActive", "CompanyId"],
+            "check": ["is_numeric", "is_active", "coerce_dtype('int32')"],
+            "failure_count": [3, 1, 1],
+            "written_count": [2, 1, 1],
+        }
+
+    @mock.patch("dealpipe.writer.EXCEL_MAX_ROWS", 4)
+    def test_write_xlsx_truncated(self):
+        file = str(self.root / "errors.xlsx")
+
+        written = write_errors(ERRORS, file)
+
+        errors = pd.read_excel(file, sheet_name=None)
+        assert written == 3
+        assert len(errors["Errors"]) == 3
+        assert errors["Summary"]["failure_count"].sum() == 5
+        assert errors["Summary"]["written_count"].sum() == 3
+
+    def test_write_csv_capped(self):
+        file = str(self.root / "errors.csv")
+
+        write_errors(ERRORS, file, "csv", max_per_check=1)
+
+        assert len(pd.read_csv(file)) == 3
+        assert pd.read_csv(self.root / "errors_summary.csv")["failure_count"].tolist() == [3, 1, 1]
+
+    def test_summary_keeps_dotted_names(self):
+        write_errors(ERRORS, str(self.root / "deals.2024.01.csv"), "csv", max_per_check=1)
+
+        assert (self.root / "deals.2024.01_summary.csv").exists()
+
+    def test_write_parquet(self):
+        file = str(self.root / "errors.parquet")
+
+        write_errors(ERRORS, file, "parquet")
+
+        assert pd.read_parquet(file)["failure_case"].tolist() == ["x", "y", "1.5", "Maybe", "object"]
+
+    def test_unsupported_format(self):
+        with self.assertRaises(UnsupportedErrorFormat):
+            write_errors(ERRORS, str(self.root / "errors.json"), "json")
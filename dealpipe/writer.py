@@ -1,15 +1,174 @@
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pandas import DataFrame
+from xlsxwriter import Workbook
 
+EXCEL_MAX_ROWS = 1_048_576
+ERROR_FORMATS = ("xlsx", "csv", "parquet")
+ERROR_GROUP = ["column", "check"]
 
-def write_parquet(df: DataFrame, file: str, compression="gzip"):
+
+class UnsupportedErrorFormat(Exception):
+    """Raised when errors are to be written in a format other than xlsx, csv or parquet"""
+
+
+def is_compact(df: DataFrame) -> bool:
+    return any(isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)) for dtype in df.dtypes)
+
+
+def frame_table(df: DataFrame) -> pa.Table:
+    """Arrow table of a frame, compact columns are written with their plain types
+
+    Dictionary columns are decoded, parquet dictionary encodes them again when it writes the pages, and the pandas
+    metadata is dropped so that readers get the same types as for a frame without compact columns.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if not is_compact(df):
+        return table
+
+    fields = [
+        pa.field(field.name, field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields)).replace_schema_metadata(None)
+
+
+def write_parquet(
+    data: Union[DataFrame, pa.Table, Iterable[Union[DataFrame, pa.Table]]],
+    file: str,
+    compression: str = "gzip",
+    compression_level: Optional[int] = None,
+    row_group_size: Optional[int] = None,
+    use_dictionary: Union[bool, List[str]] = True,
+    write_statistics: Union[bool, List[str]] = True,
+) -> int:
+    """Write a frame or an iterable of frames incrementally, returns the number of rows written
+
+    Every frame is written as one or more row groups of at most `row_group_size` rows, so only one frame is held in
+    memory at a time. The schema of the file is the one of the first frame. Arrow tables are written as they are.
+    """
     Path(file).parent.mkdir(parents=True, exist_ok=True)
 
-    df.to_parquet(file, compression=compression)
+    frames = [data] if isinstance(data, (DataFrame, pa.Table)) else data
+    parquet_writer = None
+    rows = 0
+
+    try:
+        for df in frames:
+            if parquet_writer is None:
+                table = df if isinstance(df, pa.Table) else frame_table(df)
+                parquet_writer = pq.ParquetWriter(
+                    file,
+                    table.schema,
+                    compression=compression,
+                    compression_level=compression_level,
+                    use_dictionary=use_dictionary,
+                    write_statistics=write_statistics,
+                )
+            elif isinstance(df, pa.Table):
+                table = df
+            elif is_compact(df):
+                table = frame_table(df).cast(parquet_writer.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=parquet_writer.schema, preserve_index=False)
+
+            parquet_writer.write_table(table, row_group_size=row_group_size)
+            rows += table.num_rows
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    return rows
 
 
-def write_excel(df: DataFrame, file: str, sheet_name: str):
+def write_excel(df: DataFrame, file: str, sheet_name: str, sheets: Optional[Dict[str, DataFrame]] = None):
+    """Write the frame row by row with XlsxWriter in constant memory mode, followed by any additional sheets
+
+    Rows past the sheet row limit are not written.
+    """
     Path(file).parent.mkdir(parents=True, exist_ok=True)
 
-    df.to_excel(file, sheet_name=sheet_name, index=False)
+    workbook = Workbook(file, {"constant_memory": True})
+    try:
+        for name, sheet_df in {sheet_name: df, **(sheets or {})}.items():
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(0, 0, [str(column) for column in sheet_df.columns])
+
+            rows = sheet_df.head(EXCEL_MAX_ROWS - 1).itertuples(index=False, name=None)
+            for row_no, row in enumerate(rows, start=1):
+                worksheet.write_row(row_no, 0, [excel_value(value) for value in row])
+    finally:
+        workbook.close()
+
+
+def excel_value(value):
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
+
+
+def cap_errors(df: DataFrame, max_per_check: int) -> DataFrame:
+    """The first `max_per_check` failure cases of every column and check"""
+    return df.groupby(ERROR_GROUP, dropna=False, sort=False).head(max_per_check)
+
+
+def summarize_errors(df: DataFrame, written: DataFrame) -> DataFrame:
+    """Failure case counts per column and check, and how many of them were written"""
+    failure_count = df.groupby(ERROR_GROUP, dropna=False, sort=False).size().rename("failure_count")
+    written_count = written.groupby(ERROR_GROUP, dropna=False, sort=False).size().rename("written_count")
+
+    return pd.concat([failure_count, written_count], axis=1).fillna(0).astype(int).reset_index()
+
+
+def write_errors(df: DataFrame, file: str, format: str = "xlsx", max_per_check: Optional[int] = None) -> int:
+    """Write validation failure cases as xlsx, csv or parquet, returns the number of failure cases written
+
+    With `max_per_check` only that many failure cases are written per column and check, together with a summary of
+    the counts: a Summary sheet for xlsx, a `<name>_summary` file next to the errors file otherwise. An xlsx report
+    past the sheet row limit is truncated to it and gets the Summary sheet too, so the counts are not lost.
+    """
+    if format not in ERROR_FORMATS:
+        raise UnsupportedErrorFormat(f"Unsupported errors format '{format}', expected one of {ERROR_FORMATS}")
+
+    written = df if max_per_check is None else cap_errors(df, max_per_check)
+    truncated = format == "xlsx" and len(written) > EXCEL_MAX_ROWS - 1
+    if truncated:
+        written = written.head(EXCEL_MAX_ROWS - 1)
+    summary = None if max_per_check is None and not truncated else summarize_errors(df, written)
+
+    if format == "xlsx":
+        write_excel(written, file, sheet_name="Errors", sheets=None if summary is None else {"Summary": summary})
+        return len(written)
+
+    path = Path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summary_file = str(path.with_name(f"{path.stem}_summary{path.suffix}"))
+
+    if format == "csv":
+        written.to_csv(file, index=False)
+        if summary is not None:
+            summary.to_csv(summary_file, index=False)
+    else:
+        write_parquet(stringify_objects(written), file)
+        if summary is not None:
+            write_parquet(summary, summary_file)
+
+    return len(written)
+
+
+def stringify_objects(df: DataFrame) -> DataFrame:
+    """Failure cases hold values of any type, parquet needs a single type per column"""
+    return df.assign(
+        **{
+            column: df[column].astype(str).where(df[column].notna(), None)
+            for column in df.columns
+            if df[column].dtype == object
+        }
+    )